@@ -0,0 +1,21 @@
+"""Plotly figures shared by the Streamlit apps.
+
+Plotly is imported by each builder on first use, so importing this module
+costs nothing on pages that never draw one of its charts.
+"""
+
+def projection_figure(bands, title, currency="$"):
+    """Median line with 25th-75th and 5th-95th percentile bands of a monte_carlo_projection"""
+    import plotly.graph_objects as go
+
+    years = bands.index / 12
+    fig = go.Figure()
+    for low, high, opacity in (('P5', 'P95', 0.15), ('P25', 'P75', 0.3)):
+        fig.add_trace(go.Scatter(x=years, y=bands[high], mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(
+            x=years, y=bands[low], mode='lines', line=dict(width=0), fill='tonexty',
+            fillcolor=f'rgba(31, 119, 180, {opacity})', name=f"{low[1:]}th-{high[1:]}th percentile"
+        ))
+    fig.add_trace(go.Scatter(x=years, y=bands['P50'], mode='lines', line=dict(color='#1f77b4', width=3), name="Median"))
+    fig.update_layout(title=title, xaxis_title="Years", yaxis_title=f"Value ({currency})", hovermode='x unified')
+    return fig
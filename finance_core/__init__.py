@@ -0,0 +1,125 @@
+"""Headless analytics core for the finance dashboard.
+
+Everything here works without Streamlit or Plotly, so it can be imported by
+batch jobs and the command-line interface (``python -m finance_core``).
+"""
+from .cache import (
+    PROCESSING_CACHE_MAX_BYTES,
+    SHARED_CACHE_MAX_BYTES,
+    FrameCache,
+    SharedFrameCache,
+    enable_copy_on_write,
+    fingerprint_bytes,
+    freeze_dataset,
+)
+from .categorize import EXPENSE_RULES, INCOME_RULES, categorize_transaction, categorize_transactions
+from .downsample import DOWNSAMPLE_METHODS, downsample, lttb_indices, minmax_indices
+from .export import EXPORT_CHUNK_ROWS, EXPORT_FORMATS, export_transactions, iter_export_chunks, write_transactions
+from .indexes import DATASET_INDEXES, dataset_index
+from .ingest import (
+    INGEST_MEMORY_BUDGET_MB,
+    TRANSACTION_SCHEMA,
+    append_transactions,
+    build_dataset,
+    dataset_nbytes,
+    hash_index,
+    ingest_accounts,
+    ingest_csv,
+    iter_csv_chunks,
+    merge_datasets,
+    resolve_layout,
+)
+from .interest import (
+    COMPOUNDING_FREQUENCIES,
+    SCENARIO_METRICS,
+    amortization_schedule,
+    amortization_table,
+    compound_interest,
+    loan_payment,
+    scenario_grid,
+    scenario_table,
+    simple_interest,
+)
+from .layouts import BANK_LAYOUTS, detect_layout, normalize_transactions, read_header
+from .networth import NET_WORTH_COLUMNS, NetWorthSeries, net_worth_cash_flow, read_net_worth
+from .portfolio import (
+    CONCENTRATION_TOP_N,
+    HOLDING_COLUMNS,
+    allocation_rollup,
+    analyze_holdings,
+    concentration_metrics,
+    portfolio_allocation,
+    read_holdings,
+)
+from .profiling import (
+    APP_DEPENDENCIES,
+    PROFILE_LOG,
+    RerunProfile,
+    current_rss_bytes,
+    finish_profile,
+    import_costs,
+    size_bucket,
+    stage,
+    start_profile,
+)
+from .projection import (
+    PROJECTION_CHUNK_PATHS,
+    PROJECTION_MAX_WORKERS,
+    PROJECTION_PERCENTILES,
+    cash_flow_distribution,
+    monte_carlo_projection,
+    portfolio_moments,
+)
+from .recurring import (
+    RECURRING_COLUMNS,
+    RECURRING_FREQUENCIES,
+    build_recurring_index,
+    normalize_descriptions,
+    recurring_index,
+    recurring_transactions,
+    update_recurring_index,
+)
+from .report import expense_breakdown, savings_rate, summary_json, summary_report
+from .rollup import (
+    build_rollup,
+    daily_aggregates,
+    merge_daily_aggregates,
+    rollup_category_totals,
+    rollup_daily,
+    rollup_day_of_week_mean,
+    rollup_metrics,
+    rollup_monthly,
+    rollup_weekly,
+    update_rollup,
+)
+from .sample import (
+    SAMPLE_PRESETS,
+    create_sample_data,
+    generate_transactions,
+    iter_transaction_chunks,
+    load_sample_preset,
+)
+from .store import (
+    DATA_STORE_DIR,
+    list_saved_datasets,
+    load_net_worth,
+    load_saved_dataset,
+    save_dataset,
+    save_net_worth,
+    saved_dataset_version,
+    update_saved_dataset,
+)
+from .table import TABLE_COLUMNS, index_categories, page_positions, query_table, table_index, table_stats
+from .transactions import (
+    DAYS_ORDER,
+    calculate_metrics,
+    concat_transactions,
+    date_bounds,
+    date_slice,
+    expand_transactions,
+    memory_report,
+    process_transactions,
+    to_cents,
+    transaction_amounts,
+    transaction_hashes,
+)
@@ -0,0 +1,211 @@
+"""Reproducible benchmarks of the analytics hot paths on synthetic data."""
+import gc
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from . import categorize
+from .categorize import categorize_transaction, categorize_transactions
+from .export import write_transactions
+from .ingest import ingest_csv
+from .portfolio import analyze_holdings, portfolio_allocation
+from .recurring import build_recurring_index
+from .rollup import (
+    build_rollup,
+    daily_aggregates,
+    rollup_category_totals,
+    rollup_day_of_week_mean,
+    rollup_monthly,
+    rollup_weekly,
+)
+from .sample import generate_transactions
+from .transactions import calculate_metrics, date_slice, process_transactions
+
+BENCH_SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+
+# The row-wise categorize_transaction baseline is skipped above this size
+ROW_WISE_MAX_ROWS = 1_000_000
+
+# Distinct merchants per category in the synthetic descriptions
+MERCHANTS_PER_CATEGORY = 1000
+
+def synthetic_upload(rows, seed=42):
+    """rows synthetic transactions shaped like an uploaded statement (Date, Description, Amount).
+    
+    Descriptions combine the category with one of MERCHANTS_PER_CATEGORY
+    merchant numbers, so categorization sees realistic cardinality.
+    """
+    accounts = max(1, rows // 5000)
+    daily_rate = 1.1 * rows / (3653 * accounts)
+    raw = generate_transactions(years=10, accounts=accounts, daily_rate=daily_rate, seed=seed).iloc[:rows]
+    rng = np.random.default_rng(seed)
+    categories = raw['Category'].cat.categories
+    merchant = rng.integers(0, MERCHANTS_PER_CATEGORY, len(raw))
+    descriptions = pd.Categorical.from_codes(
+        raw['Category'].cat.codes.to_numpy().astype(np.int64) * MERCHANTS_PER_CATEGORY + merchant,
+        [f"{category} store {i}" for category in categories for i in range(MERCHANTS_PER_CATEGORY)]
+    )
+    return pd.DataFrame({
+        'Date': raw['Date'].dt.strftime('%Y-%m-%d').to_numpy(),
+        'Description': descriptions.astype(str),
+        'Amount': raw['Amount'].to_numpy()
+    })
+
+def _middle_half(df):
+    dates = df['Date']
+    span = dates.iloc[-1] - dates.iloc[0]
+    return (dates.iloc[0] + span / 4).date(), (dates.iloc[0] + span * 3 / 4).date()
+
+def _tab_queries(rollup):
+    rollup_monthly(rollup)
+    rollup_category_totals(rollup, 'Expense')
+    rollup_weekly(rollup, 'Expense')
+    rollup_day_of_week_mean(rollup, 'Expense')
+
+def synthetic_holdings(rows, seed=42):
+    """rows synthetic portfolio positions with Name, Value, Sector and Asset_Class"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Name': [f"Asset {i}" for i in range(rows)],
+        'Value': rng.lognormal(8, 1.5, rows),
+        'Sector': rng.choice(['Technology', 'Financials', 'Healthcare', 'Energy', 'Consumer', 'Industrials'], rows),
+        'Asset_Class': rng.choice(['Equity', 'Bond', 'Cash', 'Real Estate'], rows)
+    })
+
+def _cases(state):
+    """Benchmark name -> (function to time, rows processed), built on shared inputs"""
+    raw, df = state['raw'], state['df']
+    start_date, end_date = _middle_half(df)
+    
+    def categorize_rowwise():
+        raw.apply(lambda row: categorize_transaction(row['Description'], row['Amount']), axis=1)
+    
+    def categorize_vectorized():
+        # Start cold so every run pays for matching each distinct description
+        categorize._category_memo.clear()
+        categorize_transactions(raw['Description'], raw['Amount'])
+    
+    cases = {
+        'categorize_transactions': categorize_vectorized,
+        'process_transactions': lambda: process_transactions(raw.copy()),
+        'calculate_metrics': lambda: calculate_metrics(df),
+        'date_filter': lambda: date_slice(df, start_date, end_date),
+        'rollup_build': lambda: build_rollup(daily_aggregates(df)),
+        'tab_queries': lambda: _tab_queries(state['rollup']),
+        'ingest_csv': lambda: ingest_csv(state['csv_path']),
+        'export_csv': lambda: write_transactions(df, io.BytesIO(), 'csv'),
+        'export_csv_gzip': lambda: write_transactions(df, io.BytesIO(), 'csv.gz'),
+        'portfolio_analysis': lambda: portfolio_allocation(state['assets'], 20),
+        'holdings_analysis': lambda: analyze_holdings(state['assets'], 20),
+        'recurring_detection': lambda: build_recurring_index(df),
+    }
+    if len(raw) <= ROW_WISE_MAX_ROWS:
+        cases['categorize_transaction_rowwise'] = categorize_rowwise
+    return cases
+
+def _measure(func, repeat):
+    """(best wall time in seconds over repeat runs, peak traced memory in bytes of one more run)"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    # Memory is traced in a separate run so tracing overhead doesn't skew the timings
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def run_benchmarks(sizes=BENCH_SIZES, cases=None, repeat=3, seed=42, progress=None):
+    """Run each benchmark case at each size; returns a JSON-ready results dict.
+    
+    cases limits the run to the named benchmarks. progress, if given, is
+    called with each result as it completes.
+    """
+    results = []
+    for rows in sizes:
+        raw = synthetic_upload(rows, seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'transactions.csv')
+            raw.to_csv(csv_path, index=False)
+            df = process_transactions(raw.copy())
+            state = {
+                'raw': raw,
+                'df': df,
+                'rollup': build_rollup(daily_aggregates(df)),
+                'csv_path': csv_path,
+                'assets': synthetic_holdings(rows, seed),
+            }
+            for name, func in _cases(state).items():
+                if cases and name not in cases:
+                    continue
+                seconds, peak = _measure(func, repeat)
+                result = {
+                    'case': name,
+                    'rows': rows,
+                    'seconds': round(seconds, 6),
+                    'peak_mb': round(peak / 1024 ** 2, 3),
+                    'rows_per_sec': round(rows / seconds) if seconds > 0 else None
+                }
+                results.append(result)
+                if progress:
+                    progress(result)
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpus': os.cpu_count(),
+            'repeat': repeat,
+            'seed': seed
+        },
+        'results': results
+    }
+
+def compare_benchmarks(current, baseline, tolerance=0.25):
+    """Compare results against a baseline run.
+    
+    Returns one row per (case, rows) present in both, with the time and
+    peak-memory ratios (current / baseline) and whether either exceeds
+    1 + tolerance.
+    """
+    previous = {(r['case'], r['rows']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        base = previous.get((result['case'], result['rows']))
+        if base is None:
+            continue
+        time_ratio = result['seconds'] / base['seconds'] if base['seconds'] > 0 else float('inf')
+        memory_ratio = result['peak_mb'] / base['peak_mb'] if base['peak_mb'] > 0 else 1.0
+        rows.append({
+            'case': result['case'],
+            'rows': result['rows'],
+            'seconds': result['seconds'],
+            'baseline_seconds': base['seconds'],
+            'time_ratio': round(time_ratio, 3),
+            'peak_mb': result['peak_mb'],
+            'baseline_peak_mb': base['peak_mb'],
+            'memory_ratio': round(memory_ratio, 3),
+            'regression': time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance
+        })
+    return rows
+
+def load_benchmarks(path):
+    with open(path) as handle:
+        return json.load(handle)
@@ -0,0 +1,144 @@
+"""Memory-bounded LRU cache for processed datasets."""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from .indexes import DATASET_INDEXES, index_arrays
+from .ingest import dataset_nbytes
+
+# Upper bound on memory held by processed DataFrames in a session's cache
+PROCESSING_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Upper bound on memory held by datasets shared between all sessions of a process
+SHARED_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+def fingerprint_bytes(data):
+    """Content hash used to key processed datasets"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class FrameCache:
+    """LRU cache of processed datasets bounded by their total memory usage.
+    
+    sizeof estimates an entry's size in bytes; it defaults to
+    dataset_nbytes but can be swapped to cache other payloads. Indexes
+    built on a cached dataset after it was stored (see dataset_index) are
+    counted as they appear and taken into account at the next put.
+    """
+    
+    def __init__(self, max_bytes=PROCESSING_CACHE_MAX_BYTES, sizeof=dataset_nbytes):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()
+    
+    def __contains__(self, key):
+        return key in self._entries
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    @staticmethod
+    def _entry_bytes(entry):
+        """An entry's size when stored plus its indexes built since"""
+        dataset, size, indexed = entry
+        return size + (dataset.get('index_nbytes', 0) - indexed if isinstance(dataset, dict) else 0)
+    
+    @property
+    def total_bytes(self):
+        return sum(self._entry_bytes(entry) for entry in self._entries.values())
+    
+    def get(self, key):
+        """Return the cached dataset for key (marking it recently used), or None"""
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+    
+    def put(self, key, dataset):
+        """Store dataset under key, evicting least recently used entries over budget"""
+        self._entries.pop(key, None)
+        indexed = dataset.get('index_nbytes', 0) if isinstance(dataset, dict) else 0
+        self._entries[key] = (dataset, self.sizeof(dataset), indexed)
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            self._entries.popitem(last=False)
+        return dataset
+    
+    def clear(self):
+        self._entries.clear()
+
+def enable_copy_on_write():
+    """Turn on pandas copy-on-write, which datasets shared between sessions rely on.
+    
+    pandas 3 always uses it. On pandas 2 it is an option that changes the
+    behaviour of every frame in the process, so apps sharing datasets opt
+    in by calling this once at startup rather than on import.
+    """
+    if int(pd.__version__.split('.')[0]) < 3:
+        pd.set_option('mode.copy_on_write', True)
+
+def freeze_dataset(dataset):
+    """Mark a dataset's rollup and built index arrays read-only, in place.
+    
+    Shared datasets must never be written to; any in-place update then
+    fails loudly instead of leaking into other sessions. Indexes built
+    later by dataset_index are frozen as they are built. Frames are
+    protected by pandas copy-on-write (see enable_copy_on_write), and
+    append_transactions always returns a new dataset.
+    """
+    dataset['frozen'] = True
+    for array in index_arrays([dataset['rollup']] + [dataset.get(name) for name in DATASET_INDEXES]):
+        array.flags.writeable = False
+    return dataset
+
+class SharedFrameCache(FrameCache):
+    """Thread-safe FrameCache for immutable datasets shared across sessions.
+    
+    Entries are frozen with freeze_dataset and handed out by reference, so
+    every session looking at the same sample or saved dataset holds one
+    copy in memory. get_or_build builds a missing entry at most once even
+    when several sessions ask for it at the same time, and the indexes of
+    an entry are built on first use under that dataset's own lock (see
+    dataset_index).
+    """
+    
+    def __init__(self, max_bytes=SHARED_CACHE_MAX_BYTES, sizeof=dataset_nbytes):
+        super().__init__(max_bytes, sizeof)
+        self._lock = threading.Lock()
+        self._building = {}
+    
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+    
+    def get(self, key):
+        with self._lock:
+            return super().get(key)
+    
+    def put(self, key, dataset):
+        freeze_dataset(dataset)
+        with self._lock:
+            return super().put(key, dataset)
+    
+    def clear(self):
+        with self._lock:
+            super().clear()
+    
+    def get_or_build(self, key, build):
+        """Return the dataset for key, calling build() to create it if missing"""
+        with self._lock:
+            key_lock = self._building.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                dataset = self.get(key)
+                if dataset is None:
+                    dataset = self.put(key, build())
+                return dataset
+        finally:
+            with self._lock:
+                self._building.pop(key, None)
@@ -0,0 +1,124 @@
+"""Keyword-based transaction categorization."""
+import re
+
+import numpy as np
+import pandas as pd
+
+# Keyword tables used for auto-categorization, checked in order.
+# Income rules apply regardless of sign; expense rules only to negative amounts.
+INCOME_RULES = [
+    (('salary', 'paycheck', 'wage', 'income', 'freelance'), 'Income'),
+    (('dividend', 'investment', 'interest'), 'Investment'),
+]
+
+EXPENSE_RULES = [
+    (('grocery', 'food', 'supermarket', 'walmart', 'costco'), 'Groceries'),
+    (('gas', 'fuel', 'uber', 'taxi', 'metro', 'bus'), 'Transportation'),
+    (('restaurant', 'cafe', 'pizza', 'mcdonalds', 'starbucks'), 'Restaurants'),
+    (('electric', 'water', 'internet', 'phone', 'utility'), 'Utilities'),
+    (('movie', 'netflix', 'spotify', 'entertainment', 'game'), 'Entertainment'),
+    (('amazon', 'shopping', 'store', 'mall'), 'Shopping'),
+    (('doctor', 'hospital', 'pharmacy', 'medical'), 'Healthcare'),
+    (('insurance', 'premium'), 'Insurance'),
+]
+
+# Memo of description -> (income rule, expense rule) indices, -1 meaning no match
+CATEGORY_MEMO_LIMIT = 200_000
+_category_memo = {}
+
+def _compile_rules(rules):
+    """Compile each keyword group into a single alternation regex"""
+    return [re.compile('|'.join(re.escape(word) for word in words)) for words, _ in rules]
+
+_INCOME_PATTERNS = _compile_rules(INCOME_RULES)
+_EXPENSE_PATTERNS = _compile_rules(EXPENSE_RULES)
+
+def categorize_transaction(description, amount):
+    """Automatically categorize transactions based on description and amount"""
+    description = description.lower()
+    
+    # Income categories
+    for words, category in INCOME_RULES:
+        if any(word in description for word in words):
+            return category, 'Income'
+    
+    # Expense categories (negative amounts)
+    if amount < 0:
+        for words, category in EXPENSE_RULES:
+            if any(word in description for word in words):
+                return category, 'Expense'
+        return 'Other', 'Expense'
+    else:
+        return 'Other Income', 'Income'
+
+def _first_rule_match(descriptions, patterns):
+    """Index of the first matching rule for each description, or -1"""
+    result = np.full(len(descriptions), -1, dtype=np.int16)
+    for i, pattern in reversed(list(enumerate(patterns))):
+        matched = descriptions.str.contains(pattern, regex=True).to_numpy(dtype=bool)
+        result[matched] = i
+    return result
+
+def _rule_indices(unique_descriptions):
+    """Look up (income, expense) rule indices for unique descriptions, filling the memo"""
+    income_idx = np.empty(len(unique_descriptions), dtype=np.int16)
+    expense_idx = np.empty(len(unique_descriptions), dtype=np.int16)
+    missing = []
+    for i, description in enumerate(unique_descriptions):
+        hit = _category_memo.get(description)
+        if hit is None:
+            missing.append(i)
+        else:
+            income_idx[i], expense_idx[i] = hit
+    
+    if missing:
+        new_descriptions = pd.Series(unique_descriptions[missing], dtype=object)
+        lowered = new_descriptions.str.lower()
+        new_income = _first_rule_match(lowered, _INCOME_PATTERNS)
+        new_expense = _first_rule_match(lowered, _EXPENSE_PATTERNS)
+        income_idx[missing] = new_income
+        expense_idx[missing] = new_expense
+        
+        if len(_category_memo) + len(missing) > CATEGORY_MEMO_LIMIT:
+            _category_memo.clear()
+        _category_memo.update(zip(new_descriptions.tolist(), zip(new_income.tolist(), new_expense.tolist())))
+    
+    return income_idx, expense_idx
+
+def categorize_transactions(descriptions, amounts):
+    """Vectorized categorize_transaction over whole columns.
+    
+    Each distinct description is matched once against the compiled keyword
+    tables; results are then broadcast back to every row. Returns two
+    object arrays (categories, types) with the same values
+    categorize_transaction would give row by row.
+    """
+    descriptions = pd.Series(descriptions, copy=False).fillna('').astype(str)
+    amounts = np.asarray(amounts, dtype=float)
+    
+    codes, uniques = pd.factorize(descriptions, sort=False)
+    income_idx, expense_idx = _rule_indices(np.asarray(uniques, dtype=object))
+    row_income = income_idx[codes]
+    row_expense = expense_idx[codes]
+    
+    category_names = np.array(
+        [category for _, category in INCOME_RULES]
+        + [category for _, category in EXPENSE_RULES]
+        + ['Other', 'Other Income'],
+        dtype=object
+    )
+    n_income = len(INCOME_RULES)
+    other, other_income = len(category_names) - 2, len(category_names) - 1
+    
+    negative = amounts < 0
+    category_code = np.where(
+        row_income >= 0, row_income,
+        np.where(
+            negative,
+            np.where(row_expense >= 0, row_expense + n_income, other),
+            other_income
+        )
+    )
+    categories = category_names[category_code]
+    types = np.where((row_income < 0) & negative, 'Expense', 'Income').astype(object)
+    return categories, types
@@ -0,0 +1,243 @@
+"""Batch command-line interface, run as ``python -m finance_core``."""
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .bench import BENCH_SIZES, compare_benchmarks, load_benchmarks, run_benchmarks
+from .ingest import ingest_csv
+from .loadtest import LOADTEST_APPS, LOADTEST_SESSIONS, LOADTEST_TIMEOUT, compare_load_tests, run_load_tests
+from .profiling import APP_DEPENDENCIES, import_costs
+from .report import expense_breakdown, savings_rate, summary_report
+from .rollup import rollup_metrics, rollup_monthly
+from .sample import iter_transaction_chunks
+
+# Batch reports only need the aggregates, so keep few transaction rows around
+BATCH_MEMORY_BUDGET_MB = 64
+
+def _collect_inputs(paths):
+    """Expand directories to the CSV files inside them"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.csv'))))
+        else:
+            files.append(path)
+    return files
+
+def build_user_report(path, output_dir, memory_budget_mb=BATCH_MEMORY_BUDGET_MB):
+    """Write metrics.json, categories.csv, monthly.csv and summary.txt for one user's CSV.
+    
+    The user id is the file name without its extension. Returns a summary
+    row for the batch index.
+    """
+    user = os.path.splitext(os.path.basename(path))[0]
+    dataset = ingest_csv(path, memory_budget_mb=memory_budget_mb)
+    rollup = dataset['rollup']
+    metrics = {name: float(value) for name, value in rollup_metrics(rollup).items()}
+    breakdown = expense_breakdown(rollup)
+    
+    user_dir = os.path.join(output_dir, user)
+    os.makedirs(user_dir, exist_ok=True)
+    with open(os.path.join(user_dir, 'metrics.json'), 'w') as handle:
+        json.dump({'rows': dataset['rows'], **metrics, 'savings_rate': savings_rate(metrics)}, handle, indent=2)
+    breakdown.rename('Amount').to_csv(os.path.join(user_dir, 'categories.csv'))
+    monthly = rollup_monthly(rollup)
+    monthly.index = monthly.index.astype(str)
+    monthly.rename_axis('Month').to_csv(os.path.join(user_dir, 'monthly.csv'))
+    with open(os.path.join(user_dir, 'summary.txt'), 'w') as handle:
+        handle.write(summary_report(metrics, breakdown))
+    
+    return {'user': user, 'rows': dataset['rows'], **metrics}
+
+def run_reports(paths, output_dir, workers=None, memory_budget_mb=BATCH_MEMORY_BUDGET_MB):
+    """Build reports for many users' CSVs across a process pool.
+    
+    Returns (summary_rows, failures) where failures maps file path to error.
+    """
+    files = _collect_inputs(paths)
+    users = [os.path.splitext(os.path.basename(path))[0] for path in files]
+    duplicates = sorted({user for user in users if users.count(user) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate user ids: {', '.join(duplicates)}")
+    
+    os.makedirs(output_dir, exist_ok=True)
+    rows, failures = [], {}
+    if workers == 1:
+        for path in files:
+            try:
+                rows.append(build_user_report(path, output_dir, memory_budget_mb))
+            except Exception as e:
+                failures[path] = str(e)
+        return rows, failures
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(build_user_report, path, output_dir, memory_budget_mb): path
+            for path in files
+        }
+        for future in as_completed(futures):
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                failures[futures[future]] = str(e)
+    return rows, failures
+
+def write_synthetic_csv(path, **options):
+    """Stream synthetic transactions to a CSV file chunk by chunk; returns rows written"""
+    rows = 0
+    with open(path, 'w', newline='') as handle:
+        for chunk in iter_transaction_chunks(**options):
+            chunk.to_csv(handle, index=False, header=rows == 0, date_format='%Y-%m-%d')
+            rows += len(chunk)
+    return rows
+
+def parse_row_count(text):
+    """Row count from text such as 10000, 100k or 1M"""
+    text = text.strip().lower()
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+def run_bench(args):
+    sizes = [parse_row_count(size) for size in args.sizes.split(',')] if args.sizes else BENCH_SIZES
+    cases = args.cases.split(',') if args.cases else None
+    
+    def show(result):
+        print(f"{result['case']:<32}{result['rows']:>12,}{result['seconds']:>12.4f}s"
+              f"{result['peak_mb']:>11.1f} MB{result['rows_per_sec'] or 0:>16,} rows/s", flush=True)
+    
+    results = run_benchmarks(sizes, cases, repeat=args.repeat, seed=args.seed, progress=show)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
+        print(f"Wrote {len(results['results'])} results to {args.output}")
+    if not args.compare:
+        return 0
+    
+    comparison = compare_benchmarks(results, load_benchmarks(args.compare), args.tolerance)
+    regressions = [row for row in comparison if row['regression']]
+    for row in comparison:
+        flag = "  REGRESSION" if row['regression'] else ""
+        print(f"{row['case']:<32}{row['rows']:>12,}  time x{row['time_ratio']:<8.2f}memory x{row['memory_ratio']:<8.2f}{flag}")
+    print(f"{len(regressions)} of {len(comparison)} benchmarks regressed by more than {args.tolerance:.0%}")
+    return 1 if regressions else 0
+
+def run_imports(args):
+    after = args.after.split(',') if args.after else ()
+    results = import_costs(args.modules or APP_DEPENDENCIES, after=after, repeat=args.repeat)
+    for row in results:
+        if 'error' in row:
+            print(f"{row['module']:<28}  error: {row['error']}")
+        else:
+            print(f"{row['module']:<28}{row['seconds']:>10.3f}s{row['modules']:>8} modules")
+    if after:
+        print(f"Measured after importing {', '.join(after)}")
+    return 1 if any('error' in row for row in results) else 0
+
+def run_loadtest(args):
+    apps = args.apps.split(',') if args.apps else list(LOADTEST_APPS)
+    sessions = [int(count) for count in args.sessions.split(',')] if args.sessions else LOADTEST_SESSIONS
+    sizes = [parse_row_count(size) for size in args.rows.split(',')]
+    
+    def show(result):
+        print(f"{result['app']:<10}{result['sessions']:>5} sessions{result['rows']:>10,} rows"
+              f"{result['p50_ms']:>10.0f}{result['p95_ms']:>8.0f}{result['p99_ms']:>8.0f} ms p50/95/99"
+              f"{result['reruns_per_sec']:>8.1f} reruns/s{result['rss_per_session_mb']:>9.1f} MB/session"
+              f"{result['errors']:>5} errors", flush=True)
+        for error in result['error_samples']:
+            print(f"    error: {error}")
+    
+    results = run_load_tests(apps, sessions, sizes, holdings=args.holdings, scrubs=args.scrubs,
+                             timeout=args.timeout, seed=args.seed, progress=show)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
+        print(f"Wrote {len(results['results'])} results to {args.output}")
+    failed = any(result['errors'] for result in results['results'])
+    if not args.compare:
+        return 1 if failed else 0
+    
+    comparison = compare_load_tests(results, load_benchmarks(args.compare), args.tolerance)
+    regressions = [row for row in comparison if row['regression']]
+    for row in comparison:
+        flag = "  REGRESSION" if row['regression'] else ""
+        print(f"{row['app']:<10}{row['sessions']:>5} sessions{row['rows']:>10,} rows  "
+              f"p95 x{row['latency_ratio']:<8.2f}memory x{row['memory_ratio']:<8.2f}{flag}")
+    print(f"{len(regressions)} of {len(comparison)} load tests regressed by more than {args.tolerance:.0%}")
+    return 1 if failed or regressions else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m finance_core', description="Finance analytics batch tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    report = commands.add_parser('report', help="Build per-user metrics, category breakdowns and summary reports")
+    report.add_argument('inputs', nargs='+', help="Transaction CSV files, or directories of them (one file per user)")
+    report.add_argument('-o', '--output-dir', default='reports', help="Where to write per-user report folders")
+    report.add_argument('-j', '--workers', type=int, default=None, help="Worker processes (default: one per CPU)")
+    report.add_argument('--memory-budget-mb', type=int, default=BATCH_MEMORY_BUDGET_MB,
+                        help="Per-file memory budget for retained transaction rows")
+    
+    generate = commands.add_parser('generate', help="Write a synthetic transaction CSV for load testing")
+    generate.add_argument('output', help="CSV file to write")
+    generate.add_argument('--years', type=float, default=1)
+    generate.add_argument('--accounts', type=int, default=1)
+    generate.add_argument('--daily-rate', type=float, default=1.5, help="Mean transactions per account per day")
+    generate.add_argument('--expense-share', type=float, default=0.8)
+    generate.add_argument('--start', default='2024-01-01')
+    generate.add_argument('--seed', type=int, default=42)
+    
+    bench = commands.add_parser('bench', help="Benchmark the analytics hot paths on synthetic data")
+    bench.add_argument('--sizes', help="Comma-separated row counts, e.g. 10k,100k,1M (default: 10k,100k,1M,10M)")
+    bench.add_argument('--cases', help="Comma-separated benchmark names to run (default: all)")
+    bench.add_argument('--repeat', type=int, default=3, help="Timed runs per benchmark; the best is reported")
+    bench.add_argument('--seed', type=int, default=42)
+    bench.add_argument('-o', '--output', help="Write results as JSON to this file")
+    bench.add_argument('--compare', help="Baseline results JSON to compare against; exits 1 on regressions")
+    bench.add_argument('--tolerance', type=float, default=0.25,
+                       help="Allowed slowdown or memory growth before a benchmark counts as regressed")
+    
+    imports = commands.add_parser('imports', help="Report the cold import time of the apps' dependencies")
+    imports.add_argument('modules', nargs='*', help="Modules to time (default: the dashboard's dependencies)")
+    imports.add_argument('--after', help="Comma-separated modules imported first and not counted, e.g. streamlit")
+    imports.add_argument('--repeat', type=int, default=3, help="Fresh interpreters per module; the fastest is reported")
+    
+    loadtest = commands.add_parser('loadtest', help="Drive concurrent headless sessions of the Streamlit apps")
+    loadtest.add_argument('--apps', help=f"Comma-separated apps to test (default: {','.join(LOADTEST_APPS)})")
+    loadtest.add_argument('--sessions', help="Comma-separated concurrent session counts (default: 1,4,16)")
+    loadtest.add_argument('--rows', default='10k', help="Comma-separated dashboard upload sizes, e.g. 10k,100k")
+    loadtest.add_argument('--holdings', type=int, default=200, help="Positions in each fpti session's portfolio import")
+    loadtest.add_argument('--scrubs', type=int, default=5, help="Date filter changes per dashboard session")
+    loadtest.add_argument('--timeout', type=float, default=LOADTEST_TIMEOUT, help="Seconds a single rerun may take")
+    loadtest.add_argument('--seed', type=int, default=42)
+    loadtest.add_argument('-o', '--output', help="Write results as JSON to this file")
+    loadtest.add_argument('--compare', help="Baseline results JSON to compare against; exits 1 on regressions")
+    loadtest.add_argument('--tolerance', type=float, default=0.25,
+                          help="Allowed p95 latency or per-session memory growth before a run counts as regressed")
+    
+    args = parser.parse_args(argv)
+    if args.command == 'loadtest':
+        return run_loadtest(args)
+    if args.command == 'bench':
+        return run_bench(args)
+    if args.command == 'imports':
+        return run_imports(args)
+    if args.command == 'generate':
+        rows = write_synthetic_csv(
+            args.output, years=args.years, accounts=args.accounts, daily_rate=args.daily_rate,
+            expense_share=args.expense_share, start=args.start, seed=args.seed
+        )
+        print(f"Wrote {rows:,} transactions to {args.output}")
+        return 0
+    
+    rows, failures = run_reports(args.inputs, args.output_dir, args.workers, args.memory_budget_mb)
+    if rows:
+        index = pd.DataFrame(rows).sort_values('user')
+        index.to_csv(os.path.join(args.output_dir, 'index.csv'), index=False)
+    for path, error in sorted(failures.items()):
+        print(f"error: {path}: {error}", file=sys.stderr)
+    print(f"Wrote reports for {len(rows)} users to {args.output_dir}" + (f" ({len(failures)} failed)" if failures else ""))
+    return 1 if failures else 0
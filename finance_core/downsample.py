@@ -0,0 +1,75 @@
+"""Point reduction for plotting long time series."""
+import numpy as np
+
+def _as_float(x):
+    """x as float64, with datetimes converted to nanoseconds and labels to positions"""
+    x = np.asarray(x)
+    if x.dtype.kind not in 'iufM':
+        return np.arange(len(x), dtype=np.float64)
+    if x.dtype.kind == 'M':
+        x = x.astype('datetime64[ns]').astype(np.int64)
+    return x.astype(np.float64)
+
+def lttb_indices(x, y, n_out):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets.
+    
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket, which preserves the
+    visual shape of the line.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if b + 2 < len(edges):
+            next_x = x[hi:edges[b + 2]].mean()
+            next_y = y[hi:edges[b + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs(
+            (x[previous] - next_x) * (y[lo:hi] - y[previous])
+            - (x[previous] - x[lo:hi]) * (next_y - y[previous])
+        )
+        previous = lo + int(np.argmax(area))
+        kept[b + 1] = previous
+    return kept
+
+def minmax_indices(y, n_out):
+    """Indices of the minimum and maximum of each of (n_out - 2) // 2 equal buckets.
+    
+    Keeps every spike and dip, so peaks never disappear from a zoomed-out
+    chart; the first and last points are always included, and at most
+    n_out points are kept in all (at least 4).
+    """
+    n = len(y)
+    buckets = max((n_out - 2) // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    starts = np.linspace(0, n, buckets, endpoint=False).astype(np.int64)
+    bucket = np.repeat(np.arange(buckets), np.diff(np.append(starts, n)))
+    # Sort by (bucket, value) so each bucket's min and max are its first and last entries
+    order = np.lexsort((y, bucket))
+    ends = np.append(starts[1:], n) - 1
+    kept = np.unique(np.concatenate([[0, n - 1], order[starts], order[ends]]))
+    return kept
+
+DOWNSAMPLE_METHODS = {
+    'lttb': lttb_indices,
+    'minmax': lambda x, y, n_out: minmax_indices(y, n_out),
+}
+
+def downsample(x, y, max_points, method='lttb'):
+    """At most about max_points of (x, y), reduced with method ('lttb' or 'minmax')"""
+    if len(y) <= max_points:
+        return x, y
+    kept = DOWNSAMPLE_METHODS[method](x, y, max_points)
+    return np.asarray(x)[kept], np.asarray(y)[kept]
@@ -0,0 +1,80 @@
+"""Chunked, optionally compressed exports of processed transactions."""
+import gzip
+import io
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from .transactions import expand_transactions
+
+# Rows expanded and serialized at a time, so an export never holds a full
+# readable copy of the transactions
+EXPORT_CHUNK_ROWS = 100_000
+
+# Export format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'csv': ('csv', 'text/csv'),
+    'csv.gz': ('csv.gz', 'application/gzip'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+
+def iter_export_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Readable (expand_transactions) views of consecutive chunks of df"""
+    if len(df) == 0:
+        yield expand_transactions(df)
+        return
+    for start in range(0, len(df), chunk_rows):
+        yield expand_transactions(df.iloc[start:start + chunk_rows])
+
+def write_csv_export(df, dest, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write df as CSV to a binary file object, one chunk at a time"""
+    for i, chunk in enumerate(iter_export_chunks(df, chunk_rows)):
+        dest.write(chunk.to_csv(index=False, header=i == 0).encode('utf-8'))
+
+def write_parquet_export(df, dest, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write df as Parquet to a path or binary file object, one row group per chunk"""
+    if pq is None:
+        raise ImportError("pyarrow is required for Parquet exports")
+    writer = None
+    try:
+        for chunk in iter_export_chunks(df, chunk_rows):
+            # Periods have no Parquet type; store them as their labels
+            for name in chunk.columns:
+                if isinstance(chunk[name].dtype, pd.PeriodDtype):
+                    chunk[name] = chunk[name].astype(str)
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(dest, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_transactions(df, dest, fmt='csv', chunk_rows=EXPORT_CHUNK_ROWS):
+    """Stream df to a path or binary file object in one of EXPORT_FORMATS"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == 'parquet':
+        write_parquet_export(df, dest, chunk_rows)
+    elif isinstance(dest, str):
+        with open(dest, 'wb') as f:
+            write_transactions(df, f, fmt, chunk_rows)
+    elif fmt == 'csv.gz':
+        # mtime=0 keeps the output identical for identical data
+        with gzip.GzipFile(fileobj=dest, mode='wb', mtime=0) as gz:
+            write_csv_export(df, gz, chunk_rows)
+    else:
+        write_csv_export(df, dest, chunk_rows)
+
+def export_transactions(df, fmt='csv', chunk_rows=EXPORT_CHUNK_ROWS):
+    """df serialized in one of EXPORT_FORMATS, as bytes"""
+    buffer = io.BytesIO()
+    write_transactions(df, buffer, fmt, chunk_rows)
+    return buffer.getvalue()
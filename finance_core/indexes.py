@@ -0,0 +1,55 @@
+"""Indexes built lazily over a dataset's rows and kept with the dataset."""
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Indexes built from a dataset's rows on first use and kept on the dataset
+DATASET_INDEXES = ('hash_index', 'table_index', 'recurring_index')
+
+def index_nbytes(value):
+    """Memory held by the arrays and frames in an index, including nested dicts and lists"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Index):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sum(index_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(index_nbytes(item) for item in value)
+    return 0
+
+def index_arrays(value):
+    """The NumPy arrays in a value, looking inside dicts and lists"""
+    if isinstance(value, np.ndarray):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from index_arrays(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from index_arrays(item)
+
+def dataset_index(dataset, name, build):
+    """dataset[name], calling build(dataset) to create it on first use.
+    
+    The index is built under a lock kept on the dataset, so sessions sharing
+    a cached dataset build it once and never see it half-written. On a
+    frozen dataset (see freeze_dataset) its arrays are made read-only. Its
+    size is added to dataset['index_nbytes'], which caches holding the
+    dataset count toward their budget.
+    """
+    index = dataset.get(name)
+    if index is None:
+        with dataset.setdefault('index_lock', threading.Lock()):
+            index = dataset.get(name)
+            if index is None:
+                index = build(dataset)
+                if dataset.get('frozen'):
+                    for array in index_arrays(index):
+                        array.flags.writeable = False
+                dataset['index_nbytes'] = dataset.get('index_nbytes', 0) + index_nbytes(index)
+                dataset[name] = index
+    return index
@@ -0,0 +1,300 @@
+"""CSV ingest, datasets and incremental appends."""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = pa_csv = None
+
+from .indexes import DATASET_INDEXES, dataset_index, index_nbytes
+from .layouts import (
+    BANK_LAYOUTS,
+    detect_layout,
+    layout_columns,
+    normalize_table,
+    normalize_transactions,
+    read_header,
+)
+from .recurring import update_recurring_index
+from .rollup import build_rollup, daily_aggregates, merge_daily_aggregates, update_rollup
+from .transactions import concat_transactions, process_transactions, to_cents, transaction_hashes
+
+def build_dataset(df):
+    """Processed transactions plus the aggregates derived from them at ingest"""
+    daily = daily_aggregates(df)
+    return {'df': df, 'rollup': build_rollup(daily), 'daily': daily, 'rows': len(df), 'truncated': False}
+
+def dataset_nbytes(dataset):
+    """Approximate memory held by a dataset, including whichever of its indexes are built"""
+    size = int(dataset['df'].memory_usage(deep=True).sum())
+    size += int(dataset['daily'].memory_usage(deep=True).sum())
+    size += sum(index_nbytes(dataset.get(name)) for name in DATASET_INDEXES)
+    size += sum(value.nbytes for value in dataset['rollup'].values() if isinstance(value, np.ndarray))
+    return size
+
+# Explicit CSV schema; Date is kept as text and parsed by process_transactions
+TRANSACTION_SCHEMA = {
+    'Date': 'string',
+    'Description': 'string',
+    'Amount': 'float64',
+    'Category': 'string',
+    'Type': 'string'
+}
+
+# Default memory allowed for retained transaction rows during ingest
+INGEST_MEMORY_BUDGET_MB = 1024
+
+def _arrow_type(dtype):
+    return pa.float64() if dtype == 'float64' else pa.string()
+
+class _CountingReader:
+    """File wrapper that counts bytes handed to the CSV parser"""
+    
+    def __init__(self, raw):
+        self.raw = raw
+        self.name = getattr(raw, 'name', None)
+        self.bytes_read = 0
+        self.closed = False
+    
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        return data
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return False
+    
+    def close(self):
+        self.closed = True
+
+def _named(source, normalize, *args):
+    """normalize(*args), with ValueErrors prefixed by source's file name when it has one"""
+    try:
+        return normalize(*args)
+    except ValueError as e:
+        name = getattr(source, 'name', None)
+        if not name:
+            raise
+        raise ValueError(f"{os.path.basename(str(name))}: {e}") from e
+
+def iter_csv_chunks(source, chunk_bytes, engine='auto', layout=None):
+    """Yield DataFrame chunks of a transaction CSV parsed with TRANSACTION_SCHEMA.
+    
+    engine is 'pyarrow' (streaming reader, needs pyarrow), 'pandas' (chunked
+    read_csv) or 'auto' to use pyarrow when it is installed. With a layout
+    (a BANK_LAYOUTS entry) its columns are read as text and each chunk is
+    normalized to Date/Description/Amount; an unreadable amount raises
+    ValueError naming the file and row under either engine.
+    """
+    column_types = TRANSACTION_SCHEMA
+    if layout is not None:
+        # Amounts may carry separators or currency symbols, so map them from text
+        column_types = {name: 'string' for name in layout_columns(layout, optional=True)}
+    if engine == 'auto':
+        engine = 'pyarrow' if pa_csv is not None else 'pandas'
+    
+    if engine == 'pyarrow':
+        if pa_csv is None:
+            raise ImportError("pyarrow is required for the pyarrow ingest engine")
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(block_size=chunk_bytes),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: _arrow_type(dtype) for name, dtype in column_types.items()},
+                # Blank cells are missing, as read_csv treats them
+                strings_can_be_null=True
+            )
+        )
+        rows = 0
+        for batch in reader:
+            yield batch.to_pandas() if layout is None else _named(source, normalize_table, batch, layout, rows)
+            rows += batch.num_rows
+    else:
+        # Rough text-to-rows estimate so pandas chunks match chunk_bytes
+        rows = max(chunk_bytes // 100, 1000)
+        for chunk in pd.read_csv(source, dtype=column_types, chunksize=rows):
+            # Chunks are indexed by their rows' positions in the file
+            yield chunk if layout is None else _named(source, normalize_transactions, chunk, layout)
+
+def resolve_layout(source, layout):
+    """Layout dict for a layout name, 'auto' (detected from the header) or None (standard schema)"""
+    if layout is None or isinstance(layout, dict):
+        return layout
+    if layout == 'auto':
+        header = read_header(source)
+        layout = detect_layout(header)
+        if layout is None:
+            raise ValueError(f"Unrecognized or ambiguous statement columns: {', '.join(header)}")
+    return None if layout == 'Standard' else BANK_LAYOUTS[layout]
+
+def ingest_csv(source, total_bytes=None, memory_budget_mb=INGEST_MEMORY_BUDGET_MB,
+               engine='auto', progress=None, layout=None, account=None):
+    """Stream a transaction CSV into a dataset without loading it whole.
+    
+    Each chunk is categorized and folded into the daily aggregates as it
+    arrives, so metrics and charts always cover the full file. Processed rows
+    are retained for the transaction table only while they fit in
+    memory_budget_mb; past that the dataset is marked truncated. progress,
+    if given, is called with (fraction_done, rows_so_far).
+    
+    layout names a BANK_LAYOUTS entry (or 'auto' to detect it from the
+    header) whose columns are mapped onto Date/Description/Amount; account,
+    if given, is recorded in an Account column on every row.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        total_bytes = total_bytes or os.path.getsize(source)
+        with open(source, 'rb') as handle:
+            return ingest_csv(handle, total_bytes, memory_budget_mb, engine, progress, layout, account)
+    
+    layout = resolve_layout(source, layout)
+    budget = memory_budget_mb * 1024 * 1024
+    # Parsed frames run several times larger than the CSV text
+    chunk_bytes = int(min(max(budget // 16, 1 << 20), 64 << 20))
+    reader = _CountingReader(source)
+    
+    retained, retained_bytes, rows, truncated = [], 0, 0, False
+    daily, hashes = None, []
+    for chunks, chunk in enumerate(iter_csv_chunks(reader, chunk_bytes, engine, layout), start=1):
+        if account is not None:
+            chunk['Account'] = pd.Categorical.from_codes(np.zeros(len(chunk), dtype=np.int8), [account])
+        # Only rows without a Category are categorized, so chunking doesn't change the result
+        chunk = process_transactions(chunk)
+        daily = merge_daily_aggregates(daily, daily_aggregates(chunk))
+        hashes.append(chunk['Txn_Hash'].to_numpy())
+        rows += len(chunk)
+        
+        if not truncated:
+            size = int(chunk.memory_usage(deep=True).sum())
+            if retained_bytes + size <= budget or not retained:
+                retained.append(chunk)
+                retained_bytes += size
+            else:
+                truncated = True
+        
+        if progress is not None:
+            # The parser reads ahead, so also cap by chunks actually handed back
+            consumed = min(reader.bytes_read, chunks * chunk_bytes)
+            fraction = min(consumed / total_bytes, 1.0) if total_bytes else 0.0
+            progress(fraction, rows)
+    
+    if daily is None:
+        raise ValueError("No transactions found in file")
+    df = concat_transactions(retained)
+    if not df['Date'].is_monotonic_increasing:
+        df = df.sort_values('Date', kind='stable').reset_index(drop=True)
+    
+    return {
+        'df': df,
+        'rollup': build_rollup(daily),
+        'daily': daily,
+        'hash_index': np.sort(np.concatenate(hashes)),
+        'rows': rows,
+        'truncated': truncated
+    }
+
+def merge_datasets(datasets):
+    """Combine separately ingested datasets (e.g. one per account) into one"""
+    if len(datasets) == 1:
+        return datasets[0]
+    df = concat_transactions([dataset['df'] for dataset in datasets])
+    df = df.sort_values('Date', kind='stable').reset_index(drop=True)
+    daily = merge_daily_aggregates(*[dataset['daily'] for dataset in datasets])
+    return {
+        'df': df,
+        'rollup': build_rollup(daily),
+        'daily': daily,
+        'hash_index': np.sort(np.concatenate([hash_index(dataset) for dataset in datasets])),
+        'rows': sum(dataset['rows'] for dataset in datasets),
+        'truncated': any(dataset['truncated'] for dataset in datasets)
+    }
+
+def ingest_accounts(files, memory_budget_mb=INGEST_MEMORY_BUDGET_MB, engine='auto', workers=None):
+    """Ingest several account statements concurrently and merge them into one dataset.
+    
+    files is a list of dicts with 'source' (path or binary file) and
+    optionally 'account', 'layout' (see ingest_csv; default 'auto') and
+    'total_bytes'. Files are parsed on a thread pool: the pyarrow reader
+    releases the GIL while parsing, so the total time stays close to that
+    of the slowest file. The memory budget is split evenly between files.
+    """
+    budget = max(memory_budget_mb // max(len(files), 1), 1)
+    
+    def ingest_one(spec):
+        try:
+            return ingest_csv(
+                spec['source'], spec.get('total_bytes'), budget, engine,
+                layout=spec.get('layout', 'auto'), account=spec.get('account')
+            )
+        except Exception as e:
+            raise ValueError(f"{spec.get('account') or 'file'}: {e}") from e
+    
+    with ThreadPoolExecutor(max_workers=workers or min(len(files), os.cpu_count() or 1) or 1) as pool:
+        datasets = list(pool.map(ingest_one, files))
+    return merge_datasets(datasets)
+
+def hash_index(dataset):
+    """Sorted Txn_Hash values of every row ingested into dataset, built on first use"""
+    return dataset_index(dataset, 'hash_index', lambda dataset: np.sort(dataset['df']['Txn_Hash'].to_numpy()))
+
+def append_transactions(dataset, raw):
+    """Merge newly uploaded raw transactions into a processed dataset.
+    
+    Rows whose (Date, Description, Amount) fingerprint is already in the
+    dataset are dropped; repeats within the new upload itself are kept,
+    since the same purchase can legitimately occur twice in a day. Only the
+    remaining rows are categorized; their daily aggregates are merged into
+    the days they touch and folded into the rollup from the first of those
+    days on, and their fingerprints are inserted into the sorted index, so
+    apart from copying the rows the work grows with the size of the upload
+    rather than the history. A recurring index built on the dataset is
+    carried over the same way. Returns (dataset, rows_added,
+    month_keys_touched); the input dataset is left unchanged.
+    """
+    raw = raw.reset_index(drop=True)
+    dates = pd.to_datetime(raw['Date'])
+    cents = to_cents(raw['Amount'].astype(float).fillna(0))
+    hashes = transaction_hashes(dates, raw.get('Description'), cents)
+    
+    existing = hash_index(dataset)
+    positions = np.minimum(np.searchsorted(existing, hashes), max(len(existing) - 1, 0))
+    seen = existing[positions] == hashes if len(existing) else np.zeros(len(hashes), dtype=bool)
+    if seen.all():
+        return dataset, 0, set()
+    
+    new = raw[~seen].reset_index(drop=True)
+    new['Txn_Hash'] = hashes[~seen]
+    new = process_transactions(new)
+    
+    df = dataset['df']
+    combined = concat_transactions([df, new])
+    if df['Date'].iloc[-1] > new['Date'].iloc[0]:
+        # Both parts are date-sorted, so slot the new rows in rather than sorting everything
+        slots = df['Date'].searchsorted(new['Date'], side='right')
+        order = np.insert(np.arange(len(df)), slots, np.arange(len(df), len(combined)))
+        combined = combined.take(order).reset_index(drop=True)
+    
+    # Only the daily rows from the first new day on are regrouped
+    new_daily = daily_aggregates(new)
+    split = dataset['daily']['Day'].searchsorted(new_daily['Day'].iloc[0])
+    head, tail = dataset['daily'].iloc[:split], dataset['daily'].iloc[split:]
+    daily = pd.concat([head, merge_daily_aggregates(tail, new_daily)], ignore_index=True)
+    
+    new_hashes = np.sort(new['Txn_Hash'].to_numpy())
+    recurring = dataset.get('recurring_index')
+    return {
+        'df': combined,
+        'rollup': update_rollup(dataset['rollup'], new_daily),
+        'daily': daily,
+        'hash_index': np.insert(existing, np.searchsorted(existing, new_hashes), new_hashes),
+        'recurring_index': None if recurring is None else update_recurring_index(recurring, new),
+        'rows': dataset['rows'] + len(new),
+        'truncated': dataset['truncated']
+    }, len(new), set(new['Month_Key'].unique().tolist())
@@ -0,0 +1,135 @@
+"""Vectorized interest, loan and scenario-sweep calculations.
+
+Every function broadcasts over NumPy arrays of principal, annual rate (in
+percent), term in years and compounding periods per year, so thousands of
+scenarios are evaluated in one pass instead of one call per scenario.
+"""
+import numpy as np
+import pandas as pd
+
+COMPOUNDING_FREQUENCIES = {
+    'Annually': 1,
+    'Semi-annually': 2,
+    'Quarterly': 4,
+    'Monthly': 12,
+    'Daily': 365
+}
+
+SCENARIO_METRICS = ('simple_interest', 'compound_interest', 'payment', 'total_interest')
+
+def _periodic_rate(rate, periods_per_year):
+    return np.asarray(rate, dtype=float) / 100 / np.asarray(periods_per_year, dtype=float)
+
+def _term_periods(years, periods_per_year):
+    """Whole number of payment periods in a term, at least one"""
+    return np.maximum(np.rint(np.asarray(years, dtype=float) * periods_per_year), 1).astype(np.int64)
+
+def simple_interest(principal, rate, years):
+    """Simple interest principal * rate% * years"""
+    return np.asarray(principal, dtype=float) * (np.asarray(rate, dtype=float) / 100) * np.asarray(years, dtype=float)
+
+def compound_interest(principal, rate, years, periods_per_year=1):
+    """Interest earned when compounding periods_per_year times a year.
+    
+    Computed as principal * expm1(n * t * log1p(r / n)), which stays
+    accurate for small rates and long terms.
+    """
+    i = _periodic_rate(rate, periods_per_year)
+    exponent = np.asarray(periods_per_year, dtype=float) * np.asarray(years, dtype=float) * np.log1p(i)
+    return np.asarray(principal, dtype=float) * np.expm1(exponent)
+
+def loan_payment(principal, rate, years, periods_per_year=12):
+    """Level payment per period that repays principal over the term"""
+    principal = np.asarray(principal, dtype=float)
+    i = _periodic_rate(rate, periods_per_year)
+    periods = _term_periods(years, periods_per_year)
+    growth = np.expm1(periods * np.log1p(i))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = principal * i * (growth + 1) / growth
+    return np.where(i == 0, principal / periods, payment)
+
+def amortization_schedule(principal, rate, years, periods_per_year=12):
+    """Period-by-period schedule of many loans at once.
+    
+    The arguments broadcast to a common shape S. Returns a dict with
+    periods (the term of each loan, shape S) and payment, interest,
+    principal and balance arrays of shape S + (longest term,); entries
+    after a loan's last period are NaN. Balances use the closed form
+    B_k = P(1+i)^k - A((1+i)^k - 1)/i, so no loop over periods is needed.
+    """
+    principal, i, periods = np.broadcast_arrays(
+        np.asarray(principal, dtype=float),
+        _periodic_rate(rate, periods_per_year),
+        _term_periods(years, periods_per_year)
+    )
+    payment = loan_payment(principal, rate, years, periods_per_year)
+    payment = np.broadcast_to(payment, principal.shape)
+    k = np.arange(1, int(periods.max(initial=1)) + 1)
+    
+    growth = np.expm1(k * np.log1p(i)[..., None])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(i[..., None] == 0, k, growth / i[..., None])
+    balance = principal[..., None] * (growth + 1) - payment[..., None] * annuity
+    active = k <= periods[..., None]
+    balance = np.where(k == periods[..., None], 0.0, balance)
+    previous = np.concatenate([principal[..., None], balance[..., :-1]], axis=-1)
+    interest = previous * i[..., None]
+    
+    return {
+        'periods': periods,
+        'payment': np.where(active, payment[..., None], np.nan),
+        'interest': np.where(active, interest, np.nan),
+        'principal': np.where(active, payment[..., None] - interest, np.nan),
+        'balance': np.where(active, balance, np.nan)
+    }
+
+def amortization_table(principal, rate, years, periods_per_year=12):
+    """Amortization schedule of a single loan as a DataFrame"""
+    schedule = amortization_schedule(float(principal), float(rate), float(years), periods_per_year)
+    periods = int(schedule['periods'])
+    return pd.DataFrame({
+        'Period': np.arange(1, periods + 1),
+        'Payment': schedule['payment'][:periods],
+        'Interest': schedule['interest'][:periods],
+        'Principal': schedule['principal'][:periods],
+        'Balance': schedule['balance'][:periods]
+    })
+
+def scenario_grid(principal, rate, years, periods_per_year=12):
+    """Evaluate every combination of the given principals, rates, terms and frequencies.
+    
+    Each argument is a scalar or 1-D array; the result holds the axes
+    ('principal', 'rate', 'years', 'periods_per_year') and one array of
+    shape (principals, rates, terms, frequencies) per SCENARIO_METRICS
+    entry: simple and compound interest on the principal, and the level
+    payment and total interest of a loan of that size.
+    """
+    axes = {
+        'principal': np.atleast_1d(np.asarray(principal, dtype=float)),
+        'rate': np.atleast_1d(np.asarray(rate, dtype=float)),
+        'years': np.atleast_1d(np.asarray(years, dtype=float)),
+        'periods_per_year': np.atleast_1d(np.asarray(periods_per_year, dtype=np.int64))
+    }
+    p, r, t, n = np.ix_(*axes.values())
+    payment = loan_payment(p, r, t, n)
+    return {
+        'axes': axes,
+        'simple_interest': np.broadcast_to(simple_interest(p, r, t), payment.shape),
+        'compound_interest': compound_interest(p, r, t, n),
+        'payment': payment,
+        'total_interest': payment * _term_periods(t, n) - p
+    }
+
+def scenario_table(grid):
+    """A scenario_grid result as one row per scenario"""
+    axes = grid['axes']
+    columns = np.meshgrid(*axes.values(), indexing='ij')
+    table = pd.DataFrame({
+        'Principal': columns[0].ravel(),
+        'Rate': columns[1].ravel(),
+        'Years': columns[2].ravel(),
+        'Periods_Per_Year': columns[3].ravel()
+    })
+    for metric in SCENARIO_METRICS:
+        table[metric.title().replace(' ', '_')] = np.asarray(grid[metric]).ravel()
+    return table
@@ -0,0 +1,179 @@
+"""Bank and card statement column layouts, normalized to Date/Description/Amount."""
+import csv
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+# Statement layout name -> source column for each field. A layout has either
+# one signed 'amount' column or separate 'debit' and 'credit' columns;
+# 'negate' flips amounts from exports that show charges as positive,
+# 'date_format' gives the strftime format of the date column, and 'markers'
+# lists further columns only that layout's exports have, which detection
+# requires as well.
+BANK_LAYOUTS = {
+    'Standard': {
+        'date': 'Date', 'description': 'Description', 'amount': 'Amount',
+        'category': 'Category', 'type': 'Type'
+    },
+    'Chase checking': {'date': 'Posting Date', 'description': 'Description', 'amount': 'Amount', 'date_format': '%m/%d/%Y'},
+    'Chase card': {'date': 'Transaction Date', 'description': 'Description', 'amount': 'Amount', 'date_format': '%m/%d/%Y'},
+    'American Express': {
+        'date': 'Date', 'description': 'Description', 'amount': 'Amount', 'negate': True, 'date_format': '%m/%d/%Y',
+        'markers': ('Card Member',)
+    },
+    'Capital One': {'date': 'Transaction Date', 'description': 'Description', 'debit': 'Debit', 'credit': 'Credit'},
+    'Generic debit/credit': {'date': 'Date', 'description': 'Description', 'debit': 'Debit', 'credit': 'Credit'},
+    'HDFC Bank': {
+        'date': 'Date', 'description': 'Narration', 'debit': 'Withdrawal Amt.', 'credit': 'Deposit Amt.',
+        'date_format': '%d/%m/%y'
+    },
+    'ICICI Bank': {
+        'date': 'Transaction Date', 'description': 'Transaction Remarks',
+        'debit': 'Withdrawal Amount (INR )', 'credit': 'Deposit Amount (INR )', 'date_format': '%d/%m/%Y'
+    },
+}
+
+_REQUIRED_FIELDS = ('date', 'description', 'amount', 'debit', 'credit')
+
+def layout_columns(layout, optional=False):
+    """Source columns a layout reads (the required ones and markers, plus optional Category/Type)"""
+    fields = _REQUIRED_FIELDS + (('category', 'type') if optional else ())
+    return [layout[field] for field in fields if field in layout] + list(layout.get('markers', ()))
+
+def detect_layout(columns):
+    """Name of the most specific layout whose required columns are all present.
+    
+    More required columns is more specific. Returns None when no layout
+    matches or when several match equally specifically, since the columns
+    alone can't tell them apart.
+    """
+    present = set(columns)
+    matches = {name: len(layout_columns(layout)) for name, layout in BANK_LAYOUTS.items()
+               if set(layout_columns(layout)) <= present}
+    if not matches:
+        return None
+    best = max(matches.values())
+    names = [name for name, size in matches.items() if size == best]
+    return names[0] if len(names) == 1 else None
+
+def read_header(source):
+    """Column names from the first line of a CSV path or binary file, leaving files where they were"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as handle:
+            return read_header(handle)
+    position = source.tell()
+    line = source.readline()
+    source.seek(position)
+    return next(csv.reader(io.StringIO(line.decode('utf-8-sig'))), [])
+
+# A cleaned amount: optional minus sign, then digits with at most one decimal point
+_AMOUNT_PATTERN = r'^-?(\d+\.?\d*|\.\d+)$'
+
+def _unreadable_amount(value, row):
+    return ValueError(f"Unreadable amount {value!r} in row {row}")
+
+def _parse_amounts(values):
+    """Amounts as floats, tolerating thousands separators and currency symbols.
+    
+    Accounting-style amounts in parentheses, such as '(100.00)', are negative.
+    Cells without digits are missing; any other text that is not a number,
+    such as a trailing minus sign, raises ValueError naming it and its row
+    (the frame's index, counted from 1).
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.astype(float)
+    text = values.astype('string')
+    cleaned = text.str.replace(r'[^0-9.\-]', '', regex=True)
+    cleaned = cleaned.where(cleaned.str.contains(r'\d').fillna(False))
+    amounts = pd.to_numeric(cleaned, errors='coerce').astype(float)
+    bad = (cleaned.notna() & amounts.isna()).to_numpy(dtype=bool)
+    if bad.any():
+        i = int(np.argmax(bad))
+        raise _unreadable_amount(text.iloc[i], values.index[i] + 1)
+    negative = text.str.contains('(', regex=False).fillna(False).to_numpy(dtype=bool)
+    return amounts.where(~negative, -amounts)
+
+def _check_columns(names, layout):
+    missing = [name for name in layout_columns(layout) if name not in names]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+def _arrow_amounts(values, first_row=0):
+    """_parse_amounts for a pyarrow array; rows in errors are counted from first_row + 1"""
+    if pa.types.is_floating(values.type) or pa.types.is_integer(values.type):
+        return pc.cast(values, pa.float64())
+    cleaned = pc.replace_substring_regex(values, pattern=r'[^0-9.\-]', replacement='')
+    cleaned = pc.if_else(pc.match_substring_regex(cleaned, r'\d'), cleaned, pa.scalar(None, pa.string()))
+    bad = pc.invert(pc.match_substring_regex(cleaned, _AMOUNT_PATTERN))
+    if pc.any(bad).as_py():
+        i = pc.index(bad, True).as_py()
+        raise _unreadable_amount(values[i].as_py(), first_row + i + 1)
+    amounts = pc.cast(cleaned, pa.float64())
+    return pc.if_else(pc.match_substring(values, '('), pc.negate(amounts), amounts)
+
+def normalize_table(table, layout, first_row=0):
+    """normalize_transactions for a pyarrow Table or RecordBatch, returned as a DataFrame.
+    
+    Amount cleaning and date parsing run as pyarrow compute kernels, which
+    release the GIL, so several statements can be normalized in parallel.
+    first_row is the number of data rows before the table in its file, so
+    an unreadable amount is reported at its row in the file.
+    """
+    if isinstance(layout, str):
+        layout = BANK_LAYOUTS[layout]
+    _check_columns(table.schema.names, layout)
+    
+    if 'amount' in layout:
+        amounts = _arrow_amounts(table.column(layout['amount']), first_row)
+    else:
+        amounts = pc.subtract(
+            pc.fill_null(_arrow_amounts(table.column(layout['credit']), first_row), 0.0),
+            pc.fill_null(_arrow_amounts(table.column(layout['debit']), first_row), 0.0)
+        )
+    if layout.get('negate'):
+        amounts = pc.negate(amounts)
+    
+    dates = table.column(layout['date'])
+    if 'date_format' in layout:
+        dates = pc.strptime(dates, format=layout['date_format'], unit='s')
+    
+    columns = {'Date': dates, 'Description': table.column(layout['description']), 'Amount': amounts}
+    for field, name in (('category', 'Category'), ('type', 'Type')):
+        if field in layout and layout[field] in table.schema.names:
+            columns[name] = table.column(layout[field])
+    return pa.table(columns).to_pandas()
+
+def normalize_transactions(frame, layout):
+    """Map a statement frame onto the Date/Description/Amount schema (plus Category/Type if present)"""
+    if isinstance(layout, str):
+        layout = BANK_LAYOUTS[layout]
+    _check_columns(frame.columns, layout)
+    
+    if 'amount' in layout:
+        amounts = _parse_amounts(frame[layout['amount']])
+    else:
+        amounts = _parse_amounts(frame[layout['credit']]).fillna(0) - _parse_amounts(frame[layout['debit']]).fillna(0)
+    if layout.get('negate'):
+        amounts = -amounts
+    
+    dates = frame[layout['date']]
+    if 'date_format' in layout:
+        dates = pd.to_datetime(dates, format=layout['date_format'])
+    
+    normalized = pd.DataFrame({
+        'Date': dates.to_numpy(),
+        'Description': frame[layout['description']].to_numpy(),
+        'Amount': np.asarray(amounts, dtype=float)
+    })
+    for field, name in (('category', 'Category'), ('type', 'Type')):
+        if field in layout and layout[field] in frame.columns:
+            normalized[name] = frame[layout[field]].to_numpy()
+    return normalized
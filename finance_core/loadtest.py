@@ -0,0 +1,275 @@
+"""Concurrent-session load tests of the Streamlit apps.
+
+Each simulated user is its own headless session of an app, driven through
+Streamlit's app-testing API (streamlit.testing.v1.AppTest). Sessions share
+this process, as they would share a server process, and play their
+interaction scripts in parallel threads. Every rerun is timed and process
+memory is sampled throughout, so rerun latency, throughput and memory per
+session can be tracked as concurrency and dataset size grow. Streamlit is
+only imported once a load test runs.
+
+AppTest installs a process-wide runtime for the length of each rerun, so
+reruns from different sessions take turns. A rerun's latency counts the
+time it waits for its turn, like a rerun queued behind other sessions'
+work on a busy server process; its service time does not.
+"""
+import gc
+import os
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .bench import synthetic_holdings, synthetic_upload
+from .profiling import current_rss_bytes
+
+# App name -> script, relative to the repository root
+LOADTEST_APPS = {'dashboard': 'financial_cal1.py', 'fpti': 'fpti.py'}
+
+LOADTEST_SESSIONS = (1, 4, 16)
+
+LOADTEST_PERCENTILES = (50, 95, 99)
+
+# Longest a single rerun may take before the session fails, in seconds
+LOADTEST_TIMEOUT = 300
+
+# Seconds between process memory samples while sessions run
+RSS_SAMPLE_INTERVAL = 0.05
+
+# Held by each AppTest rerun, which swaps in its own global runtime
+_RUNTIME_LOCK = threading.Lock()
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _widget(elements, label):
+    """The first of elements with the given label"""
+    return next(element for element in elements if element.label == label)
+
+def dashboard_session(at, run, upload, first_day, last_day, rng, scrubs=5):
+    """A dashboard user: upload a statement, scrub the date filter, visit every view and export"""
+    run('open')
+    at.sidebar.file_uploader[0].set_value(('statement.csv', upload, 'text/csv'))
+    run('upload')
+    
+    span = (last_day - first_day).days
+    for _ in range(scrubs):
+        start = int(rng.integers(0, span + 1))
+        end = int(rng.integers(start, span + 1))
+        at.sidebar.date_input[0].set_value((first_day + timedelta(days=start), first_day + timedelta(days=end)))
+        run('date_filter')
+    
+    options = at.radio(key='active_view').options
+    for option in options[1:] + options[:1]:
+        at.radio(key='active_view').set_value(option)
+        run('switch_view')
+    
+    _widget(at.selectbox, "Transactions format").set_value("CSV")
+    _widget(at.button, "📦 Prepare Transactions Export").click()
+    run('export')
+    _widget(at.button, "📊 Export Summary Report").click()
+    run('summary_report')
+
+def fpti_session(at, run, holdings):
+    """An fpti user: compute simple interest, import and analyze a portfolio, then run a scenario sweep"""
+    run('open')
+    _widget(at.button, "Calculate Simple Interest").click()
+    run('simple_interest')
+    _widget(at.radio, "Holdings Input").set_value("Bulk Import")
+    run('switch_input')
+    _widget(at.text_area, "Or paste a holdings table").set_value(holdings)
+    _widget(at.button, "Analyze Portfolio").click()
+    run('portfolio_analysis')
+    _widget(at.button, "Run Scenario Sweep").click()
+    run('scenario_sweep')
+
+@contextmanager
+def _shared_script_cache():
+    """Let every AppTest rerun reuse one compiled copy of each script, as a server does.
+    
+    AppTest otherwise parses, rewrites for magic and compiles the script on
+    every rerun, which can cost more than the rerun itself.
+    """
+    from unittest import mock
+    
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    
+    cache = ScriptCache()
+    with mock.patch('streamlit.testing.v1.app_test.ScriptCache', return_value=cache), \
+            mock.patch('streamlit.testing.v1.local_script_runner.ScriptCache', return_value=cache):
+        yield
+
+def _play(path, script, timeout):
+    """Run one session's script; returns (session, [(step, latency, service time)], [error])"""
+    from streamlit.testing.v1 import AppTest
+    
+    at = AppTest.from_file(path, default_timeout=timeout)
+    timings, errors = [], []
+    
+    def run(step):
+        requested = time.perf_counter()
+        with _RUNTIME_LOCK:
+            started = time.perf_counter()
+            at.run()
+        finished = time.perf_counter()
+        timings.append((step, finished - requested, finished - started))
+        errors.extend(f"{step}: {exception.value}" for exception in at.exception)
+    
+    try:
+        script(at, run)
+    except Exception as e:
+        # A widget the script expects is missing, usually because an earlier rerun failed
+        errors.append(f"script: {type(e).__name__}: {e}")
+    return at, timings, errors
+
+def _latency_summary(seconds):
+    summary = {f"p{p}_ms": round(float(np.percentile(seconds, p)) * 1000, 2) for p in LOADTEST_PERCENTILES}
+    summary['max_ms'] = round(float(np.max(seconds)) * 1000, 2)
+    return summary
+
+def _session_scripts(app, rows, scrubs, seed):
+    """Function from a session number to that session's script, for app at a dataset size"""
+    if app == 'fpti':
+        holdings = synthetic_holdings(rows, seed).to_csv(index=False)
+        return lambda session: (lambda at, run: fpti_session(at, run, holdings))
+    raw = synthetic_upload(rows, seed)
+    upload = raw.to_csv(index=False).encode()
+    dates = pd.to_datetime(raw['Date'])
+    first_day, last_day = dates.min().date(), dates.max().date()
+    
+    def script(session):
+        rng = np.random.default_rng([seed, session])
+        return lambda at, run: dashboard_session(at, run, upload, first_day, last_day, rng, scrubs)
+    return script
+
+def _measure_sessions(app, path, scripts, sessions, rows, timeout):
+    """Warm up with one untimed session, then play sessions at once and summarize their reruns"""
+    # The warm-up session is numbered after the timed ones
+    _play(path, scripts(sessions), timeout)
+    gc.collect()
+    
+    baseline = current_rss_bytes() or 0
+    peak = [baseline]
+    done = threading.Event()
+    
+    def sample():
+        while not done.wait(RSS_SAMPLE_INTERVAL):
+            peak[0] = max(peak[0], current_rss_bytes() or 0)
+    
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        played = list(pool.map(lambda session: _play(path, scripts(session), timeout), range(sessions)))
+    seconds = time.perf_counter() - started
+    retained = (current_rss_bytes() or 0) - baseline
+    done.set()
+    sampler.join()
+    peak[0] = max(peak[0], baseline + retained)
+    
+    timings = [timing for _, session_timings, _ in played for timing in session_timings]
+    errors = [error for _, _, session_errors in played for error in session_errors]
+    del played
+    gc.collect()
+    
+    latencies = np.array([latency for _, latency, _ in timings]) if timings else np.zeros(1)
+    service = np.array([elapsed for _, _, elapsed in timings]) if timings else np.zeros(1)
+    steps = {}
+    for step, _, elapsed in timings:
+        steps.setdefault(step, []).append(elapsed)
+    return {
+        'app': app,
+        'sessions': sessions,
+        'rows': rows,
+        'reruns': len(timings),
+        'errors': len(errors),
+        **_latency_summary(latencies),
+        'service_p50_ms': round(float(np.median(service)) * 1000, 2),
+        'reruns_per_sec': round(len(timings) / seconds, 2) if seconds > 0 else None,
+        'seconds': round(seconds, 3),
+        'rss_peak_mb': round(peak[0] / 1024 ** 2, 1),
+        'rss_per_session_mb': round(max(retained, 0) / sessions / 1024 ** 2, 2),
+        'steps': {step: {'reruns': len(values), **_latency_summary(values)} for step, values in steps.items()},
+        'error_samples': errors[:5]
+    }
+
+def run_load_test(app, sessions, rows, scrubs=5, timeout=LOADTEST_TIMEOUT, seed=42):
+    """Play sessions concurrent sessions of app against a dataset of rows rows.
+    
+    rows is the uploaded statement's size for the dashboard and the number
+    of imported holdings for fpti. An untimed session runs first so
+    imports and process-wide caches are warm. Returns rerun latency
+    percentiles over all sessions, the median service time, service time
+    percentiles per step, throughput in reruns per second, and memory:
+    peak process RSS, and the growth of RSS while all sessions are alive
+    divided by the number of sessions.
+    """
+    path = os.path.join(APP_ROOT, LOADTEST_APPS[app])
+    scripts = _session_scripts(app, rows, scrubs, seed)
+    with _shared_script_cache():
+        return _measure_sessions(app, path, scripts, sessions, rows, timeout)
+
+def run_load_tests(apps=tuple(LOADTEST_APPS), sessions=LOADTEST_SESSIONS, sizes=(10_000,), holdings=200,
+                   scrubs=5, timeout=LOADTEST_TIMEOUT, seed=42, progress=None):
+    """Run run_load_test for each app, dataset size and session count; returns a JSON-ready results dict.
+    
+    Dashboard runs use each of sizes as the upload size; fpti runs import
+    holdings positions. progress, if given, is called with each result as
+    it completes.
+    """
+    results = []
+    for app in apps:
+        for rows in (sizes if app == 'dashboard' else (holdings,)):
+            for count in sessions:
+                result = run_load_test(app, count, rows, scrubs=scrubs, timeout=timeout, seed=seed)
+                results.append(result)
+                if progress:
+                    progress(result)
+    import streamlit
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'streamlit': streamlit.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'scrubs': scrubs,
+            'seed': seed
+        },
+        'results': results
+    }
+
+def compare_load_tests(current, baseline, tolerance=0.25):
+    """Compare load test results against a baseline run.
+    
+    Returns one row per (app, sessions, rows) present in both, with the
+    p95 latency and per-session memory ratios (current / baseline) and
+    whether either exceeds 1 + tolerance. Memory below 1 MB per session
+    is treated as noise.
+    """
+    previous = {(r['app'], r['sessions'], r['rows']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        base = previous.get((result['app'], result['sessions'], result['rows']))
+        if base is None:
+            continue
+        latency_ratio = result['p95_ms'] / base['p95_ms'] if base['p95_ms'] > 0 else float('inf')
+        memory_ratio = max(result['rss_per_session_mb'], 1.0) / max(base['rss_per_session_mb'], 1.0)
+        rows.append({
+            'app': result['app'],
+            'sessions': result['sessions'],
+            'rows': result['rows'],
+            'p95_ms': result['p95_ms'],
+            'baseline_p95_ms': base['p95_ms'],
+            'latency_ratio': round(latency_ratio, 3),
+            'rss_per_session_mb': result['rss_per_session_mb'],
+            'baseline_rss_per_session_mb': base['rss_per_session_mb'],
+            'memory_ratio': round(memory_ratio, 3),
+            'regression': latency_ratio > 1 + tolerance or memory_ratio > 1 + tolerance
+        })
+    return rows
@@ -0,0 +1,205 @@
+"""Net worth snapshots as an append-optimized time series."""
+import io
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# Resampling frequencies, as offsets landing on each period's last day
+NET_WORTH_FREQUENCIES = {'D': pd.offsets.Day(), 'W': pd.offsets.Week(weekday=6), 'M': pd.offsets.MonthEnd()}
+
+NET_WORTH_COLUMNS = ['Date', 'Assets', 'Liabilities', 'Net_Worth']
+
+# Source of NetWorthSeries versions, unique across every series in the process
+_versions = itertools.count(1)
+
+def _as_days(dates):
+    return pd.to_datetime(pd.Series(np.atleast_1d(dates))).to_numpy().astype('datetime64[D]')
+
+class NetWorthSeries:
+    """Net worth snapshots in growable NumPy arrays, kept sorted by date.
+    
+    Appending doubles the buffers when they fill up, so adding a snapshot
+    costs amortized O(1) and never rebuilds a DataFrame. Snapshots sharing
+    a date keep the order they were added in. version changes on every
+    update and is never shared by two series, so derived charts and tables
+    can be cached against it.
+    """
+    
+    def __init__(self, capacity=64):
+        self._days = np.empty(capacity, dtype='datetime64[D]')
+        self._assets = np.empty(capacity)
+        self._liabilities = np.empty(capacity)
+        self._size = 0
+        self.version = next(_versions)
+    
+    def __len__(self):
+        return self._size
+    
+    @property
+    def dates(self):
+        return self._days[:self._size]
+    
+    @property
+    def assets(self):
+        return self._assets[:self._size]
+    
+    @property
+    def liabilities(self):
+        return self._liabilities[:self._size]
+    
+    @property
+    def net_worth(self):
+        return self.assets - self.liabilities
+    
+    def _reserve(self, extra):
+        needed = self._size + extra
+        if needed <= len(self._days):
+            return
+        capacity = max(needed, 2 * len(self._days))
+        for name in ('_days', '_assets', '_liabilities'):
+            grown = np.empty(capacity, dtype=getattr(self, name).dtype)
+            grown[:self._size] = getattr(self, name)[:self._size]
+            setattr(self, name, grown)
+    
+    def extend(self, dates, assets, liabilities):
+        """Add many snapshots at once; only the out-of-order tail is re-sorted"""
+        days = _as_days(dates)
+        count = len(days)
+        if not count:
+            return self
+        self._reserve(count)
+        end = self._size + count
+        self._days[self._size:end] = days
+        self._assets[self._size:end] = np.broadcast_to(np.asarray(assets, dtype=float), count)
+        self._liabilities[self._size:end] = np.broadcast_to(np.asarray(liabilities, dtype=float), count)
+        
+        start = np.searchsorted(self._days[:self._size], days.min(), side='right')
+        if start < self._size or np.any(days[1:] < days[:-1]):
+            order = start + np.argsort(self._days[start:end], kind='stable')
+            for array in (self._days, self._assets, self._liabilities):
+                array[start:end] = array[order]
+        self._size = end
+        self.version = next(_versions)
+        return self
+    
+    def append(self, date, assets, liabilities):
+        """Add one snapshot"""
+        return self.extend([date], [assets], [liabilities])
+    
+    def latest(self):
+        """The most recent snapshot as a record, or None when empty"""
+        if not self._size:
+            return None
+        return self.records(self._size - 1)[0]
+    
+    def to_frame(self):
+        """Snapshots as a DataFrame with NET_WORTH_COLUMNS, oldest first"""
+        return pd.DataFrame({
+            'Date': self.dates.astype('datetime64[ns]'),
+            'Assets': self.assets,
+            'Liabilities': self.liabilities,
+            'Net_Worth': self.net_worth
+        })
+    
+    def records(self, start=0):
+        """Snapshots from position start on, as dicts with datetime.date Dates"""
+        return [
+            {'Date': day, 'Assets': float(assets), 'Liabilities': float(liabilities), 'Net_Worth': float(assets - liabilities)}
+            for day, assets, liabilities in zip(self.dates[start:].tolist(), self.assets[start:], self.liabilities[start:])
+        ]
+    
+    @classmethod
+    def from_frame(cls, frame):
+        """Series from a frame with Date, Assets and Liabilities columns (or a list of records)"""
+        frame = pd.DataFrame(frame, columns=NET_WORTH_COLUMNS) if isinstance(frame, list) else frame
+        series = cls(capacity=max(64, len(frame)))
+        return series.extend(frame['Date'].to_numpy(), frame['Assets'].to_numpy(), frame['Liabilities'].to_numpy())
+    
+    def _period_ends(self, freq):
+        """Last day of every freq period from the first snapshot's to the last one's"""
+        offset = NET_WORTH_FREQUENCIES[freq]
+        first, last = (offset.rollforward(pd.Timestamp(day)) for day in (self.dates[0], self.dates[-1]))
+        return pd.date_range(first, last, freq=offset).to_numpy().astype('datetime64[D]')
+    
+    def resample(self, freq='M', method='linear'):
+        """Balances at the end of each day ('D'), week ('W') or month ('M').
+        
+        With method 'linear' balances between snapshots are interpolated in
+        time; with 'ffill' the last snapshot on or before each period end is
+        used. Periods after the last snapshot hold its value, and only the
+        last snapshot of a day counts.
+        """
+        if not self._size:
+            return pd.DataFrame(columns=NET_WORTH_COLUMNS[1:], index=pd.DatetimeIndex([], name='Date'))
+        days = self.dates.astype(np.int64)
+        keep = np.append(days[1:] != days[:-1], True)
+        days, assets, liabilities = days[keep], self.assets[keep], self.liabilities[keep]
+        ends = self._period_ends(freq)
+        targets = ends.astype(np.int64)
+        if method == 'linear':
+            resampled = [np.interp(targets, days, values) for values in (assets, liabilities)]
+        elif method == 'ffill':
+            positions = np.maximum(np.searchsorted(days, targets, side='right') - 1, 0)
+            resampled = [assets[positions], liabilities[positions]]
+        else:
+            raise ValueError(f"Unknown resampling method: {method}")
+        return pd.DataFrame(
+            {'Assets': resampled[0], 'Liabilities': resampled[1], 'Net_Worth': resampled[0] - resampled[1]},
+            index=pd.DatetimeIndex(ends.astype('datetime64[ns]'), name='Date')
+        )
+
+def read_net_worth(source):
+    """Net worth history from a CSV of balances.
+    
+    Needs a Date column and either Assets and Liabilities or a single
+    Net_Worth (or Net Worth / Balance) column; a lone balance is split into
+    assets or liabilities by its sign.
+    """
+    if isinstance(source, str) and '\n' in source:
+        source = io.StringIO(source)
+    frame = pd.read_csv(source)
+    columns = {str(column).strip().lower().replace(' ', '_'): column for column in frame.columns}
+    if 'date' not in columns:
+        raise ValueError("Balance history needs a Date column")
+    dates = pd.to_datetime(frame[columns['date']])
+    if 'assets' in columns:
+        assets = pd.to_numeric(frame[columns['assets']], errors='coerce').fillna(0)
+        liabilities = pd.to_numeric(frame[columns['liabilities']], errors='coerce').fillna(0) if 'liabilities' in columns else 0.0
+    else:
+        balance_column = next((columns[name] for name in ('net_worth', 'balance') if name in columns), None)
+        if balance_column is None:
+            raise ValueError("Balance history needs Assets and Liabilities, or a Net_Worth or Balance column")
+        balance = pd.to_numeric(frame[balance_column], errors='coerce').fillna(0)
+        assets, liabilities = balance.clip(lower=0), (-balance).clip(lower=0)
+    frame = pd.DataFrame({'Date': dates, 'Assets': assets, 'Liabilities': liabilities}).dropna(subset=['Date'])
+    return NetWorthSeries.from_frame(frame)
+
+def net_worth_cash_flow(series, rollup, freq='M', method='linear'):
+    """Resampled net worth joined with the transactions' cash flow per period.
+    
+    Income and Expenses come from the rollup's daily prefix sums, so each
+    period costs two lookups whatever the number of transactions.
+    Other_Change is the part of the net worth change not explained by the
+    recorded cash flow (market moves, untracked accounts); both are NaN for
+    the first period, which has no earlier balance.
+    """
+    balances = series.resample(freq, method)
+    days = rollup['days']
+    if len(days) and len(balances):
+        # Period boundaries: the end of the period before the first, then every period end
+        ends = balances.index.to_numpy().astype('datetime64[D]')
+        previous = (pd.Timestamp(ends[0]) - NET_WORTH_FREQUENCIES[freq]).to_datetime64().astype('datetime64[D]')
+        first = np.datetime64(days[0].date(), 'D')
+        k = np.clip((np.append(previous, ends) - first).astype(np.int64) + 1, 0, len(days))
+        income = np.diff(rollup['positive'][k]) / 100
+        expenses = -np.diff(rollup['negative'][k]) / 100
+    else:
+        income = expenses = np.zeros(len(balances))
+    joined = balances[['Net_Worth']].copy()
+    joined['Change'] = joined['Net_Worth'].diff()
+    joined['Income'] = income
+    joined['Expenses'] = expenses
+    joined['Net_Cash_Flow'] = joined['Income'] - joined['Expenses']
+    joined['Other_Change'] = joined['Change'] - joined['Net_Cash_Flow']
+    return joined
@@ -0,0 +1,180 @@
+"""Portfolio allocation and diversification analysis."""
+import io
+import re
+
+import numpy as np
+import pandas as pd
+
+# Accepted header names (lowercased) for each holdings column; Name and Value are required
+HOLDING_COLUMNS = {
+    'Name': ('name', 'asset', 'asset name', 'holding', 'security', 'symbol', 'ticker'),
+    'Value': ('value', 'market value', 'market_value', 'amount', 'balance', 'asset value'),
+    'Sector': ('sector', 'industry'),
+    'Asset_Class': ('asset class', 'asset_class', 'class', 'asset type', 'type'),
+    'Expected_Return': ('expected return', 'expected_return', 'expected return (%)', 'return', 'return (%)'),
+    'Volatility': ('volatility', 'volatility (%)', 'risk', 'std dev', 'stdev')
+}
+
+# Holdings groupings rolled up by analyze_holdings when the column is present
+ROLLUP_COLUMNS = ('Sector', 'Asset_Class')
+
+# Largest positions whose combined share is reported
+CONCENTRATION_TOP_N = (1, 5, 10)
+
+# Decimal separator -> pattern of a number using it, with the other separator for thousands
+_NUMBER_PATTERNS = {
+    '.': r'(?=.*\d)-?(?:\d{1,3}(?:,\d{3})+|\d*)(?:\.\d+)?',
+    ',': r'(?=.*\d)-?(?:\d{1,3}(?:\.\d{3})+|\d*)(?:,\d+)?'
+}
+
+def portfolio_allocation(assets, threshold):
+    """Each asset's share of the portfolio and the assets above threshold percent.
+    
+    assets is a DataFrame (or list of dicts) with Name and Value columns.
+    Returns a dict with the allocation (adding Percentage), the rows over
+    the threshold and the diversification score (100 minus the largest share).
+    """
+    df = pd.DataFrame(assets)
+    df['Percentage'] = (df['Value'] / df['Value'].sum()) * 100
+    return {
+        'allocation': df,
+        'over_threshold': df[df['Percentage'] > threshold],
+        'diversification_score': 100 - df['Percentage'].max()
+    }
+
+def _decimal_separator(numbers):
+    """'.' or ',', whichever the numbers use as their decimal separator.
+    
+    Where a number has both, the last one is the decimal separator. A
+    separator repeated within a number separates thousands, and one not
+    followed by exactly three digits is a decimal separator. Numbers like
+    '1,000' fit either reading and count as using '.'.
+    """
+    both = numbers[numbers.str.contains('.', regex=False) & numbers.str.contains(',', regex=False)]
+    if len(both):
+        return ',' if (both.str.rfind(',') > both.str.rfind('.')).mean() > 0.5 else '.'
+    for separator, other in ((',', '.'), ('.', ',')):
+        if numbers.str.count(re.escape(other)).gt(1).any():
+            return separator
+        if numbers.str.contains(re.escape(separator) + r'(?!\d{3}$)', regex=True).any():
+            return separator
+    return '.'
+
+def _parse_values(values, decimal=None):
+    """Money amounts written as text, as floats.
+    
+    Currency symbols or codes around the number, and spaces and
+    apostrophes within it, are ignored. decimal is the decimal separator
+    ('.' or ','), detected from the values when None; the other one may
+    separate thousands. Blank values give NaN, and any other value that
+    isn't a number in that format raises ValueError.
+    """
+    # No-break and narrow no-break spaces also separate thousands
+    text = pd.Series(values, dtype='string').fillna('').str.replace('[\u00a0\u202f]', ' ', regex=True)
+    numbers = text.str.replace(r'[^\d.,\-]', '', regex=True)
+    # Anything else between the digits means this isn't one number
+    numbers = numbers.where(~text.str.contains(r"\d[^\d.,\s']+\d", regex=True), 'x')
+    if decimal is None:
+        decimal = _decimal_separator(numbers[numbers != ''])
+    if decimal not in _NUMBER_PATTERNS:
+        raise ValueError("decimal must be '.' or ','")
+    bad = (numbers != '') & ~numbers.str.fullmatch(_NUMBER_PATTERNS[decimal]).fillna(False)
+    bad |= (numbers == '') & (text.str.strip() != '')
+    if bad.any():
+        raise ValueError(f"Unreadable holding values: {', '.join(text[bad].head(5))}")
+    thousands = ',' if decimal == '.' else '.'
+    numbers = numbers.str.replace(thousands, '', regex=False).str.replace(decimal, '.', regex=False)
+    return pd.to_numeric(numbers.replace('', pd.NA), errors='coerce').astype(float)
+
+def read_holdings(source, decimal=None):
+    """Positions from a holdings CSV or a table pasted as text.
+    
+    source is a path, file object or string; comma, tab and semicolon
+    separated tables are accepted. Headers are matched case-insensitively
+    against HOLDING_COLUMNS, and values may carry currency symbols and
+    thousands separators. decimal ('.' or ',') is the values' decimal
+    separator, detected from the values when None. Rows without a value
+    are dropped and a value that can't be read raises ValueError. Expected
+    returns and volatilities (in percent) may carry a % sign.
+    """
+    if isinstance(source, str) and '\n' in source:
+        source = io.StringIO(source)
+    if hasattr(source, 'read'):
+        text = source.read()
+        text = text.decode('utf-8-sig') if isinstance(text, bytes) else text
+        first_line = text.lstrip().split('\n', 1)[0]
+        sep = max(('\t', ';', ','), key=first_line.count)
+        frame = pd.read_csv(io.StringIO(text), sep=sep, dtype=str, skipinitialspace=True)
+    else:
+        frame = pd.read_csv(source, dtype=str, skipinitialspace=True)
+    
+    lookup = {str(column).strip().lower(): column for column in frame.columns}
+    columns = {}
+    for name, aliases in HOLDING_COLUMNS.items():
+        match = next((lookup[alias] for alias in aliases if alias in lookup), None)
+        if match is not None:
+            columns[name] = frame[match]
+    missing = [name for name in ('Name', 'Value') if name not in columns]
+    if missing:
+        raise ValueError(f"Holdings table needs {' and '.join(missing)} columns; found {', '.join(map(str, frame.columns))}")
+    
+    holdings = pd.DataFrame(columns)
+    holdings['Value'] = _parse_values(holdings['Value'], decimal).to_numpy()
+    for name in ('Expected_Return', 'Volatility'):
+        if name in holdings.columns:
+            holdings[name] = pd.to_numeric(holdings[name].str.replace('%', '', regex=False), errors='coerce')
+    holdings['Name'] = holdings['Name'].fillna('').str.strip()
+    for name in ROLLUP_COLUMNS:
+        if name in holdings.columns:
+            holdings[name] = holdings[name].fillna('Unclassified').str.strip().replace('', 'Unclassified')
+    return holdings[holdings['Value'].notna()].reset_index(drop=True)
+
+def concentration_metrics(values, top_n=CONCENTRATION_TOP_N):
+    """Concentration of a portfolio from its position values.
+    
+    Returns the Herfindahl-Hirschman index on the 0-10,000 scale (sum of
+    squared percentage shares), the effective number of holdings (1 / sum
+    of squared weights) and the combined percentage share of the largest
+    N positions for each N in top_n.
+    """
+    values = np.asarray(values, dtype=float)
+    total = values.sum()
+    if not len(values) or total <= 0:
+        return {'hhi': 0.0, 'effective_holdings': 0.0, 'top_share': {n: 0.0 for n in top_n}}
+    weights = values / total
+    squared = float(np.dot(weights, weights))
+    ranked = np.cumsum(np.sort(weights)[::-1]) * 100
+    return {
+        'hhi': squared * 10_000,
+        'effective_holdings': 1 / squared,
+        'top_share': {n: float(ranked[min(n, len(ranked)) - 1]) for n in top_n}
+    }
+
+def allocation_rollup(allocation, column):
+    """Holdings count, value and percentage share per group of column, largest first"""
+    grouped = allocation.groupby(column, sort=False, observed=True).agg(
+        Holdings=('Value', 'size'),
+        Value=('Value', 'sum'),
+        Percentage=('Percentage', 'sum')
+    )
+    return grouped.sort_values('Value', ascending=False).reset_index()
+
+def analyze_holdings(holdings, threshold, top_n=CONCENTRATION_TOP_N):
+    """portfolio_allocation plus concentration metrics and group rollups.
+    
+    Adds concentration (see concentration_metrics), rollups (one
+    allocation_rollup per ROLLUP_COLUMNS entry present in holdings) and
+    groups_over_threshold, the rollup rows above threshold percent.
+    """
+    analysis = portfolio_allocation(holdings, threshold)
+    allocation = analysis['allocation']
+    analysis['concentration'] = concentration_metrics(allocation['Value'].to_numpy(), top_n)
+    analysis['rollups'] = {
+        column: allocation_rollup(allocation, column)
+        for column in ROLLUP_COLUMNS if column in allocation.columns
+    }
+    analysis['groups_over_threshold'] = {
+        column: rollup[rollup['Percentage'] > threshold]
+        for column, rollup in analysis['rollups'].items()
+    }
+    return analysis
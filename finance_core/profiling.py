@@ -0,0 +1,177 @@
+"""Per-rerun stage timing and memory instrumentation."""
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# Where JSON profile lines go: unset to disable, '-' for stderr, else a file path
+PROFILE_LOG = os.environ.get('FINANCE_PROFILE_LOG')
+
+logger = logging.getLogger('finance_core.profile')
+
+# Third-party modules the Streamlit apps depend on, checked by import_costs
+APP_DEPENDENCIES = ('streamlit', 'pandas', 'numpy', 'pyarrow', 'plotly.express', 'plotly.graph_objects', 'finance_core')
+
+# Run in a fresh interpreter: import the preloaded modules, then time one import
+_IMPORT_PROBE = '''
+import importlib, json, sys, time
+for name in {after!r}:
+    importlib.import_module(name)
+loaded = len(sys.modules)
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(json.dumps({{'seconds': time.perf_counter() - start, 'modules': len(sys.modules) - loaded}}))
+'''
+
+# Each Streamlit session runs its script in its own thread
+_local = threading.local()
+
+# Sessions that asked for allocation tracing; tracemalloc is process-wide,
+# so it stays on while any of them still wants it
+_tracing_sessions = set()
+_tracing_lock = threading.Lock()
+
+def current_rss_bytes():
+    """Resident set size of this process, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def size_bucket(rows):
+    """Order-of-magnitude label for a dataset size, used to tag profiles"""
+    for limit, label in ((10_000, '<10k'), (100_000, '10k-100k'), (1_000_000, '100k-1M'), (10_000_000, '1M-10M')):
+        if rows < limit:
+            return label
+    return '10M+'
+
+def _configure_logging():
+    if not PROFILE_LOG or logger.handlers:
+        return
+    handler = logging.StreamHandler() if PROFILE_LOG == '-' else logging.FileHandler(PROFILE_LOG)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+class RerunProfile:
+    """Wall time and memory of the named stages of one script run.
+    
+    Memory is the process RSS after each stage and its change during the
+    stage; with trace_memory, the peak of Python-tracked allocations
+    (tracemalloc, which numpy and pandas report to) is recorded as well, at
+    some cost in speed.
+    """
+    
+    def __init__(self, session=None, trace_memory=False):
+        self.session = session
+        self.trace_memory = trace_memory
+        self.started = time.perf_counter()
+        self.stages = []
+        with _tracing_lock:
+            if trace_memory:
+                _tracing_sessions.add(session)
+            else:
+                _tracing_sessions.discard(session)
+            if _tracing_sessions and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            elif not _tracing_sessions and tracemalloc.is_tracing():
+                tracemalloc.stop()
+    
+    @contextmanager
+    def stage(self, name):
+        rss_before = current_rss_bytes()
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {'stage': name, 'seconds': round(time.perf_counter() - start, 6)}
+            rss_after = current_rss_bytes()
+            if rss_after is not None:
+                record['rss_mb'] = round(rss_after / 1024 ** 2, 1)
+                record['rss_delta_mb'] = round((rss_after - rss_before) / 1024 ** 2, 1)
+            if tracing and tracemalloc.is_tracing():
+                record['peak_mb'] = round((tracemalloc.get_traced_memory()[1] - traced_before) / 1024 ** 2, 1)
+            self.stages.append(record)
+    
+    def finish(self, **tags):
+        """Summary record of the run, logged as one JSON line when PROFILE_LOG is set"""
+        record = {
+            'event': 'rerun',
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'session': self.session,
+            **tags,
+            'total_seconds': round(time.perf_counter() - self.started, 6),
+            'stages': self.stages
+        }
+        if 'rows' in tags:
+            record['size_bucket'] = size_bucket(tags['rows'])
+        _configure_logging()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(record, default=str))
+        return record
+
+def start_profile(session=None, trace_memory=False):
+    """Begin profiling this thread's run; stage() calls then record into it"""
+    _local.profile = RerunProfile(session, trace_memory)
+    return _local.profile
+
+def current_profile():
+    return getattr(_local, 'profile', None)
+
+@contextmanager
+def stage(name):
+    """Time a named stage of the current run (a no-op when none is being profiled)"""
+    profile = current_profile()
+    if profile is None:
+        yield
+        return
+    with profile.stage(name):
+        yield
+
+def finish_profile(**tags):
+    """Finish this thread's profile; returns its record, or None if none was started"""
+    profile = current_profile()
+    if profile is None:
+        return None
+    _local.profile = None
+    return profile.finish(**tags)
+
+def import_costs(modules=APP_DEPENDENCIES, after=(), repeat=3):
+    """Cold import time of each module, each measured in a fresh interpreter.
+    
+    The modules in after are imported first and not counted, e.g.
+    ('streamlit',) to see what an app adds to an already running server.
+    The best of repeat runs is kept. Returns one dict per module (module,
+    seconds, modules newly loaded, or error), slowest first.
+    """
+    env = dict(os.environ)
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [package_root, env.get('PYTHONPATH')]))
+    results = []
+    for module in modules:
+        best = None
+        for _ in range(max(1, repeat)):
+            run = subprocess.run(
+                [sys.executable, '-c', _IMPORT_PROBE.format(after=tuple(after), module=module)],
+                capture_output=True, text=True, env=env
+            )
+            if run.returncode != 0:
+                best = {'error': (run.stderr.strip().splitlines() or ['import failed'])[-1]}
+                break
+            sample = json.loads(run.stdout.strip().splitlines()[-1])
+            if best is None or sample['seconds'] < best['seconds']:
+                best = sample
+        results.append({'module': module, **best})
+    return sorted(results, key=lambda row: row.get('seconds', -1), reverse=True)
@@ -0,0 +1,246 @@
+"""Recurring transaction and subscription detection.
+
+Transactions are grouped by normalized description, sign and amount band,
+then sorted by (group, day) once so every interval between consecutive
+charges of a group is a single np.diff. Interval statistics per group come
+from sorted-array reductions, never from comparing pairs of transactions,
+so detection is O(n log n) and appending rows only re-examines the groups
+they touch.
+"""
+import numpy as np
+import pandas as pd
+
+from .indexes import dataset_index
+
+# Frequency -> (period in days, tolerance in days, minimum occurrences)
+RECURRING_FREQUENCIES = {
+    'Weekly': (7.0, 1.0, 4),
+    'Biweekly': (14.0, 2.0, 3),
+    'Monthly': (30.44, 3.0, 3),
+    'Quarterly': (91.31, 7.0, 3),
+    'Annual': (365.25, 10.0, 2)
+}
+
+# Share of a group's intervals that must fall within its period's tolerance
+RECURRING_MIN_REGULARITY = 0.75
+
+# Relative width of the amount bands charges are grouped into
+AMOUNT_BAND_WIDTH = 0.1
+
+# Recurring expenses whose amounts vary less than this (relative to the mean) count as subscriptions
+SUBSCRIPTION_AMOUNT_SPREAD = 0.05
+
+# Group keys pack (description id, amount band, sign) into one int64
+_BAND_SLOTS = 4096
+
+RECURRING_COLUMNS = [
+    'Description', 'Category', 'Type', 'Frequency', 'Interval_Days', 'Occurrences', 'Amount',
+    'Annual_Amount', 'First_Date', 'Last_Date', 'Next_Date', 'Regularity', 'Active', 'Subscription'
+]
+
+def normalize_descriptions(descriptions):
+    """Descriptions reduced to lowercase words, without reference numbers or punctuation.
+    
+    Tokens containing digits (card numbers, order ids, dates) are dropped,
+    so 'NETFLIX.COM 866-579 #1234' and 'Netflix.com 866-579 #9876' match.
+    """
+    text = pd.Series(descriptions, dtype='string').fillna('').str.lower()
+    text = text.str.replace(r'\S*\d\S*', ' ', regex=True)
+    return text.str.replace(r'[^a-z]+', ' ', regex=True).str.strip()
+
+def _row_keys(df, texts, labels):
+    """Group key, day number and cents of each usable row of df.
+    
+    texts maps normalized descriptions to ids and labels maps ids to the
+    latest (description, category) seen; both are extended in place. Only
+    the distinct descriptions are normalized.
+    """
+    if df is None or not len(df) or 'Description' not in df.columns:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty
+    codes, uniques = pd.factorize(df['Description'])
+    normalized = normalize_descriptions(np.asarray(uniques, dtype=object)).tolist()
+    unique_ids = np.array([texts.setdefault(text, len(texts)) if text else -1 for text in normalized], dtype=np.int64)
+    ids = np.where(codes >= 0, unique_ids[codes], -1)
+    
+    cents = df['Amount_Cents'].to_numpy(dtype=np.int64)
+    usable = (ids >= 0) & (cents != 0)
+    ids, cents = ids[usable], cents[usable]
+    days = df['Date'].to_numpy().astype('datetime64[D]').astype(np.int64)[usable]
+    
+    # Rows are in date order, so the last row of each id carries its latest label
+    positions = np.flatnonzero(usable)
+    last = pd.Series(positions).groupby(ids, sort=False).last()
+    names = df['Description'].to_numpy()[last.to_numpy()]
+    categories = df['Category'].to_numpy()[last.to_numpy()] if 'Category' in df.columns else [''] * len(last)
+    labels.update(zip(last.index.tolist(), zip(map(str, names), map(str, categories))))
+    
+    bands = np.floor(np.log(np.abs(cents)) / np.log1p(AMOUNT_BAND_WIDTH)).astype(np.int64)
+    keys = (ids * _BAND_SLOTS + np.clip(bands, 0, _BAND_SLOTS - 1)) * 2 + (cents > 0)
+    return keys, days, cents
+
+def _group_stats(group, day, cents):
+    """Interval statistics of every group with two or more rows.
+    
+    The arrays are sorted by (group, day). Same-day repeats count as one
+    occurrence. Each group is matched to the RECURRING_FREQUENCIES period
+    whose tolerance holds its median interval, and Regularity is the share
+    of its intervals within that tolerance.
+    """
+    if not len(group):
+        return pd.DataFrame(columns=['First_Day', 'Last_Day', 'Rows', 'Occurrences', 'Sum_Cents', 'Min_Cents',
+                                     'Max_Cents', 'Median_Interval', 'Frequency', 'Regularity'], dtype=float)
+    starts = np.flatnonzero(np.append(True, group[1:] != group[:-1]))
+    ends = np.append(starts[1:], len(group))
+    rows = ends - starts
+    owner = np.repeat(np.arange(len(starts)), rows)
+    
+    gaps = np.diff(day)
+    is_interval = (group[1:] == group[:-1]) & (gaps > 0)
+    interval_owner, intervals = owner[1:][is_interval], gaps[is_interval]
+    counts = np.bincount(interval_owner, minlength=len(starts))
+    
+    # Median interval: sort intervals within each group and take the middle ones
+    ordered = intervals[np.lexsort((intervals, interval_owner))]
+    first = np.cumsum(counts) - counts
+    has_intervals = counts > 0
+    median = np.full(len(starts), np.nan)
+    low = (first + (counts - 1) // 2)[has_intervals]
+    high = (first + counts // 2)[has_intervals]
+    median[has_intervals] = (ordered[low] + ordered[high]) / 2
+    
+    periods, tolerances, _ = (np.array(values) for values in zip(*RECURRING_FREQUENCIES.values()))
+    matches = np.abs(median[:, None] - periods) <= tolerances
+    frequency = np.where(matches.any(axis=1), matches.argmax(axis=1), -1)
+    period = periods[frequency][interval_owner]
+    within = np.abs(intervals - period) <= tolerances[frequency][interval_owner]
+    within &= frequency[interval_owner] >= 0
+    regularity = np.bincount(interval_owner, within, minlength=len(starts)) / np.maximum(counts, 1)
+    
+    stats = pd.DataFrame({
+        'First_Day': day[starts],
+        'Last_Day': day[ends - 1],
+        'Rows': rows,
+        'Occurrences': counts + 1,
+        'Sum_Cents': np.add.reduceat(cents, starts),
+        'Min_Cents': np.minimum.reduceat(cents, starts),
+        'Max_Cents': np.maximum.reduceat(cents, starts),
+        'Median_Interval': median,
+        'Frequency': frequency,
+        'Regularity': regularity
+    }, index=pd.Index(group[starts], name='Group'))
+    return stats[stats['Rows'] > 1]
+
+def build_recurring_index(df):
+    """Sorted (group, day, cents) arrays of df plus the interval statistics of each group"""
+    texts, labels = {}, {}
+    keys, days, cents = _row_keys(df, texts, labels)
+    order = np.lexsort((days, keys))
+    group, day, cents = keys[order], days[order], cents[order]
+    return {
+        'texts': texts,
+        'labels': labels,
+        'group': group,
+        'day': day,
+        'cents': cents,
+        'last_day': int(day.max()) if len(day) else None,
+        'stats': _group_stats(group, day, cents)
+    }
+
+def update_recurring_index(index, new):
+    """A recurring index with the rows of new added, leaving index unchanged.
+    
+    Only the groups new touches are re-sorted and re-measured; their rows
+    are spliced back into the other groups' sorted arrays by searchsorted,
+    so an update costs O(n) copying plus O(m log m) for m touched rows.
+    """
+    texts, labels = dict(index['texts']), dict(index['labels'])
+    keys, days, cents = _row_keys(new, texts, labels)
+    if not len(keys):
+        return dict(index, texts=texts, labels=labels)
+    
+    group = index['group']
+    touched = np.unique(keys)
+    # Mark each touched group's contiguous run of rows with a +1/-1 difference array
+    marks = np.zeros(len(group) + 1, dtype=np.int64)
+    np.add.at(marks, np.searchsorted(group, touched, side='left'), 1)
+    np.add.at(marks, np.searchsorted(group, touched, side='right'), -1)
+    moved = np.cumsum(marks[:-1]) > 0
+    
+    sub_group = np.concatenate([group[moved], keys])
+    sub_day = np.concatenate([index['day'][moved], days])
+    sub_cents = np.concatenate([index['cents'][moved], cents])
+    order = np.lexsort((sub_day, sub_group))
+    sub_group, sub_day, sub_cents = sub_group[order], sub_day[order], sub_cents[order]
+    
+    kept = ~moved
+    kept_group = group[kept]
+    positions = np.searchsorted(kept_group, sub_group)
+    stats = index['stats']
+    stats = pd.concat([stats[~stats.index.isin(touched)], _group_stats(sub_group, sub_day, sub_cents)]).sort_index()
+    last_day = int(days.max()) if index['last_day'] is None else max(index['last_day'], int(days.max()))
+    return {
+        'texts': texts,
+        'labels': labels,
+        'group': np.insert(kept_group, positions, sub_group),
+        'day': np.insert(index['day'][kept], positions, sub_day),
+        'cents': np.insert(index['cents'][kept], positions, sub_cents),
+        'last_day': last_day,
+        'stats': stats
+    }
+
+def recurring_index(dataset):
+    """The dataset's recurring index, built on first use and kept with the dataset"""
+    return dataset_index(dataset, 'recurring_index', lambda dataset: build_recurring_index(dataset['df']))
+
+def recurring_transactions(dataset, min_regularity=RECURRING_MIN_REGULARITY):
+    """Recurring charges and income detected in a processed dataset.
+    
+    One row per recurring group with its RECURRING_COLUMNS: the latest
+    description and category, the matched frequency, median interval,
+    mean amount and its annualized total, first, last and expected next
+    dates, and whether it is still active (last seen within one and a half
+    periods of the newest transaction) and a fixed-price subscription.
+    Sorted by annualized amount, largest first.
+    """
+    index = recurring_index(dataset)
+    stats = index['stats']
+    names = list(RECURRING_FREQUENCIES)
+    periods, _, minimums = (np.array(values) for values in zip(*RECURRING_FREQUENCIES.values()))
+    frequency = stats['Frequency'].to_numpy(dtype=np.int64)
+    detected = (frequency >= 0) & (stats['Regularity'].to_numpy() >= min_regularity)
+    detected &= stats['Occurrences'].to_numpy() >= np.where(frequency >= 0, minimums[frequency], np.inf)
+    found = stats[detected]
+    if found.empty:
+        return pd.DataFrame(columns=RECURRING_COLUMNS)
+    
+    frequency = found['Frequency'].to_numpy(dtype=np.int64)
+    ids = found.index.to_numpy() // (2 * _BAND_SLOTS)
+    labels = [index['labels'][i] for i in ids.tolist()]
+    mean = found['Sum_Cents'].to_numpy() / found['Rows'].to_numpy() / 100
+    interval = found['Median_Interval'].to_numpy()
+    last_day = found['Last_Day'].to_numpy(dtype=np.int64)
+    spread = (found['Max_Cents'] - found['Min_Cents']).to_numpy() / np.abs(found['Sum_Cents'] / found['Rows']).to_numpy()
+    expense = found.index.to_numpy() % 2 == 0
+    
+    def dates(days):
+        return np.asarray(days, dtype=np.int64).astype('datetime64[D]').astype('datetime64[ns]')
+    
+    table = pd.DataFrame({
+        'Description': [name for name, _ in labels],
+        'Category': [category for _, category in labels],
+        'Type': np.where(expense, 'Expense', 'Income'),
+        'Frequency': np.array(names)[frequency],
+        'Interval_Days': interval,
+        'Occurrences': found['Occurrences'].to_numpy(),
+        'Amount': mean,
+        'Annual_Amount': mean * 365.25 / periods[frequency],
+        'First_Date': dates(found['First_Day']),
+        'Last_Date': dates(last_day),
+        'Next_Date': dates(last_day + np.rint(interval).astype(np.int64)),
+        'Regularity': found['Regularity'].to_numpy(),
+        'Active': index['last_day'] - last_day <= 1.5 * periods[frequency],
+        'Subscription': expense & (spread <= SUBSCRIPTION_AMOUNT_SPREAD)
+    })
+    order = np.argsort(-np.abs(table['Annual_Amount'].to_numpy()), kind='stable')
+    return table.iloc[order].reset_index(drop=True)
@@ -0,0 +1,59 @@
+"""Plain-text and JSON summary reports and category breakdowns."""
+import json
+from datetime import datetime
+
+from .rollup import rollup_category_totals, rollup_monthly
+
+def savings_rate(metrics):
+    """Net income as a percentage of total income"""
+    return (metrics['net_income'] / metrics['total_income'] * 100) if metrics['total_income'] > 0 else 0
+
+def expense_breakdown(rollup, start_date=None, end_date=None):
+    """Total spent per expense category (positive amounts), largest first"""
+    totals = rollup_category_totals(rollup, 'Expense', start_date, end_date).abs()
+    return totals.sort_values(ascending=False)
+
+def summary_report(metrics, expense_by_category, generated_at=None):
+    """Text summary report of key metrics and the top five expense categories"""
+    generated_at = generated_at or datetime.now()
+    report = f"""
+Personal Finance Summary Report
+Generated on: {generated_at.strftime('%Y-%m-%d %H:%M:%S')}
+
+=== KEY METRICS ===
+Total Income: ${metrics['total_income']:,.2f}
+Total Expenses: ${metrics['total_expenses']:,.2f}
+Net Income: ${metrics['net_income']:,.2f}
+Savings Rate: {savings_rate(metrics):.1f}%
+
+=== TOP EXPENSE CATEGORIES ===
+"""
+    if not expense_by_category.empty:
+        for cat, amount in expense_by_category.sort_values(ascending=False).head().items():
+            report += f"{cat}: ${amount:,.2f}\n"
+    return report
+
+def summary_json(metrics, rollup, start_date=None, end_date=None, generated_at=None):
+    """Structured JSON report: metrics, savings rate, expenses by category and monthly totals.
+    
+    Everything comes from already computed metrics and the rollup, so the
+    report costs nothing proportional to the number of transactions.
+    """
+    generated_at = generated_at or datetime.now()
+    monthly = rollup_monthly(rollup, start_date, end_date)
+    report = {
+        'generated_at': generated_at.isoformat(timespec='seconds'),
+        'start_date': start_date.isoformat() if start_date else None,
+        'end_date': end_date.isoformat() if end_date else None,
+        'metrics': {name: round(float(value), 2) for name, value in metrics.items()},
+        'savings_rate': round(float(savings_rate(metrics)), 2),
+        'expenses_by_category': {
+            str(category): round(float(amount), 2)
+            for category, amount in expense_breakdown(rollup, start_date, end_date).items()
+        },
+        'monthly': [
+            {'month': str(month), **{str(name): round(float(value), 2) for name, value in row.items()}}
+            for month, row in monthly.iterrows()
+        ]
+    }
+    return json.dumps(report, indent=2)
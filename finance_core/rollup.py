@@ -0,0 +1,248 @@
+"""Day x category x type rollup answering date-range queries."""
+import numpy as np
+import pandas as pd
+
+from .transactions import DAYS_ORDER, calculate_metrics
+
+def daily_aggregates(df):
+    """Collapse transactions to one row per (day, Category, Type).
+    
+    Besides the signed total, each row keeps the positive and negative parts
+    of the amount (in cents) and a transaction count, which is everything the
+    dashboard's metrics and charts need.
+    """
+    amounts = df['Amount_Cents']
+    daily = pd.DataFrame({
+        'Day': df['Date'].dt.normalize(),
+        'Category': df['Category'],
+        'Type': df['Type'],
+        'Amount_Cents': amounts,
+        'Positive': amounts.clip(lower=0),
+        'Negative': amounts.clip(upper=0),
+        'Count': np.ones(len(df), dtype=np.int64)
+    })
+    return daily.groupby(['Day', 'Category', 'Type'], observed=True, sort=True).sum().reset_index()
+
+def build_rollup(daily):
+    """Build day x category x type prefix sums from daily aggregates.
+    
+    Any date range can then be answered by differencing two prefix rows, so
+    queries cost time proportional to the number of days in the dataset
+    rather than the number of transactions. Sums are kept in integer cents
+    and converted back to currency units by the query functions.
+    """
+    if daily.empty:
+        days = pd.DatetimeIndex([])
+    else:
+        days = pd.date_range(daily['Day'].min(), daily['Day'].max(), freq='D')
+    categories = np.sort(daily['Category'].unique().astype(object))
+    types = np.sort(daily['Type'].unique().astype(object))
+    
+    day_idx = ((daily['Day'] - days[0]).dt.days.to_numpy() if len(days) else np.array([], dtype=np.int64))
+    cat_idx = np.searchsorted(categories, daily['Category'].to_numpy(dtype=object))
+    type_idx = np.searchsorted(types, daily['Type'].to_numpy(dtype=object))
+    
+    shape = (len(days), len(categories), len(types))
+    amount = np.zeros(shape, dtype=np.int64)
+    count = np.zeros(shape, dtype=np.int64)
+    amount[day_idx, cat_idx, type_idx] = daily['Amount_Cents'].to_numpy()
+    count[day_idx, cat_idx, type_idx] = daily['Count'].to_numpy()
+    
+    def prefix(values):
+        return np.concatenate([np.zeros((1,) + values.shape[1:], dtype=values.dtype), values.cumsum(axis=0)])
+    
+    return {
+        'days': days,
+        'categories': categories,
+        'types': types,
+        'month_keys': (days.year * 12 + days.month - 1).to_numpy(),
+        'week_keys': (days - pd.to_timedelta(days.dayofweek, unit='D')).to_numpy(),
+        'day_of_week': days.dayofweek.to_numpy(),
+        'amount': prefix(amount),
+        'count': prefix(count),
+        'positive': prefix(np.bincount(day_idx, daily['Positive'].to_numpy(), minlength=len(days)).astype(np.int64)),
+        'negative': prefix(np.bincount(day_idx, daily['Negative'].to_numpy(), minlength=len(days)).astype(np.int64)),
+        'daily_count': prefix(np.bincount(day_idx, daily['Count'].to_numpy(), minlength=len(days)).astype(np.int64))
+    }
+
+def update_rollup(rollup, daily):
+    """Fold the daily aggregates of newly added transactions into a rollup.
+    
+    Returns a new rollup equal to rebuilding from all daily aggregates; the
+    input is left unchanged. Prefix rows before the earliest new day are
+    copied as they are, and only the rows from that day on have the new
+    amounts added, so appending recent transactions touches a few days of
+    the cube. The day range and the category and type axes are widened
+    when the new rows fall outside them.
+    """
+    if daily.empty:
+        return rollup
+    if len(rollup['days']) == 0:
+        return build_rollup(daily)
+    old_days = rollup['days']
+    first, last = min(old_days[0], daily['Day'].min()), max(old_days[-1], daily['Day'].max())
+    days = old_days if (first, last) == (old_days[0], old_days[-1]) else pd.date_range(first, last, freq='D')
+    categories = np.union1d(rollup['categories'], daily['Category'].unique().astype(object))
+    types = np.union1d(rollup['types'], daily['Type'].unique().astype(object))
+    
+    # Where the old prefix rows, categories and types sit on the widened axes
+    lead, trail = (old_days[0] - first).days, (last - old_days[-1]).days
+    cat_pos = np.searchsorted(categories, rollup['categories'])
+    type_pos = np.searchsorted(types, rollup['types'])
+    
+    day_idx = (daily['Day'] - first).dt.days.to_numpy()
+    cat_idx = np.searchsorted(categories, daily['Category'].to_numpy(dtype=object))
+    type_idx = np.searchsorted(types, daily['Type'].to_numpy(dtype=object))
+    start = int(day_idx.min())
+    
+    def widen(prefix):
+        # Days added before the range have nothing before them, days after carry the last total
+        padded = np.concatenate([
+            np.zeros((lead,) + prefix.shape[1:], dtype=prefix.dtype),
+            prefix,
+            np.repeat(prefix[-1:], trail, axis=0)
+        ])
+        if prefix.ndim == 1 or (len(categories), len(types)) == prefix.shape[1:]:
+            return padded
+        widened = np.zeros((len(padded), len(categories), len(types)), dtype=prefix.dtype)
+        widened[:, cat_pos[:, None], type_pos[None, :]] = padded
+        return widened
+    
+    def add(prefix, values, cube=True):
+        prefix = widen(prefix)
+        added = np.zeros((len(days) - start,) + prefix.shape[1:], dtype=prefix.dtype)
+        if cube:
+            added[day_idx - start, cat_idx, type_idx] = values
+        else:
+            added += np.bincount(day_idx - start, values, minlength=len(added)).astype(prefix.dtype)
+        prefix[start + 1:] += added.cumsum(axis=0)
+        return prefix
+    
+    return {
+        'days': days,
+        'categories': categories,
+        'types': types,
+        'month_keys': rollup['month_keys'] if days is old_days else (days.year * 12 + days.month - 1).to_numpy(),
+        'week_keys': rollup['week_keys'] if days is old_days else (days - pd.to_timedelta(days.dayofweek, unit='D')).to_numpy(),
+        'day_of_week': rollup['day_of_week'] if days is old_days else days.dayofweek.to_numpy(),
+        'amount': add(rollup['amount'], daily['Amount_Cents'].to_numpy()),
+        'count': add(rollup['count'], daily['Count'].to_numpy()),
+        'positive': add(rollup['positive'], daily['Positive'].to_numpy(), cube=False),
+        'negative': add(rollup['negative'], daily['Negative'].to_numpy(), cube=False),
+        'daily_count': add(rollup['daily_count'], daily['Count'].to_numpy(), cube=False)
+    }
+
+def _day_bounds(rollup, start_date=None, end_date=None):
+    """Half-open day index range [i, j) covering start_date..end_date inclusive"""
+    days = rollup['days']
+    if len(days) == 0:
+        return 0, 0
+    first = days[0].date()
+    i = 0 if start_date is None else (start_date - first).days
+    j = len(days) if end_date is None else (end_date - first).days + 1
+    return min(max(i, 0), len(days)), min(max(j, 0), len(days))
+
+def _type_index(rollup, transaction_type):
+    matches = np.flatnonzero(rollup['types'] == transaction_type)
+    return matches[0] if len(matches) else None
+
+def _bucket_totals(rollup, i, j, keys):
+    """Sum the cube over consecutive runs of equal keys within days [i, j)"""
+    if j <= i:
+        return keys[:0], rollup['amount'][:0], rollup['count'][:0]
+    window = keys[i:j]
+    starts = np.concatenate([[0], np.flatnonzero(window[1:] != window[:-1]) + 1]) + i
+    edges = np.append(starts, j)
+    amount = np.diff(rollup['amount'][edges], axis=0)
+    count = np.diff(rollup['count'][edges], axis=0)
+    return keys[starts], amount, count
+
+def rollup_metrics(rollup, start_date=None, end_date=None):
+    """calculate_metrics answered from the rollup for a date range"""
+    i, j = _day_bounds(rollup, start_date, end_date)
+    if j <= i or rollup['daily_count'][j] == rollup['daily_count'][i]:
+        return calculate_metrics(None)
+    
+    total_income = (rollup['positive'][j] - rollup['positive'][i]) / 100
+    total_expenses = abs(rollup['negative'][j] - rollup['negative'][i]) / 100
+    net_income = total_income - total_expenses
+    
+    daily_count = np.diff(rollup['daily_count'][i:j + 1])
+    months = len(np.unique(rollup['month_keys'][i:j][daily_count > 0])) or 1
+    
+    return {
+        'total_income': total_income,
+        'total_expenses': total_expenses,
+        'net_income': net_income,
+        'monthly_avg_income': total_income / months,
+        'monthly_avg_expenses': total_expenses / months
+    }
+
+def rollup_monthly(rollup, start_date=None, end_date=None):
+    """Monthly totals by Type, one row per month that has transactions"""
+    i, j = _day_bounds(rollup, start_date, end_date)
+    keys, amount, count = _bucket_totals(rollup, i, j, rollup['month_keys'])
+    by_type = amount.sum(axis=1)
+    type_count = count.sum(axis=1)
+    has_data = type_count.sum(axis=1) > 0
+    present = type_count.sum(axis=0) > 0
+    
+    index = pd.PeriodIndex([pd.Period(year=key // 12, month=key % 12 + 1, freq='M') for key in keys[has_data]])
+    return pd.DataFrame(
+        by_type[has_data][:, present] / 100,
+        index=index,
+        columns=pd.Index(rollup['types'][present], name='Type')
+    )
+
+def rollup_category_totals(rollup, transaction_type, start_date=None, end_date=None):
+    """Total Amount per Category for one Type over a date range"""
+    i, j = _day_bounds(rollup, start_date, end_date)
+    t = _type_index(rollup, transaction_type)
+    if t is None or j <= i:
+        return pd.Series(dtype=float)
+    amount = rollup['amount'][j, :, t] - rollup['amount'][i, :, t]
+    count = rollup['count'][j, :, t] - rollup['count'][i, :, t]
+    present = count > 0
+    return pd.Series(amount[present] / 100, index=pd.Index(rollup['categories'][present], name='Category'))
+
+def rollup_weekly(rollup, transaction_type, start_date=None, end_date=None):
+    """Weekly (Monday-Sunday) totals for one Type, labelled like Period('W')"""
+    i, j = _day_bounds(rollup, start_date, end_date)
+    t = _type_index(rollup, transaction_type)
+    if t is None:
+        return pd.Series(dtype=float)
+    keys, amount, count = _bucket_totals(rollup, i, j, rollup['week_keys'])
+    totals = amount[:, :, t].sum(axis=1)
+    present = count[:, :, t].sum(axis=1) > 0
+    return pd.Series(totals[present] / 100, index=pd.PeriodIndex(keys[present], freq='W'))
+
+def rollup_daily(rollup, transaction_type, start_date=None, end_date=None):
+    """Daily totals for one Type, with zero for days without transactions"""
+    i, j = _day_bounds(rollup, start_date, end_date)
+    t = _type_index(rollup, transaction_type)
+    if t is None or j <= i:
+        return pd.Series(dtype=float)
+    totals = np.diff(rollup['amount'][i:j + 1, :, t].sum(axis=1))
+    return pd.Series(totals / 100, index=rollup['days'][i:j])
+
+def rollup_day_of_week_mean(rollup, transaction_type, start_date=None, end_date=None):
+    """Mean transaction Amount for one Type per weekday, in DAYS_ORDER"""
+    i, j = _day_bounds(rollup, start_date, end_date)
+    t = _type_index(rollup, transaction_type)
+    if t is None or j <= i:
+        return pd.Series(0.0, index=DAYS_ORDER)
+    amount = np.diff(rollup['amount'][i:j + 1, :, t].sum(axis=1))
+    count = np.diff(rollup['count'][i:j + 1, :, t].sum(axis=1))
+    day_of_week = rollup['day_of_week'][i:j]
+    sums = np.bincount(day_of_week, amount, minlength=7)
+    counts = np.bincount(day_of_week, count, minlength=7)
+    means = np.divide(sums / 100, counts, out=np.zeros(7), where=counts > 0)
+    return pd.Series(means, index=DAYS_ORDER)
+
+def merge_daily_aggregates(*frames):
+    """Combine daily_aggregates outputs, summing rows for the same key"""
+    frames = [frame for frame in frames if frame is not None]
+    if len(frames) == 1:
+        return frames[0]
+    merged = pd.concat(frames, ignore_index=True)
+    return merged.groupby(['Day', 'Category', 'Type'], observed=True, sort=True).sum().reset_index()
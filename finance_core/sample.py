@@ -0,0 +1,147 @@
+"""Sample transaction data for demos."""
+import numpy as np
+import pandas as pd
+
+# Transaction categories and typical amounts
+EXPENSE_CATEGORIES = {
+    'Groceries': (-50, -200),
+    'Utilities': (-80, -150),
+    'Transportation': (-30, -100),
+    'Entertainment': (-20, -80),
+    'Restaurants': (-25, -75),
+    'Shopping': (-40, -200),
+    'Healthcare': (-50, -300),
+    'Insurance': (-100, -400)
+}
+
+INCOME_CATEGORIES = {
+    'Salary': (2000, 5000),
+    'Freelance': (200, 1000),
+    'Investment': (50, 500)
+}
+
+def create_sample_data():
+    """Create sample transaction data for demonstration"""
+    np.random.seed(42)
+    dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='D')
+    expense_categories = EXPENSE_CATEGORIES
+    income_categories = INCOME_CATEGORIES
+    
+    transactions = []
+    
+    # Generate transactions
+    for date in dates:
+        # Random number of transactions per day (0-5)
+        num_transactions = np.random.poisson(1.5)
+        
+        for _ in range(num_transactions):
+            # 80% chance of expense, 20% chance of income
+            if np.random.random() < 0.8:
+                category = np.random.choice(list(expense_categories.keys()))
+                amount_range = expense_categories[category]
+                amount = np.random.uniform(amount_range[0], amount_range[1])
+                transaction_type = 'Expense'
+            else:
+                category = np.random.choice(list(income_categories.keys()))
+                amount_range = income_categories[category]
+                amount = np.random.uniform(amount_range[0], amount_range[1])
+                transaction_type = 'Income'
+            
+            transactions.append({
+                'Date': date,
+                'Description': f"{category} transaction",
+                'Category': category,
+                'Amount': round(amount, 2),
+                'Type': transaction_type
+            })
+    
+    return pd.DataFrame(transactions).sort_values('Date')
+
+def iter_transaction_chunks(years=1, accounts=1, daily_rate=1.5, expense_share=0.8,
+                            category_mix=None, start='2024-01-01', seed=42, chunk_rows=1_000_000):
+    """Stream synthetic transactions in chunks of roughly chunk_rows rows.
+    
+    Every account gets a Poisson(daily_rate) number of transactions per
+    day; each is an expense with probability expense_share, with a category
+    drawn from category_mix (category name -> weight, uniform within
+    Expense/Income by default) and a uniform amount in the category's range
+    from EXPENSE_CATEGORIES / INCOME_CATEGORIES. A category_mix weighting
+    only expense (or only income) categories makes every transaction an
+    expense (or income), whatever expense_share is. Chunks cover whole days
+    and are generated entirely with array operations from one seeded
+    numpy.random.Generator, so the same arguments always give the same data.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start=start, periods=int(round(years * 365.25)), freq='D')
+    
+    names = list(EXPENSE_CATEGORIES) + list(INCOME_CATEGORIES)
+    ranges = np.array(list(EXPENSE_CATEGORIES.values()) + list(INCOME_CATEGORIES.values()), dtype=float)
+    n_expense = len(EXPENSE_CATEGORIES)
+    mix = category_mix or {}
+    unknown = sorted(set(mix) - set(names))
+    if unknown:
+        raise ValueError(f"Unknown categories in category_mix: {', '.join(unknown)}")
+    weights = np.array([mix.get(name, 0.0 if mix else 1.0) for name in names], dtype=float)
+    if (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("category_mix weights must be non-negative with at least one positive")
+    expense_total, income_total = weights[:n_expense].sum(), weights[n_expense:].sum()
+    # A side with no weight gets no transactions, so its categories are never drawn
+    if income_total == 0:
+        expense_share = 1.0
+    elif expense_total == 0:
+        expense_share = 0.0
+    expense_p = weights[:n_expense] / expense_total if expense_total else None
+    income_p = weights[n_expense:] / income_total if income_total else None
+    
+    descriptions = pd.CategoricalDtype([f"{name} transaction" for name in names])
+    categories = pd.CategoricalDtype(names)
+    types = pd.CategoricalDtype(['Expense', 'Income'])
+    account_names = pd.CategoricalDtype([f"Account {i + 1}" for i in range(accounts)])
+    
+    block_days = max(1, int(chunk_rows // max(daily_rate * accounts, 1e-9)))
+    for block_start in range(0, len(dates), block_days):
+        block_dates = dates[block_start:block_start + block_days]
+        counts = rng.poisson(daily_rate, size=(len(block_dates), accounts)).ravel()
+        n = int(counts.sum())
+        if n == 0:
+            continue
+        cell = np.repeat(np.arange(counts.size), counts)
+        day_idx, account_idx = np.divmod(cell, accounts)
+        
+        is_income = rng.random(n) >= expense_share
+        category = np.where(
+            is_income,
+            n_expense + (0 if income_p is None else rng.choice(len(income_p), size=n, p=income_p)),
+            0 if expense_p is None else rng.choice(n_expense, size=n, p=expense_p)
+        )
+        low, high = ranges[category, 0], ranges[category, 1]
+        amount = np.round(low + (high - low) * rng.random(n), 2)
+        
+        chunk = pd.DataFrame({
+            'Date': block_dates[day_idx],
+            'Description': pd.Categorical.from_codes(category, dtype=descriptions),
+            'Category': pd.Categorical.from_codes(category, dtype=categories),
+            'Amount': amount,
+            'Type': pd.Categorical.from_codes(is_income.astype(np.int8), dtype=types)
+        })
+        if accounts > 1:
+            chunk['Account'] = pd.Categorical.from_codes(account_idx, dtype=account_names)
+        yield chunk
+
+def generate_transactions(**kwargs):
+    """Synthetic transactions as one DataFrame; see iter_transaction_chunks for options"""
+    chunks = list(iter_transaction_chunks(**kwargs))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+# Sample datasets offered by the dashboard; None means the classic demo data
+SAMPLE_PRESETS = {
+    'Demo (1 year)': None,
+    'Household (5 years, 3 accounts)': {'years': 5, 'accounts': 3},
+    'Load test (10 years, 200 accounts, ~1M rows)': {'years': 10, 'accounts': 200},
+    'Load test (10 years, 2,000 accounts, ~11M rows)': {'years': 10, 'accounts': 2000}
+}
+
+def load_sample_preset(name):
+    """Raw transactions for a SAMPLE_PRESETS entry"""
+    options = SAMPLE_PRESETS[name]
+    return create_sample_data() if options is None else generate_transactions(**options)
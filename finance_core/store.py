@@ -0,0 +1,240 @@
+"""On-disk dataset store: month-partitioned Parquet files."""
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from .ingest import hash_index
+from .networth import NetWorthSeries
+from .rollup import build_rollup
+from .transactions import date_slice
+
+# Root directory of the on-disk dataset store
+DATA_STORE_DIR = os.environ.get('FINANCE_DATA_DIR', 'finance_data')
+
+_DATASET_NAME = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+
+# Text columns stored dictionary-encoded with one index width, so every partition has the same schema
+_DICTIONARY_COLUMNS = ('Category', 'Type', 'Description', 'Account')
+
+def _require_parquet():
+    if pq is None:
+        raise ImportError("pyarrow is required for the dataset store")
+
+def _dataset_dir(name, root):
+    if not _DATASET_NAME.match(name or ''):
+        raise ValueError("Dataset names may only use letters, digits, '.', '_' and '-'")
+    return os.path.join(root, name)
+
+def _month_dir_name(month_key):
+    return f"month={month_key // 12:04d}-{month_key % 12 + 1:02d}"
+
+def list_saved_datasets(root=DATA_STORE_DIR):
+    """Names of datasets in the store, alphabetically"""
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        name for name in os.listdir(root)
+        if os.path.isfile(os.path.join(root, name, 'metadata.json'))
+    )
+
+def saved_dataset_version(name, root=DATA_STORE_DIR):
+    """Modification stamp of a stored dataset, changing whenever it is rewritten"""
+    return os.path.getmtime(os.path.join(_dataset_dir(name, root), 'metadata.json'))
+
+def save_dataset(dataset, name, net_worth=None, root=DATA_STORE_DIR):
+    """Persist a processed dataset as month-partitioned Parquet files.
+    
+    Layout under root/name: transactions/month=YYYY-MM/part-0.parquet per
+    month, daily.parquet with the daily aggregates the rollup is built
+    from, hashes.parquet with the row fingerprints used to de-duplicate
+    appends, net_worth.parquet and metadata.json. The dataset is written to a
+    temporary directory and swapped in, so readers never see a partial save.
+    """
+    _require_parquet()
+    target = _dataset_dir(name, root)
+    os.makedirs(root, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f'.{name}-', dir=root)
+    try:
+        _write_month_partitions(dataset['df'], os.path.join(staging, 'transactions'))
+        _write_net_worth(net_worth or [], os.path.join(staging, 'net_worth.parquet'))
+        _write_dataset_summary(dataset, staging)
+        
+        if os.path.exists(target):
+            retired = target + '.old'
+            shutil.rmtree(retired, ignore_errors=True)
+            os.rename(target, retired)
+            os.rename(staging, target)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.rename(staging, target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return target
+
+def update_saved_dataset(dataset, name, month_keys, root=DATA_STORE_DIR):
+    """Rewrite only the given months' partitions of a stored dataset.
+    
+    Used after append_transactions: the touched month partitions, the daily
+    aggregates, the row fingerprints and the metadata are replaced, and
+    every other partition is left as it is.
+    """
+    _require_parquet()
+    directory = _dataset_dir(name, root)
+    _write_month_partitions(dataset['df'], os.path.join(directory, 'transactions'), month_keys)
+    _write_dataset_summary(dataset, directory)
+    return directory
+
+def _write_table(frame, path):
+    """Write a frame (or Arrow table) to Parquet via a temporary file, replacing path"""
+    if isinstance(frame, pd.DataFrame):
+        frame = pa.Table.from_pandas(frame, preserve_index=False)
+    pq.write_table(frame, path + '.tmp')
+    os.replace(path + '.tmp', path)
+
+def _dictionary_type():
+    return pa.dictionary(pa.int32(), pa.string())
+
+def _partition_table(frame):
+    """Arrow table of a month's rows with its text columns in the shared dictionary encoding.
+    
+    Whether pandas hands a column over as a categorical, and how wide its
+    codes are, depends on the rows; without the cast, partitions rewritten
+    after an append could disagree with the ones left on disk.
+    """
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    for name in _DICTIONARY_COLUMNS:
+        i = table.schema.get_field_index(name)
+        if i >= 0 and table.schema.field(i).type != _dictionary_type():
+            table = table.set_column(i, name, table.column(i).cast(pa.string()).cast(_dictionary_type()))
+    return table
+
+def _concat_partitions(tables):
+    """Concatenate partition tables whose columns may differ.
+    
+    Text columns are cast to the shared dictionary encoding (partitions
+    written before it was used can store plain strings) and columns some
+    partitions lack, such as Account before accounts were tagged, are
+    filled with nulls.
+    """
+    fields = {}
+    for table in tables:
+        for field in table.schema:
+            if field.name in _DICTIONARY_COLUMNS:
+                field = field.with_type(_dictionary_type())
+            fields.setdefault(field.name, field)
+    schema = pa.schema(list(fields.values()))
+    unified = []
+    for table in tables:
+        columns = []
+        for field in schema:
+            if field.name in table.column_names:
+                column = table.column(field.name)
+                if column.type != field.type:
+                    column = column.cast(pa.string()).cast(field.type) if field.name in _DICTIONARY_COLUMNS else column.cast(field.type)
+                columns.append(column)
+            else:
+                columns.append(pa.nulls(len(table), field.type))
+        unified.append(pa.Table.from_arrays(columns, schema=schema))
+    return pa.concat_tables(unified)
+
+def _write_dataset_summary(dataset, directory):
+    """Write the daily aggregates, row fingerprints and metadata of a dataset"""
+    _write_table(dataset['daily'], os.path.join(directory, 'daily.parquet'))
+    _write_table(pd.DataFrame({'Txn_Hash': hash_index(dataset)}), os.path.join(directory, 'hashes.parquet'))
+    with open(os.path.join(directory, 'metadata.json.tmp'), 'w') as handle:
+        json.dump({
+            'rows': int(dataset['rows']),
+            'truncated': bool(dataset['truncated']),
+            'saved_at': datetime.now().isoformat(timespec='seconds')
+        }, handle)
+    os.replace(os.path.join(directory, 'metadata.json.tmp'), os.path.join(directory, 'metadata.json'))
+
+def _write_month_partitions(df, directory, month_keys=None):
+    """Write one Parquet file per Month_Key of a date-sorted frame"""
+    os.makedirs(directory, exist_ok=True)
+    keys = df['Month_Key'].to_numpy()
+    starts = np.concatenate([[0], np.flatnonzero(keys[1:] != keys[:-1]) + 1]) if len(keys) else []
+    for i, j in zip(starts, list(starts[1:]) + [len(keys)]):
+        month_key = int(keys[i])
+        if month_keys is not None and month_key not in month_keys:
+            continue
+        partition = os.path.join(directory, _month_dir_name(month_key))
+        os.makedirs(partition, exist_ok=True)
+        _write_table(_partition_table(df.iloc[i:j]), os.path.join(partition, 'part-0.parquet'))
+
+def _month_partitions(directory, start_date=None, end_date=None):
+    """Partition file paths whose month overlaps start_date..end_date"""
+    if not os.path.isdir(directory):
+        return []
+    first = None if start_date is None else start_date.year * 12 + start_date.month - 1
+    last = None if end_date is None else end_date.year * 12 + end_date.month - 1
+    paths = []
+    for entry in sorted(os.listdir(directory)):
+        if not entry.startswith('month='):
+            continue
+        year, month = entry[len('month='):].split('-')
+        month_key = int(year) * 12 + int(month) - 1
+        if (first is None or month_key >= first) and (last is None or month_key <= last):
+            paths.append(os.path.join(directory, entry, 'part-0.parquet'))
+    return paths
+
+def load_saved_dataset(name, root=DATA_STORE_DIR, start_date=None, end_date=None):
+    """Open a stored dataset, reading only partitions inside the date range.
+    
+    The rollup is rebuilt from the stored daily aggregates rather than from
+    the transactions, so it always covers the full history.
+    """
+    _require_parquet()
+    directory = _dataset_dir(name, root)
+    with open(os.path.join(directory, 'metadata.json')) as handle:
+        metadata = json.load(handle)
+    
+    paths = _month_partitions(os.path.join(directory, 'transactions'), start_date, end_date)
+    tables = [pq.read_table(path, memory_map=True) for path in paths]
+    df = _concat_partitions(tables).to_pandas() if tables else pd.DataFrame()
+    if start_date is not None or end_date is not None:
+        df = date_slice(df, start_date or df['Date'].iloc[0], end_date or df['Date'].iloc[-1]).reset_index(drop=True)
+    
+    daily = pq.read_table(os.path.join(directory, 'daily.parquet'), memory_map=True).to_pandas()
+    hashes = pq.read_table(os.path.join(directory, 'hashes.parquet'), memory_map=True).column('Txn_Hash')
+    return {
+        'df': df,
+        'rollup': build_rollup(daily),
+        'daily': daily,
+        'hash_index': hashes.to_numpy(),
+        'rows': metadata['rows'],
+        'truncated': metadata['truncated']
+    }
+
+def _write_net_worth(entries, path):
+    if not isinstance(entries, NetWorthSeries):
+        entries = NetWorthSeries.from_frame(list(entries))
+    _write_table(entries.to_frame(), path)
+
+def save_net_worth(entries, name, root=DATA_STORE_DIR):
+    """Replace the stored net worth history (a NetWorthSeries or records) of a saved dataset"""
+    _require_parquet()
+    path = os.path.join(_dataset_dir(name, root), 'net_worth.parquet')
+    _write_net_worth(entries, path)
+    return path
+
+def load_net_worth(name, root=DATA_STORE_DIR):
+    """Stored net worth history of a saved dataset, as a NetWorthSeries"""
+    _require_parquet()
+    path = os.path.join(_dataset_dir(name, root), 'net_worth.parquet')
+    if not os.path.exists(path):
+        return NetWorthSeries()
+    return NetWorthSeries.from_frame(pq.read_table(path).to_pandas())
@@ -0,0 +1,109 @@
+"""Filter indexes and paging for the transaction table."""
+import numpy as np
+import pandas as pd
+
+from .indexes import dataset_index
+
+TABLE_COLUMNS = ['Date', 'Description', 'Category', 'Amount_Cents', 'Type']
+
+def _code_positions(codes, n_codes):
+    """Ascending row positions for each code of a categorical column"""
+    order = np.argsort(codes, kind='stable')
+    splits = np.searchsorted(codes[order], np.arange(1, n_codes))
+    return np.split(order, splits)
+
+def _build_table_index(dataset):
+    """The filter indexes described in table_index, built from the dataset's rows"""
+    df = dataset['df']
+    types = df['Type'].astype('category')
+    categories = df['Category'].astype('category')
+    if isinstance(df['Description'].dtype, pd.CategoricalDtype):
+        description_codes = df['Description'].cat.codes.to_numpy()
+        descriptions = df['Description'].cat.categories
+    else:
+        description_codes, descriptions = pd.factorize(df['Description'])
+    type_codes = types.cat.codes.to_numpy()
+    category_codes = categories.cat.codes.to_numpy()
+    return {
+        'rows': len(df),
+        'types': list(types.cat.categories),
+        'type_codes': type_codes,
+        'type_positions': _code_positions(type_codes, len(types.cat.categories)),
+        'categories': list(categories.cat.categories),
+        'category_positions': _code_positions(category_codes, len(categories.cat.categories)),
+        'descriptions': pd.Index(descriptions).astype(str).str.lower(),
+        'description_codes': description_codes,
+        'dates': df['Date'].to_numpy(),
+        'cents': df['Amount_Cents'].to_numpy()
+    }
+
+def table_index(dataset):
+    """Filter indexes over a dataset's transactions, built once and kept on the dataset.
+    
+    Rows are already sorted by date, so row position is the sort order; for
+    each Type and Category value the index holds the ascending positions of
+    its rows. Descriptions are reduced to codes into their distinct values,
+    so a search only scans each distinct description once.
+    """
+    return dataset_index(dataset, 'table_index', _build_table_index)
+
+def _within(positions, start, stop):
+    """The part of an ascending position array that falls in [start, stop)"""
+    return positions[np.searchsorted(positions, start):np.searchsorted(positions, stop)]
+
+def index_categories(index, start=0, stop=None):
+    """Sorted categories that have at least one row in [start, stop)"""
+    stop = index['rows'] if stop is None else stop
+    return sorted(
+        category for category, positions in zip(index['categories'], index['category_positions'])
+        if len(_within(positions, start, stop))
+    )
+
+def query_table(index, start=0, stop=None, type_filter=None, category_filter=None, min_cents=0, search=None):
+    """Row positions matching the filters, newest first.
+    
+    start and stop bound the rows (e.g. from date_bounds). The smallest
+    applicable index (category, then type, then the whole range) supplies
+    the candidates and the remaining filters are applied to those only.
+    """
+    stop = index['rows'] if stop is None else stop
+    if category_filter is not None and category_filter not in index['categories']:
+        return np.empty(0, dtype=np.intp)
+    if type_filter is not None and type_filter not in index['types']:
+        return np.empty(0, dtype=np.intp)
+    if category_filter is not None:
+        positions = _within(index['category_positions'][index['categories'].index(category_filter)], start, stop)
+        if type_filter is not None:
+            positions = positions[index['type_codes'][positions] == index['types'].index(type_filter)]
+    elif type_filter is not None:
+        positions = _within(index['type_positions'][index['types'].index(type_filter)], start, stop)
+    else:
+        positions = np.arange(start, stop)
+    if min_cents > 0:
+        positions = positions[np.abs(index['cents'][positions]) >= min_cents]
+    if search:
+        matches = np.asarray(index['descriptions'].str.contains(search.lower(), regex=False))
+        codes = index['description_codes'][positions]
+        positions = positions[(codes >= 0) & matches[codes]]
+    return positions[::-1]
+
+def page_positions(positions, page, page_size):
+    """Positions shown on a 1-based page"""
+    first = (page - 1) * page_size
+    return positions[first:first + page_size]
+
+def table_stats(index, positions):
+    """Summary statistics for the matching rows, from the cents and date arrays"""
+    if len(positions) == 0:
+        return {'count': 0, 'first_date': None, 'last_date': None, 'average': 0.0, 'largest_expense': 0.0}
+    cents = index['cents'][positions]
+    expenses = cents[cents < 0]
+    dates = index['dates']
+    return {
+        'count': len(positions),
+        # positions are newest first
+        'first_date': pd.Timestamp(dates[positions[-1]]),
+        'last_date': pd.Timestamp(dates[positions[0]]),
+        'average': cents.sum() / len(cents) / 100,
+        'largest_expense': expenses.min() / 100 if len(expenses) else 0.0
+    }
@@ -0,0 +1,218 @@
+"""Compact transaction schema, processing and metrics."""
+import numpy as np
+import pandas as pd
+
+from .categorize import categorize_transactions
+
+DAYS_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Share of distinct values below which Description is stored as a categorical
+DESCRIPTION_CATEGORICAL_RATIO = 0.5
+
+def to_cents(amounts):
+    """Convert currency amounts to integer cents"""
+    return np.round(np.asarray(amounts, dtype=float) * 100).astype(np.int64)
+
+def _hash_strings(values):
+    """Hash strings (plain or categorical) with missing values treated as ''"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = pd.util.hash_array(values.cat.categories.to_numpy(dtype=object))
+        codes = values.cat.codes.to_numpy()
+        missing = pd.util.hash_array(np.array([''], dtype=object))[0]
+        return np.where(codes >= 0, categories[codes], missing)
+    return pd.util.hash_array(values.fillna('').to_numpy(dtype=object))
+
+def transaction_hashes(dates, descriptions, cents):
+    """64-bit fingerprint of each transaction's (Date, Description, amount in cents)"""
+    hashes = pd.util.hash_array(pd.to_datetime(dates).to_numpy().astype('datetime64[ns]').astype(np.int64))
+    if descriptions is not None:
+        hashes = hashes * np.uint64(1000003) ^ _hash_strings(pd.Series(descriptions, copy=False))
+    return hashes * np.uint64(1000003) ^ pd.util.hash_array(np.asarray(cents, dtype=np.int64))
+
+def transaction_amounts(df):
+    """Amounts in currency units for raw (Amount) or processed (Amount_Cents) frames"""
+    if 'Amount_Cents' in df.columns:
+        return (df['Amount_Cents'] / 100).rename('Amount')
+    return df['Amount']
+
+def _fill_rows(column, rows, values):
+    """column's values as an object array, with the rows selected by the rows mask set to values"""
+    filled = np.empty(len(rows), dtype=object) if column is None else column.to_numpy(dtype=object, copy=True)
+    filled[rows] = values
+    return filled
+
+def process_transactions(df):
+    """Process and categorize transactions into the compact schema.
+    
+    Amount becomes integer Amount_Cents, Category and Type (and Description
+    when it repeats) become categoricals, and the derived Month_Key,
+    Week_Key and Day_of_Week columns are small integers. Txn_Hash
+    fingerprints each row for de-duplicating later uploads. Use
+    expand_transactions to get the readable columns back.
+    """
+    if df is None or df.empty:
+        return df
+    
+    # Ensure Date column is datetime
+    df['Date'] = pd.to_datetime(df['Date'])
+    
+    if 'Amount' in df.columns:
+        amounts = df['Amount'].astype(float).fillna(0)
+        
+        # Auto-categorize the rows without a Category, keeping the ones given
+        missing = df['Category'].isnull().to_numpy() if 'Category' in df.columns else np.ones(len(df), dtype=bool)
+        if missing.any():
+            descriptions = df['Description'] if 'Description' in df.columns else pd.Series('', index=df.index)
+            categories, types = categorize_transactions(descriptions[missing], amounts[missing])
+            df['Category'] = _fill_rows(df.get('Category'), missing, categories)
+            df['Type'] = _fill_rows(df.get('Type'), missing, types)
+        
+        # Ensure every row has a Type
+        signs = np.where(amounts > 0, 'Income', 'Expense')
+        if 'Type' not in df.columns:
+            df['Type'] = signs
+        elif df['Type'].isnull().any():
+            df['Type'] = df['Type'].fillna(pd.Series(signs, index=df.index))
+        
+        df['Amount'] = to_cents(amounts)
+        df = df.rename(columns={'Amount': 'Amount_Cents'})
+    
+    if 'Txn_Hash' not in df.columns:
+        df['Txn_Hash'] = transaction_hashes(df['Date'], df.get('Description'), df['Amount_Cents'])
+    
+    # Keep rows in date order so date ranges are contiguous slices
+    if not df['Date'].is_monotonic_increasing:
+        df = df.sort_values('Date', kind='stable').reset_index(drop=True)
+    
+    df['Category'] = df['Category'].astype('category')
+    df['Type'] = df['Type'].astype('category')
+    if 'Description' in df.columns and not isinstance(df['Description'].dtype, pd.CategoricalDtype):
+        if df['Description'].nunique() <= len(df) * DESCRIPTION_CATEGORICAL_RATIO:
+            df['Description'] = df['Description'].astype('category')
+    
+    # Derived date keys, computed once here rather than per filtered view
+    days = df['Date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    df['Month_Key'] = (df['Date'].dt.year * 12 + df['Date'].dt.month - 1).astype(np.int32)
+    # 1970-01-01 was a Thursday; shift so weeks run Monday to Sunday
+    df['Week_Key'] = ((days + 3) // 7).astype(np.int32)
+    df['Day_of_Week'] = df['Date'].dt.dayofweek.astype(np.int8)
+    
+    return df
+
+def expand_transactions(df):
+    """Readable view of processed transactions for display and export.
+    
+    Replaces Amount_Cents, Month_Key, Week_Key and the integer Day_of_Week
+    with Amount, Month_Year and Week periods and weekday names, in place of
+    the compact columns, and drops Txn_Hash. Only call this on the rows
+    actually being shown.
+    """
+    columns = {}
+    for name in df.columns:
+        if name == 'Txn_Hash':
+            continue
+        elif name == 'Amount_Cents':
+            columns['Amount'] = df['Amount_Cents'] / 100
+        elif name == 'Month_Key':
+            columns['Month_Year'] = df['Date'].dt.to_period('M')
+        elif name == 'Week_Key':
+            columns['Week'] = df['Date'].dt.to_period('W')
+        elif name == 'Day_of_Week':
+            columns['Day_of_Week'] = pd.Categorical.from_codes(df['Day_of_Week'], DAYS_ORDER).astype(object)
+        else:
+            columns[name] = df[name]
+    return pd.DataFrame(columns, index=df.index)
+
+def concat_transactions(frames):
+    """Concatenate processed frames, keeping categorical columns categorical.
+    
+    A column categorical in any of the frames is categorical in the result,
+    so appending a few plain-text rows doesn't undo a column's encoding.
+    Frames are given the same categories first, so concat joins the codes
+    instead of decoding every row back to text.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    frames = [frame.copy(deep=False) for frame in frames]
+    for name in ('Category', 'Type', 'Description', 'Account'):
+        parts = [frame[name] for frame in frames if name in frame.columns]
+        if len(parts) < len(frames) or not any(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            continue
+        parts = [part if isinstance(part.dtype, pd.CategoricalDtype) else part.astype('category') for part in parts]
+        # Frames parsed by different readers can hold categories of different string dtypes
+        if len({part.cat.categories.dtype for part in parts}) > 1:
+            parts = [part.cat.rename_categories(part.cat.categories.astype(object)) for part in parts]
+        categories = parts[0].cat.categories.append([part.cat.categories for part in parts[1:]]).unique()
+        for frame, part in zip(frames, parts):
+            frame[name] = part.cat.set_categories(categories)
+    combined = pd.concat(frames, ignore_index=True)
+    for name in ('Category', 'Type', 'Description', 'Account'):
+        # Columns missing from some frames come back as text
+        if name in combined.columns and not isinstance(combined[name].dtype, pd.CategoricalDtype):
+            if any(name in frame.columns and isinstance(frame[name].dtype, pd.CategoricalDtype) for frame in frames):
+                combined[name] = combined[name].astype('category')
+    return combined
+
+def memory_report(df):
+    """Per-column memory usage of a frame, largest first"""
+    usage = df.memory_usage(deep=True, index=True)
+    report = pd.DataFrame({
+        'Column': usage.index,
+        'Dtype': [str(df.index.dtype) if name == 'Index' else str(df[name].dtype) for name in usage.index],
+        'MB': usage.values / (1024 * 1024)
+    })
+    return report.sort_values('MB', ascending=False).reset_index(drop=True)
+
+def date_bounds(df, start_date, end_date):
+    """Positions (start, stop) of the rows dated start_date..end_date (inclusive)"""
+    dates = df['Date']
+    i = dates.searchsorted(pd.Timestamp(start_date), side='left')
+    j = dates.searchsorted(pd.Timestamp(end_date) + pd.Timedelta(days=1), side='left')
+    return int(i), int(j)
+
+def date_slice(df, start_date, end_date):
+    """Rows dated start_date..end_date (inclusive) of a date-sorted frame.
+    
+    The bounds are found by binary search on the sorted Date column and the
+    result is a positional slice, so no per-row mask is built.
+    """
+    i, j = date_bounds(df, start_date, end_date)
+    return df.iloc[i:j]
+
+def calculate_metrics(df):
+    """Calculate key financial metrics"""
+    if df is None or df.empty:
+        return {
+            'total_income': 0,
+            'total_expenses': 0,
+            'net_income': 0,
+            'monthly_avg_income': 0,
+            'monthly_avg_expenses': 0
+        }
+    
+    if 'Amount_Cents' in df.columns:
+        # Sum whole cents so totals are exact
+        cents = df['Amount_Cents']
+        total_income = cents[cents > 0].sum() / 100
+        total_expenses = abs(cents[cents < 0].sum()) / 100
+    else:
+        total_income = df[df['Amount'] > 0]['Amount'].sum()
+        total_expenses = abs(df[df['Amount'] < 0]['Amount'].sum())
+    net_income = total_income - total_expenses
+    
+    # Monthly averages over the months that have transactions
+    if 'Month_Key' in df.columns:
+        months = df['Month_Key'].nunique()
+    else:
+        months = df['Date'].dt.to_period('M').nunique()
+    months = months if months > 0 else 1
+    monthly_avg_income = total_income / months
+    monthly_avg_expenses = total_expenses / months
+    
+    return {
+        'total_income': total_income,
+        'total_expenses': total_expenses,
+        'net_income': net_income,
+        'monthly_avg_income': monthly_avg_income,
+        'monthly_avg_expenses': monthly_avg_expenses
+    }
@@ -1,11 +1,67 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
 from datetime import datetime, timedelta
-import io
+import uuid
+
+# Plotly is imported by the chart builders on first use, so sessions that
+# never draw a chart (the welcome screen) do not pay for it
+from charts import projection_figure
+from finance_core import (
+    BANK_LAYOUTS,
+    EXPORT_FORMATS,
+    INGEST_MEMORY_BUDGET_MB,
+    SAMPLE_PRESETS,
+    TABLE_COLUMNS,
+    FrameCache,
+    NetWorthSeries,
+    SharedFrameCache,
+    append_transactions,
+    build_dataset,
+    cash_flow_distribution,
+    date_bounds,
+    downsample,
+    enable_copy_on_write,
+    expand_transactions,
+    expense_breakdown,
+    export_transactions,
+    fingerprint_bytes,
+    finish_profile,
+    index_categories,
+    ingest_accounts,
+    ingest_csv,
+    iter_csv_chunks,
+    list_saved_datasets,
+    load_sample_preset,
+    load_net_worth,
+    load_saved_dataset,
+    memory_report,
+    monte_carlo_projection,
+    net_worth_cash_flow,
+    page_positions,
+    process_transactions,
+    query_table,
+    read_net_worth,
+    recurring_transactions,
+    resolve_layout,
+    rollup_category_totals,
+    rollup_daily,
+    rollup_day_of_week_mean,
+    rollup_metrics,
+    rollup_monthly,
+    rollup_weekly,
+    save_dataset,
+    save_net_worth,
+    saved_dataset_version,
+    savings_rate,
+    stage,
+    start_profile,
+    summary_json,
+    summary_report,
+    table_index,
+    table_stats,
+    update_saved_dataset,
+)
 
 # Page configuration
 st.set_page_config(
@@ -43,153 +99,495 @@ st.markdown("""
 # Initialize session state
 if 'transactions_df' not in st.session_state:
     st.session_state.transactions_df = None
+if 'rollup' not in st.session_state:
+    st.session_state.rollup = None
+if 'dataset' not in st.session_state:
+    st.session_state.dataset = None
 if 'net_worth_data' not in st.session_state:
-    st.session_state.net_worth_data = []
-
-def create_sample_data():
-    """Create sample transaction data for demonstration"""
-    np.random.seed(42)
-    dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='D')
-    
-    # Transaction categories and typical amounts
-    expense_categories = {
-        'Groceries': (-50, -200),
-        'Utilities': (-80, -150),
-        'Transportation': (-30, -100),
-        'Entertainment': (-20, -80),
-        'Restaurants': (-25, -75),
-        'Shopping': (-40, -200),
-        'Healthcare': (-50, -300),
-        'Insurance': (-100, -400)
-    }
+    st.session_state.net_worth_data = NetWorthSeries()
+if 'dataset_key' not in st.session_state:
+    st.session_state.dataset_key = None
+if 'upload_fingerprints' not in st.session_state:
+    st.session_state.upload_fingerprints = {}
+if 'saved_name' not in st.session_state:
+    st.session_state.saved_name = None
+if 'applied_upload' not in st.session_state:
+    st.session_state.applied_upload = None
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex[:12]
+
+def get_processing_cache():
+    """The current session's processed-data cache"""
+    if 'processing_cache' not in st.session_state:
+        st.session_state.processing_cache = FrameCache()
+    return st.session_state.processing_cache
+
+@st.cache_resource
+def get_shared_cache():
+    """Process-wide cache of immutable datasets, shared read-only by every session"""
+    enable_copy_on_write()
+    return SharedFrameCache()
+
+def upload_digest(uploaded_file):
+    """Content hash of an upload, computed once per uploader file id"""
+    fingerprints = st.session_state.upload_fingerprints
+    digest = fingerprints.get(uploaded_file.file_id)
+    if digest is None:
+        digest = fingerprint_bytes(uploaded_file.getvalue())
+        fingerprints[uploaded_file.file_id] = digest
+    return digest
+
+def load_uploaded_transactions(uploaded_files, accounts, memory_budget_mb=INGEST_MEMORY_BUDGET_MB):
+    """Stream and process uploaded CSVs once per distinct content and account settings.
     
-    income_categories = {
-        'Salary': (2000, 5000),
-        'Freelance': (200, 1000),
-        'Investment': (50, 500)
-    }
+    accounts holds an (account name, layout) pair per file. A single file
+    is streamed with a progress bar; several files are parsed concurrently
+    and merged, each tagged with its account.
+    """
+    key = (
+        'upload',
+        tuple((upload_digest(f), account, layout) for f, (account, layout) in zip(uploaded_files, accounts)),
+        memory_budget_mb
+    )
+    cache = get_processing_cache()
+    dataset = cache.get(key)
+    if dataset is None:
+        for uploaded_file in uploaded_files:
+            uploaded_file.seek(0)
+        if len(uploaded_files) == 1:
+            progress_bar = st.sidebar.progress(0.0, text="Reading file...")
+            dataset = ingest_csv(
+                uploaded_files[0],
+                total_bytes=uploaded_files[0].size,
+                memory_budget_mb=memory_budget_mb,
+                progress=lambda fraction, rows: progress_bar.progress(fraction, text=f"Ingested {rows:,} rows"),
+                layout=accounts[0][1]
+            )
+            progress_bar.empty()
+        else:
+            with st.spinner(f"Reading {len(uploaded_files)} files..."):
+                dataset = ingest_accounts(
+                    [
+                        {'source': f, 'account': account, 'layout': layout, 'total_bytes': f.size}
+                        for f, (account, layout) in zip(uploaded_files, accounts)
+                    ],
+                    memory_budget_mb=memory_budget_mb
+                )
+        dataset = cache.put(key, dataset)
+    return key, dataset
+
+def append_uploaded_transactions(uploaded_files, accounts):
+    """Merge uploaded CSVs into the session's current dataset.
     
-    transactions = []
+    Rows are tagged with their account when several files are uploaded or
+    the current dataset already has accounts. Returns (key, dataset,
+    rows_added, month_keys_touched).
+    """
+    dataset = st.session_state.dataset
+    tag_accounts = len(uploaded_files) > 1 or 'Account' in dataset['df'].columns
+    frames = []
+    for uploaded_file, (account, layout) in zip(uploaded_files, accounts):
+        uploaded_file.seek(0)
+        layout = resolve_layout(uploaded_file, layout)
+        raw = pd.concat(list(iter_csv_chunks(uploaded_file, 16 << 20, layout=layout)), ignore_index=True)
+        if tag_accounts:
+            raw['Account'] = pd.Series(account, index=raw.index, dtype='category')
+        frames.append(raw)
+    dataset, added, months = append_transactions(dataset, pd.concat(frames, ignore_index=True))
+    key = ('append', st.session_state.dataset_key, tuple(upload_digest(f) for f in uploaded_files), tuple(accounts))
+    return key, get_processing_cache().put(key, dataset), added, months
+
+def account_settings(uploaded_files):
+    """Sidebar account name and statement layout for each uploaded file"""
+    settings = []
+    with st.sidebar.expander("🏦 Accounts", expanded=len(uploaded_files) > 1):
+        for uploaded_file in uploaded_files:
+            account = st.text_input(
+                f"Account for {uploaded_file.name}",
+                value=uploaded_file.name.rsplit('.', 1)[0],
+                key=f"account_{uploaded_file.file_id}"
+            )
+            layout = st.selectbox(
+                "Statement layout",
+                ['auto'] + list(BANK_LAYOUTS),
+                format_func=lambda name: "Auto-detect" if name == 'auto' else name,
+                key=f"layout_{uploaded_file.file_id}"
+            )
+            settings.append((account.strip() or uploaded_file.name, layout))
+    return settings
+
+def set_active_dataset(key, dataset, saved_name=None):
+    """Make dataset the one the dashboard shows"""
+    st.session_state.dataset_key = key
+    st.session_state.dataset = dataset
+    st.session_state.transactions_df = dataset['df']
+    st.session_state.rollup = dataset['rollup']
+    st.session_state.saved_name = saved_name
+
+def load_saved_transactions(name):
+    """Open a stored dataset and its net worth history"""
+    key = ('saved', name, saved_dataset_version(name))
+    return key, get_shared_cache().get_or_build(key, lambda: load_saved_dataset(name))
+
+def load_sample_transactions(preset):
+    """Processed sample dataset preset, generated once per process"""
+    key = ('sample', preset)
+    return key, get_shared_cache().get_or_build(
+        key, lambda: build_dataset(process_transactions(load_sample_preset(preset)))
+    )
+
+# Dashboard views; only the selected one is built on each rerun
+VIEWS = ["💳 Cash Flow", "🏷️ Categories", "📅 Trends", "📋 Transactions", "🔮 Projection", "🔁 Recurring"]
+VIEW_STAGES = ["cash_flow", "categories", "trends", "transactions", "projection", "recurring"]
+
+# Longest series sent to the browser per chart, and the length from which
+# line charts are drawn with WebGL
+CHART_MAX_POINTS = 1500
+WEBGL_MIN_POINTS = 1000
+TREND_RESOLUTIONS = ["Auto", "Daily", "Weekly", "Monthly"]
+
+# Net worth chart resolutions and their NetWorthSeries.resample frequencies; None plots entries as is
+NET_WORTH_RESOLUTIONS = {"As entered": None, "Daily": 'D', "Weekly": 'W', "Monthly": 'M'}
+
+# Path counts offered for Monte Carlo savings projections
+PROJECTION_PATHS = [10_000, 100_000, 1_000_000]
+
+# Export choices: report format -> (extension, MIME type), transactions label -> EXPORT_FORMATS key
+REPORT_FORMATS = {"Text": ('txt', 'text/plain'), "JSON": ('json', 'application/json')}
+TRANSACTION_EXPORTS = {"CSV": 'csv', "CSV (gzip)": 'csv.gz', "Parquet": 'parquet'}
+
+# Page sizes offered by the transaction table
+TABLE_PAGE_SIZES = [25, 50, 100, 250]
+
+# Upper bound on memory held by a session's cached figures and export payloads
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+def payload_nbytes(value):
+    """Rough memory size of a cached figure, table or export payload"""
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    points = 0
+    for trace in value.data:
+        for name in ('x', 'y', 'labels', 'values'):
+            data = getattr(trace, name, None)
+            points += 0 if data is None else len(data)
+    return 1024 + 16 * points
+
+def get_figure_cache():
+    """The current session's cache of figures and export payloads"""
+    if 'figure_cache' not in st.session_state:
+        st.session_state.figure_cache = FrameCache(FIGURE_CACHE_MAX_BYTES, sizeof=payload_nbytes)
+    return st.session_state.figure_cache
+
+def memoized(key, build):
+    """Cached value for key, calling build() to create it on a miss.
     
-    # Generate transactions
-    for date in dates:
-        # Random number of transactions per day (0-5)
-        num_transactions = np.random.poisson(1.5)
-        
-        for _ in range(num_transactions):
-            # 80% chance of expense, 20% chance of income
-            if np.random.random() < 0.8:
-                category = np.random.choice(list(expense_categories.keys()))
-                amount_range = expense_categories[category]
-                amount = np.random.uniform(amount_range[0], amount_range[1])
-                transaction_type = 'Expense'
-            else:
-                category = np.random.choice(list(income_categories.keys()))
-                amount_range = income_categories[category]
-                amount = np.random.uniform(amount_range[0], amount_range[1])
-                transaction_type = 'Income'
-            
-            transactions.append({
-                'Date': date,
-                'Description': f"{category} transaction",
-                'Category': category,
-                'Amount': round(amount, 2),
-                'Type': transaction_type
-            })
-    
-    return pd.DataFrame(transactions).sort_values('Date')
-
-def categorize_transaction(description, amount):
-    """Automatically categorize transactions based on description and amount"""
-    description = description.lower()
-    
-    # Income categories
-    if any(word in description for word in ['salary', 'paycheck', 'wage', 'income', 'freelance']):
-        return 'Income', 'Income'
-    if any(word in description for word in ['dividend', 'investment', 'interest']):
-        return 'Investment', 'Income'
-    
-    # Expense categories (negative amounts)
-    if amount < 0:
-        if any(word in description for word in ['grocery', 'food', 'supermarket', 'walmart', 'costco']):
-            return 'Groceries', 'Expense'
-        elif any(word in description for word in ['gas', 'fuel', 'uber', 'taxi', 'metro', 'bus']):
-            return 'Transportation', 'Expense'
-        elif any(word in description for word in ['restaurant', 'cafe', 'pizza', 'mcdonalds', 'starbucks']):
-            return 'Restaurants', 'Expense'
-        elif any(word in description for word in ['electric', 'water', 'internet', 'phone', 'utility']):
-            return 'Utilities', 'Expense'
-        elif any(word in description for word in ['movie', 'netflix', 'spotify', 'entertainment', 'game']):
-            return 'Entertainment', 'Expense'
-        elif any(word in description for word in ['amazon', 'shopping', 'store', 'mall']):
-            return 'Shopping', 'Expense'
-        elif any(word in description for word in ['doctor', 'hospital', 'pharmacy', 'medical']):
-            return 'Healthcare', 'Expense'
-        elif any(word in description for word in ['insurance', 'premium']):
-            return 'Insurance', 'Expense'
-        else:
-            return 'Other', 'Expense'
+    Keys start with (dataset key, start date, end date) so figures are
+    reused until the data or the date range changes.
+    """
+    cache = get_figure_cache()
+    value = cache.get(key)
+    if value is None:
+        value = cache.put(key, build())
+    return value
+
+def cash_flow_figure(monthly_data):
+    """Monthly income, expense and net cash flow chart"""
+    import plotly.graph_objects as go
+    
+    if 'Income' not in monthly_data.columns:
+        monthly_data['Income'] = 0
+    if 'Expense' not in monthly_data.columns:
+        monthly_data['Expense'] = 0
+    
+    monthly_data['Expense'] = abs(monthly_data['Expense'])
+    monthly_data['Net'] = monthly_data['Income'] - monthly_data['Expense']
+    
+    fig_cashflow = go.Figure()
+    fig_cashflow.add_trace(go.Bar(
+        x=monthly_data.index.astype(str),
+        y=monthly_data['Income'],
+        name='Income',
+        marker_color='green'
+    ))
+    fig_cashflow.add_trace(go.Bar(
+        x=monthly_data.index.astype(str),
+        y=monthly_data['Expense'],
+        name='Expenses',
+        marker_color='red'
+    ))
+    fig_cashflow.add_trace(go.Scatter(
+        x=monthly_data.index.astype(str),
+        y=monthly_data['Net'],
+        name='Net Cash Flow',
+        line=dict(color='blue', width=3),
+        mode='lines+markers'
+    ))
+    
+    fig_cashflow.update_layout(
+        title="Monthly Cash Flow Analysis",
+        xaxis_title="Month",
+        yaxis_title="Amount (₹)",
+        hovermode='x unified'
+    )
+    return fig_cashflow
+
+def render_cash_flow(rollup, view_key, start_date, end_date):
+    fig_cashflow = memoized(
+        view_key + ('cash_flow',),
+        lambda: cash_flow_figure(rollup_monthly(rollup, start_date, end_date))
+    )
+    st.plotly_chart(fig_cashflow, use_container_width=True)
+
+def render_categories(rollup, view_key, start_date, end_date):
+    import plotly.express as px
+    
+    expense_by_category = rollup_category_totals(rollup, 'Expense', start_date, end_date).abs()
+    if expense_by_category.empty:
+        return
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Expense breakdown
+        fig_pie = memoized(view_key + ('expense_pie',), lambda: px.pie(
+            values=expense_by_category.values,
+            names=expense_by_category.index,
+            title="Expense Breakdown by Category"
+        ))
+        st.plotly_chart(fig_pie, use_container_width=True)
+    
+    with col2:
+        # Top expense categories
+        top_expenses = expense_by_category.sort_values(ascending=True).tail(10)
+        fig_bar = memoized(view_key + ('top_expenses',), lambda: px.bar(
+            x=top_expenses.values,
+            y=top_expenses.index,
+            orientation='h',
+            title="Top Expense Categories",
+            labels={'x': 'Amount (₹)', 'y': 'Category'}
+        ))
+        st.plotly_chart(fig_bar, use_container_width=True)
+
+def line_figure(x, y, title, labels, method='lttb'):
+    """Line chart reduced to at most CHART_MAX_POINTS, drawn with WebGL when long"""
+    import plotly.express as px
+    
+    x, y = downsample(np.asarray(x), np.asarray(y), CHART_MAX_POINTS, method)
+    return px.line(
+        x=x,
+        y=y,
+        title=title,
+        labels=labels,
+        render_mode='webgl' if len(y) > WEBGL_MIN_POINTS else 'auto'
+    )
+
+def trend_resolution(rollup, start_date, end_date):
+    """Finest resolution whose number of points fits in CHART_MAX_POINTS"""
+    if start_date is None:
+        days = len(rollup['days'])
     else:
-        return 'Other Income', 'Income'
-
-def process_transactions(df):
-    """Process and categorize transactions"""
-    if df is None or df.empty:
-        return df
-    
-    # Ensure Date column is datetime
-    df['Date'] = pd.to_datetime(df['Date'])
-    
-    # Auto-categorize if Category column doesn't exist or is empty
-    if 'Category' not in df.columns or df['Category'].isnull().any():
-        df[['Category', 'Type']] = df.apply(
-            lambda row: categorize_transaction(
-                row.get('Description', ''), 
-                row['Amount']
-            ), axis=1, result_type='expand'
+        days = (end_date - start_date).days + 1
+    if days <= CHART_MAX_POINTS:
+        return "Daily"
+    if days // 7 <= CHART_MAX_POINTS:
+        return "Weekly"
+    return "Monthly"
+
+def spending_trend(rollup, resolution, start_date, end_date):
+    """Expenses per day, week or month as (x, y, x label)"""
+    if resolution == "Daily":
+        daily = rollup_daily(rollup, 'Expense', start_date, end_date).abs()
+        return daily.index.to_numpy(), daily.to_numpy(), 'Day'
+    if resolution == "Monthly":
+        monthly = rollup_monthly(rollup, start_date, end_date)
+        expenses = monthly['Expense'].abs() if 'Expense' in monthly.columns else pd.Series(dtype=float)
+        return expenses.index.astype(str), expenses.to_numpy(), 'Month'
+    weekly = rollup_weekly(rollup, 'Expense', start_date, end_date).abs()
+    return weekly.index.astype(str), weekly.values, 'Week'
+
+def render_trends(rollup, view_key, start_date, end_date):
+    # Spending trend at the chosen resolution; narrowing the date range re-aggregates at full detail
+    resolution = st.radio("Resolution", TREND_RESOLUTIONS, index=TREND_RESOLUTIONS.index("Weekly"), horizontal=True)
+    if resolution == "Auto":
+        resolution = trend_resolution(rollup, start_date, end_date)
+    x, y, x_label = spending_trend(rollup, resolution, start_date, end_date)
+    fig_trend = memoized(view_key + ('trend', resolution), lambda: line_figure(
+        x,
+        y,
+        title=f"{resolution} Spending Trend",
+        labels={'x': x_label, 'y': 'Expenses (₹)'},
+        method='minmax'
+    ))
+    st.plotly_chart(fig_trend, use_container_width=True)
+    if len(y) > CHART_MAX_POINTS:
+        st.caption(f"Showing about {CHART_MAX_POINTS:,} of {len(y):,} points; narrow the date range for full detail")
+    
+    # Daily spending pattern
+    def daily_figure():
+        import plotly.express as px
+        
+        daily_pattern = rollup_day_of_week_mean(rollup, 'Expense', start_date, end_date).abs()
+        return px.bar(
+            x=daily_pattern.index,
+            y=daily_pattern.values,
+            title="Average Daily Spending Pattern",
+            labels={'x': 'Day of Week', 'y': 'Average Expenses (₹)'}
         )
+    st.plotly_chart(memoized(view_key + ('day_of_week',), daily_figure), use_container_width=True)
+
+def render_transactions(dataset, start, stop):
+    # Transaction table with filters, served one page at a time from the table index
+    st.subheader("Transaction Details")
+    index = table_index(dataset)
     
-    # Ensure Type column exists
-    if 'Type' not in df.columns:
-        df['Type'] = df['Amount'].apply(lambda x: 'Income' if x > 0 else 'Expense')
-    
-    # Add month-year for grouping
-    df['Month_Year'] = df['Date'].dt.to_period('M')
-    
-    return df
-
-def calculate_metrics(df):
-    """Calculate key financial metrics"""
-    if df is None or df.empty:
-        return {
-            'total_income': 0,
-            'total_expenses': 0,
-            'net_income': 0,
-            'monthly_avg_income': 0,
-            'monthly_avg_expenses': 0
-        }
-    
-    total_income = df[df['Amount'] > 0]['Amount'].sum()
-    total_expenses = abs(df[df['Amount'] < 0]['Amount'].sum())
-    net_income = total_income - total_expenses
-    
-    # Monthly averages - create Month_Year if it doesn't exist
-    if 'Month_Year' not in df.columns:
-        df['Month_Year'] = df['Date'].dt.to_period('M')
-    
-    months = df['Month_Year'].nunique() if df['Month_Year'].nunique() > 0 else 1
-    monthly_avg_income = total_income / months
-    monthly_avg_expenses = total_expenses / months
-    
-    return {
-        'total_income': total_income,
-        'total_expenses': total_expenses,
-        'net_income': net_income,
-        'monthly_avg_income': monthly_avg_income,
-        'monthly_avg_expenses': monthly_avg_expenses
-    }
+    # Additional filters
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        type_filter = st.selectbox("Filter by Type", ['All', 'Income', 'Expense'])
+    with col2:
+        categories = ['All'] + index_categories(index, start, stop)
+        category_filter = st.selectbox("Filter by Category", categories)
+    with col3:
+        min_amount = st.number_input("Minimum Amount", value=0.0)
+    with col4:
+        search = st.text_input("🔍 Search Description")
+    
+    # Apply filters
+    positions = query_table(
+        index, start, stop,
+        type_filter=None if type_filter == 'All' else type_filter,
+        category_filter=None if category_filter == 'All' else category_filter,
+        min_cents=round(min_amount * 100),
+        search=search.strip()
+    )
+    
+    # Display the current page of transactions
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page_size = st.selectbox("Rows per page", TABLE_PAGE_SIZES, index=1)
+    pages = max(1, -(-len(positions) // page_size))
+    with col2:
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1)
+    shown = page_positions(positions, min(page, pages), page_size)
+    columns = TABLE_COLUMNS + (['Account'] if 'Account' in dataset['df'].columns else [])
+    st.dataframe(
+        expand_transactions(dataset['df'][columns].iloc[shown]),
+        use_container_width=True
+    )
+    st.caption(f"Showing {len(shown):,} of {len(positions):,} matching transactions")
+    
+    # Summary statistics
+    stats = table_stats(index, positions)
+    st.subheader("Summary Statistics")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write(f"**Total Transactions:** {stats['count']}")
+        if stats['count']:
+            st.write(f"**Date Range:** {stats['first_date'].strftime('%Y-%m-%d')} to {stats['last_date'].strftime('%Y-%m-%d')}")
+    with col2:
+        st.write(f"**Average Transaction:** ${stats['average']:.2f}")
+        st.write(f"**Largest Expense:** ${stats['largest_expense']:.2f}")
+
+def render_projection(rollup, start_date, end_date):
+    # Savings projection, drawing each month's income and expenses from the selected period's distribution
+    cash_flow = cash_flow_distribution(rollup_monthly(rollup, start_date, end_date))
+    st.caption(
+        f"Monthly income ${cash_flow['income_mean']:,.0f} ± {cash_flow['income_std']:,.0f}, "
+        f"expenses ${cash_flow['expense_mean']:,.0f} ± {cash_flow['expense_std']:,.0f} over the selected period"
+    )
+    net_worth = st.session_state.net_worth_data
+    latest = net_worth.latest()['Net_Worth'] if net_worth else 0.0
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        start_value = st.number_input("Starting Balance ($)", value=float(latest), step=1000.0)
+        years = st.slider("Projection Horizon (Years)", min_value=1, max_value=50, value=30)
+    with col2:
+        expected_return = st.number_input("Expected Annual Return (%)", value=5.0, step=0.5)
+        volatility = st.number_input("Annual Volatility (%)", min_value=0.0, value=10.0, step=0.5)
+    with col3:
+        paths = st.selectbox("Simulated Paths", PROJECTION_PATHS, index=1, format_func=lambda n: f"{n:,}")
+        goal = st.number_input("Goal ($, 0 for none)", min_value=0.0, value=0.0, step=10000.0)
+    
+    if st.button("🔮 Run Projection"):
+        with st.spinner(f"Simulating {paths:,} paths..."):
+            projection = monte_carlo_projection(
+                start_value, expected_return, volatility, years=years, paths=paths,
+                cash_flow=cash_flow, goal=goal or None
+            )
+        bands = projection['bands']
+        st.plotly_chart(projection_figure(bands, f"Projected Savings ({paths:,} paths)"), use_container_width=True)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Median Final Balance", f"${projection['final']['P50']:,.0f}")
+        with col2:
+            st.metric("5th-95th Percentile", f"${projection['final']['P5']:,.0f} to ${projection['final']['P95']:,.0f}")
+        with col3:
+            if projection['goal_probability'] is not None:
+                st.metric("Chance of Reaching Goal", f"{projection['goal_probability'][-1]:.1%}")
+        yearly = bands[bands.index % 12 == 0].rename(index=lambda month: month // 12).rename_axis("Year")
+        st.dataframe(yearly.round(0), use_container_width=True)
+        st.caption(f"Simulated in {projection['seconds']:.2f}s")
+
+def render_recurring(dataset, dataset_key):
+    # Recurring charges and income over the whole history; detection is kept with the dataset and extended on append
+    recurring = memoized((dataset_key, 'recurring'), lambda: recurring_transactions(dataset))
+    if recurring.empty:
+        st.info("No recurring transactions found; a charge needs a few regular repeats to be detected")
+        return
+    active = recurring[recurring['Active']]
+    subscriptions = active[active['Subscription']]
+    expenses = active[active['Type'] == 'Expense']
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Active Subscriptions", f"{len(subscriptions):,}")
+    with col2:
+        st.metric("Subscriptions per Month", f"${abs(subscriptions['Annual_Amount'].sum()) / 12:,.2f}")
+    with col3:
+        st.metric("Recurring Expenses per Year", f"${abs(expenses['Annual_Amount'].sum()):,.2f}")
+    
+    show_stopped = st.checkbox("Include stopped charges", value=False)
+    st.dataframe(recurring if show_stopped else active, use_container_width=True)
+    st.caption(f"{len(active):,} active of {len(recurring):,} recurring transactions detected")
+
+def net_worth_figure(series, freq):
+    """Net worth line chart, of the entries themselves or resampled to freq"""
+    if freq is None:
+        x, y = series.dates.astype('datetime64[ns]'), series.net_worth
+    else:
+        balances = series.resample(freq)
+        x, y = balances.index.to_numpy(), balances['Net_Worth'].to_numpy()
+    return line_figure(
+        x,
+        y,
+        title="Net Worth Over Time",
+        labels={'y': 'Net Worth ($)', 'x': 'Date'}
+    )
+
+def render_debug_panel(profile):
+    """Sidebar panel with this rerun's stage timings and memory"""
+    with st.sidebar.expander("🐞 Debug"):
+        show = st.checkbox("Show stage timings", key="show_profile")
+        st.checkbox(
+            "Trace Python allocations (slower)",
+            key="trace_memory",
+            help="Record each stage's peak allocated memory from the next rerun on"
+        )
+        if show and profile is not None:
+            st.write(f"**Session {profile['session']}: {profile['total_seconds'] * 1000:,.0f} ms**")
+            st.dataframe(pd.DataFrame(profile['stages']), hide_index=True, use_container_width=True)
 
 def main():
+    start_profile(
+        session=st.session_state.session_id,
+        trace_memory=st.session_state.get('trace_memory', False)
+    )
+    
     # Header
     st.markdown('<h1 class="main-header">💰 Personal Finance Dashboard</h1>', unsafe_allow_html=True)
     
@@ -197,45 +595,117 @@ def main():
     st.sidebar.header("📊 Dashboard Controls")
     
     # File upload
-    uploaded_file = st.sidebar.file_uploader(
+    uploaded_files = st.sidebar.file_uploader(
         "Upload Transaction CSV", 
         type=['csv'],
-        help="Upload a CSV file with columns: Date, Description, Amount (and optionally Category, Type)"
+        accept_multiple_files=True,
+        help="Upload a CSV file with columns: Date, Description, Amount (and optionally Category, Type), "
+             "or one statement per account in a common bank or card export layout"
     )
+    accounts = account_settings(uploaded_files) if uploaded_files else []
+    
+    with st.sidebar.expander("⚙️ Ingest Settings"):
+        memory_budget_mb = st.number_input(
+            "Memory budget for transaction rows (MB)",
+            min_value=64,
+            value=INGEST_MEMORY_BUDGET_MB,
+            step=64,
+            help="Large files are read in chunks. Metrics and charts always cover the whole file; "
+                 "the transaction table keeps rows only up to this budget."
+        )
     
     # Sample data option
+    sample_preset = st.sidebar.selectbox("Sample dataset", list(SAMPLE_PRESETS))
     if st.sidebar.button("📝 Load Sample Data"):
-        st.session_state.transactions_df = create_sample_data()
+        with stage("load_sample"):
+            set_active_dataset(*load_sample_transactions(sample_preset))
         st.sidebar.success("Sample data loaded!")
     
     # Clear/Reset button
     if st.sidebar.button("🔄 Start Fresh", type="secondary"):
         st.session_state.transactions_df = None
-        st.session_state.net_worth_data = []
+        st.session_state.rollup = None
+        st.session_state.net_worth_data = NetWorthSeries()
+        st.session_state.dataset_key = None
+        st.session_state.dataset = None
+        st.session_state.saved_name = None
+        st.session_state.upload_fingerprints = {}
+        st.session_state.applied_upload = None
+        get_processing_cache().clear()
         st.sidebar.success("Dashboard reset! Ready for new data.")
         st.rerun()
     
-    # Process uploaded file
-    if uploaded_file is not None:
+    append_mode = st.sidebar.checkbox(
+        "➕ Append uploads to current data",
+        disabled=st.session_state.dataset is None,
+        help="Merge the next upload into the loaded dataset, skipping transactions already present"
+    )
+    
+    # Process uploaded files (once, so sample or saved data can replace them)
+    upload_id = None
+    if uploaded_files:
+        upload_id = (tuple(f.file_id for f in uploaded_files), tuple(accounts), memory_budget_mb)
+    if upload_id is not None and upload_id != st.session_state.applied_upload and append_mode and st.session_state.dataset is not None:
         try:
-            df = pd.read_csv(uploaded_file)
-            st.session_state.transactions_df = process_transactions(df)
-            st.sidebar.success("File uploaded successfully!")
+            with stage("append_upload"):
+                key, dataset, added, months = append_uploaded_transactions(uploaded_files, accounts)
+                set_active_dataset(key, dataset, saved_name=st.session_state.saved_name)
+                if st.session_state.saved_name and added:
+                    update_saved_dataset(dataset, st.session_state.saved_name, months)
+            st.session_state.applied_upload = upload_id
+            st.sidebar.success(f"Added {added:,} new transactions from {', '.join(f.name for f in uploaded_files)}")
+        except Exception as e:
+            st.sidebar.error(f"Error appending file: {str(e)}")
+    elif upload_id is not None and upload_id != st.session_state.applied_upload:
+        try:
+            with stage("ingest_upload"):
+                key, dataset = load_uploaded_transactions(uploaded_files, accounts, memory_budget_mb)
+                set_active_dataset(key, dataset)
+            st.session_state.applied_upload = upload_id
+            st.sidebar.success("File uploaded successfully!" if len(uploaded_files) == 1 else f"{len(uploaded_files)} files merged successfully!")
+            if dataset['truncated']:
+                st.sidebar.warning(
+                    f"Kept the first {len(dataset['df']):,} of {dataset['rows']:,} rows for the transaction table. "
+                    "Metrics and charts include every row."
+                )
         except Exception as e:
             st.sidebar.error(f"Error reading file: {str(e)}")
     
+    # Saved datasets
+    st.sidebar.subheader("💾 Saved Datasets")
+    saved_names = list_saved_datasets()
+    if saved_names:
+        open_name = st.sidebar.selectbox("Saved dataset", saved_names)
+        if st.sidebar.button("📂 Open"):
+            try:
+                with stage("load_saved"):
+                    key, dataset = load_saved_transactions(open_name)
+                    set_active_dataset(key, dataset, saved_name=open_name)
+                    st.session_state.net_worth_data = load_net_worth(open_name)
+                st.sidebar.success(f"Opened '{open_name}'")
+            except Exception as e:
+                st.sidebar.error(f"Error opening dataset: {str(e)}")
+    if st.session_state.transactions_df is not None:
+        save_name = st.sidebar.text_input("Save as", value=st.session_state.saved_name or "")
+        if st.sidebar.button("💾 Save Dataset"):
+            try:
+                with stage("save_dataset"):
+                    save_dataset(st.session_state.dataset, save_name, st.session_state.net_worth_data)
+                st.session_state.saved_name = save_name
+                st.sidebar.success(f"Saved '{save_name}'")
+            except Exception as e:
+                st.sidebar.error(f"Error saving dataset: {str(e)}")
+    
     # Main content
     if st.session_state.transactions_df is not None:
+        # Already processed at load time and reused across reruns
         df = st.session_state.transactions_df
+        rollup = st.session_state.rollup
         
-        # Ensure the dataframe is properly processed
-        df = process_transactions(df)
-        st.session_state.transactions_df = df
-        
-        # Date filter
+        # Date filter, bounded by the rollup's days: a truncated dataset keeps only some of its rows
         st.sidebar.subheader("📅 Date Filter")
-        min_date = df['Date'].min().date()
-        max_date = df['Date'].max().date()
+        min_date = rollup['days'][0].date()
+        max_date = rollup['days'][-1].date()
         
         date_range = st.sidebar.date_input(
             "Select Date Range",
@@ -244,14 +714,24 @@ def main():
             max_value=max_date
         )
         
-        if len(date_range) == 2:
-            start_date, end_date = date_range
-            df_filtered = df[(df['Date'].dt.date >= start_date) & (df['Date'].dt.date <= end_date)]
-        else:
-            df_filtered = df
+        with stage("date_filter"):
+            if len(date_range) == 2:
+                start_date, end_date = date_range
+                bounds = date_bounds(df, start_date, end_date)
+            else:
+                start_date = end_date = None
+                bounds = (0, len(df))
+            df_filtered = df.iloc[bounds[0]:bounds[1]]
+        
+        with st.sidebar.expander("🧮 Memory Usage"):
+            with stage("memory_report"):
+                report = memory_report(df)
+            st.write(f"**{len(df):,} rows, {report['MB'].sum():,.1f} MB**")
+            st.dataframe(report, hide_index=True, use_container_width=True)
         
-        # Calculate metrics
-        metrics = calculate_metrics(df_filtered)
+        # Metrics and chart data come from the precomputed rollup
+        with stage("metrics"):
+            metrics = rollup_metrics(rollup, start_date, end_date)
         
         # Display key metrics
         st.subheader("📈 Key Financial Metrics")
@@ -280,156 +760,33 @@ def main():
             )
         
         with col4:
-            savings_rate = (metrics['net_income'] / metrics['total_income'] * 100) if metrics['total_income'] > 0 else 0
+            rate = savings_rate(metrics)
             st.metric(
                 label="📊 Savings Rate",
-                value=f"{savings_rate:.1f}%",
-                delta="Good" if savings_rate > 20 else "Improve"
+                value=f"{rate:.1f}%",
+                delta="Good" if rate > 20 else "Improve"
             )
         
         # Charts section
         st.subheader("📊 Financial Analysis")
         
-        # Create tabs for different views
-        tab1, tab2, tab3, tab4 = st.tabs(["💳 Cash Flow", "🏷️ Categories", "📅 Trends", "📋 Transactions"])
+        # Only the selected view is computed on each rerun
+        view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed", key="active_view")
+        view_key = (st.session_state.dataset_key, start_date, end_date)
         
-        with tab1:
-            # Monthly cash flow
-            monthly_data = df_filtered.groupby(['Month_Year', 'Type'])['Amount'].sum().unstack(fill_value=0)
-            if 'Income' not in monthly_data.columns:
-                monthly_data['Income'] = 0
-            if 'Expense' not in monthly_data.columns:
-                monthly_data['Expense'] = 0
-                
-            monthly_data['Expense'] = abs(monthly_data['Expense'])
-            monthly_data['Net'] = monthly_data['Income'] - monthly_data['Expense']
-            
-            fig_cashflow = go.Figure()
-            fig_cashflow.add_trace(go.Bar(
-                x=monthly_data.index.astype(str),
-                y=monthly_data['Income'],
-                name='Income',
-                marker_color='green'
-            ))
-            fig_cashflow.add_trace(go.Bar(
-                x=monthly_data.index.astype(str),
-                y=monthly_data['Expense'],
-                name='Expenses',
-                marker_color='red'
-            ))
-            fig_cashflow.add_trace(go.Scatter(
-                x=monthly_data.index.astype(str),
-                y=monthly_data['Net'],
-                name='Net Cash Flow',
-                line=dict(color='blue', width=3),
-                mode='lines+markers'
-            ))
-            
-            fig_cashflow.update_layout(
-                title="Monthly Cash Flow Analysis",
-                xaxis_title="Month",
-                yaxis_title="Amount (₹)",
-                hovermode='x unified'
-            )
-            st.plotly_chart(fig_cashflow, use_container_width=True)
-        
-        with tab2:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Expense breakdown
-                expenses_df = df_filtered[df_filtered['Type'] == 'Expense']
-                if not expenses_df.empty:
-                    expense_by_category = expenses_df.groupby('Category')['Amount'].sum().abs()
-                    
-                    fig_pie = px.pie(
-                        values=expense_by_category.values,
-                        names=expense_by_category.index,
-                        title="Expense Breakdown by Category"
-                    )
-                    st.plotly_chart(fig_pie, use_container_width=True)
-            
-            with col2:
-                # Top expense categories
-                if not expenses_df.empty:
-                    top_expenses = expense_by_category.sort_values(ascending=True).tail(10)
-                    
-                    fig_bar = px.bar(
-                        x=top_expenses.values,
-                        y=top_expenses.index,
-                        orientation='h',
-                        title="Top Expense Categories",
-                        labels={'x': 'Amount (₹)', 'y': 'Category'}
-                    )
-                    st.plotly_chart(fig_bar, use_container_width=True)
-        
-        with tab3:
-            # Weekly spending trend
-            df_filtered['Week'] = df_filtered['Date'].dt.to_period('W')
-            weekly_expenses = df_filtered[df_filtered['Type'] == 'Expense'].groupby('Week')['Amount'].sum().abs()
-            
-            fig_trend = px.line(
-                x=weekly_expenses.index.astype(str),
-                y=weekly_expenses.values,
-                title="Weekly Spending Trend",
-                labels={'x': 'Week', 'y': 'Expenses (₹)'}
-            )
-            st.plotly_chart(fig_trend, use_container_width=True)
-            
-            # Daily spending pattern
-            df_filtered['Day_of_Week'] = df_filtered['Date'].dt.day_name()
-            daily_pattern = df_filtered[df_filtered['Type'] == 'Expense'].groupby('Day_of_Week')['Amount'].mean().abs()
-            
-            # Reorder days
-            days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            daily_pattern = daily_pattern.reindex(days_order, fill_value=0)
-            
-            fig_daily = px.bar(
-                x=daily_pattern.index,
-                y=daily_pattern.values,
-                title="Average Daily Spending Pattern",
-                labels={'x': 'Day of Week', 'y': 'Average Expenses (₹)'}
-            )
-            st.plotly_chart(fig_daily, use_container_width=True)
-        
-        with tab4:
-            # Transaction table with filters
-            st.subheader("Transaction Details")
-            
-            # Additional filters
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                type_filter = st.selectbox("Filter by Type", ['All', 'Income', 'Expense'])
-            with col2:
-                categories = ['All'] + sorted(df_filtered['Category'].unique().tolist())
-                category_filter = st.selectbox("Filter by Category", categories)
-            with col3:
-                min_amount = st.number_input("Minimum Amount", value=0.0)
-            
-            # Apply filters
-            filtered_transactions = df_filtered.copy()
-            if type_filter != 'All':
-                filtered_transactions = filtered_transactions[filtered_transactions['Type'] == type_filter]
-            if category_filter != 'All':
-                filtered_transactions = filtered_transactions[filtered_transactions['Category'] == category_filter]
-            if min_amount > 0:
-                filtered_transactions = filtered_transactions[abs(filtered_transactions['Amount']) >= min_amount]
-            
-            # Display transactions
-            st.dataframe(
-                filtered_transactions[['Date', 'Description', 'Category', 'Amount', 'Type']].sort_values('Date', ascending=False),
-                use_container_width=True
-            )
-            
-            # Summary statistics
-            st.subheader("Summary Statistics")
-            col1, col2 = st.columns(2)
-            with col1:
-                st.write(f"**Total Transactions:** {len(filtered_transactions)}")
-                st.write(f"**Date Range:** {filtered_transactions['Date'].min().strftime('%Y-%m-%d')} to {filtered_transactions['Date'].max().strftime('%Y-%m-%d')}")
-            with col2:
-                st.write(f"**Average Transaction:** ${filtered_transactions['Amount'].mean():.2f}")
-                st.write(f"**Largest Expense:** ${filtered_transactions[filtered_transactions['Amount'] < 0]['Amount'].min():.2f}")
+        with stage(f"view:{VIEW_STAGES[VIEWS.index(view)]}"):
+            if view == VIEWS[0]:
+                render_cash_flow(rollup, view_key, start_date, end_date)
+            elif view == VIEWS[1]:
+                render_categories(rollup, view_key, start_date, end_date)
+            elif view == VIEWS[2]:
+                render_trends(rollup, view_key, start_date, end_date)
+            elif view == VIEWS[3]:
+                render_transactions(st.session_state.dataset, *bounds)
+            elif view == VIEWS[4]:
+                render_projection(rollup, start_date, end_date)
+            else:
+                render_recurring(st.session_state.dataset, st.session_state.dataset_key)
         
         # Net Worth Tracking Section
         st.subheader("💎 Net Worth Tracking")
@@ -445,70 +802,86 @@ def main():
             
             if st.button("Add Net Worth Entry"):
                 net_worth = assets - liabilities
-                st.session_state.net_worth_data.append({
-                    'Date': nw_date,
-                    'Assets': assets,
-                    'Liabilities': liabilities,
-                    'Net_Worth': net_worth
-                })
+                st.session_state.net_worth_data.append(nw_date, assets, liabilities)
+                if st.session_state.saved_name:
+                    save_net_worth(st.session_state.net_worth_data, st.session_state.saved_name)
                 st.success(f"Added net worth entry: ${net_worth:,.2f}")
         
+        with st.expander("📥 Import Balance History"):
+            st.caption("CSV with a Date column and either Assets and Liabilities or a single Net_Worth or Balance column")
+            balance_file = st.file_uploader("Balance history CSV", type=['csv'], key="balance_history")
+            if balance_file is not None and st.button("Import Balances"):
+                try:
+                    imported = read_net_worth(balance_file)
+                    st.session_state.net_worth_data.extend(imported.dates, imported.assets, imported.liabilities)
+                    if st.session_state.saved_name:
+                        save_net_worth(st.session_state.net_worth_data, st.session_state.saved_name)
+                    st.success(f"Imported {len(imported):,} balance entries")
+                except Exception as e:
+                    st.error(f"Error importing balances: {str(e)}")
+        
         # Display net worth chart if data exists
-        if st.session_state.net_worth_data:
-            nw_df = pd.DataFrame(st.session_state.net_worth_data)
-            
-            fig_nw = px.line(
-                nw_df, 
-                x='Date', 
-                y='Net_Worth',
-                title="Net Worth Over Time",
-                labels={'Net_Worth': 'Net Worth ($)', 'Date': 'Date'}
-            )
-            st.plotly_chart(fig_nw, use_container_width=True)
-            
-            # Show net worth table
-            st.dataframe(nw_df.sort_values('Date', ascending=False), use_container_width=True)
+        with stage("net_worth_chart"):
+            series = st.session_state.net_worth_data
+            if series:
+                nw_resolution = st.radio("Net Worth Resolution", list(NET_WORTH_RESOLUTIONS), horizontal=True)
+                freq = NET_WORTH_RESOLUTIONS[nw_resolution]
+                # Every update gives the series a new version, so stale charts are never reused
+                nw_key = ('net_worth', series.version, freq)
+                fig_nw = memoized(nw_key + ('chart',), lambda: net_worth_figure(series, freq))
+                st.plotly_chart(fig_nw, use_container_width=True)
+                
+                # Entries newest first, or each period's balance beside the transactions' cash flow
+                if freq is None:
+                    nw_table = memoized(nw_key + ('table',), lambda: series.to_frame().iloc[::-1])
+                else:
+                    nw_table = memoized(
+                        nw_key + ('cash_flow', st.session_state.dataset_key),
+                        lambda: net_worth_cash_flow(series, rollup, freq).iloc[::-1].reset_index()
+                    )
+                st.dataframe(nw_table, use_container_width=True)
         
         # Export functionality
         st.subheader("💾 Export Data")
         col1, col2 = st.columns(2)
         
         with col1:
+            report_format = st.selectbox("Report format", list(REPORT_FORMATS))
             if st.button("📊 Export Summary Report"):
-                report = f"""
-Personal Finance Summary Report
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-=== KEY METRICS ===
-Total Income: ${metrics['total_income']:,.2f}
-Total Expenses: ${metrics['total_expenses']:,.2f}
-Net Income: ${metrics['net_income']:,.2f}
-Savings Rate: {savings_rate:.1f}%
-
-=== TOP EXPENSE CATEGORIES ===
-"""
-                if not expenses_df.empty:
-                    for cat, amount in expense_by_category.sort_values(ascending=False).head().items():
-                        report += f"{cat}: ${amount:,.2f}\n"
+                extension, mime = REPORT_FORMATS[report_format]
+                if report_format == "JSON":
+                    report = summary_json(metrics, rollup, start_date, end_date)
+                else:
+                    report = summary_report(metrics, expense_breakdown(rollup, start_date, end_date))
                 
                 st.download_button(
                     label="📄 Download Report",
                     data=report,
-                    file_name=f"finance_report_{datetime.now().strftime('%Y%m%d')}.txt",
-                    mime="text/plain"
+                    file_name=f"finance_report_{datetime.now().strftime('%Y%m%d')}.{extension}",
+                    mime=mime
                 )
         
         with col2:
-            # Export processed transactions
-            csv_buffer = io.StringIO()
-            df_filtered.to_csv(csv_buffer, index=False)
+            # Export processed transactions, serialized in chunks only when asked for
+            export_format = st.selectbox("Transactions format", list(TRANSACTION_EXPORTS))
+            fmt = TRANSACTION_EXPORTS[export_format]
+            export_key = view_key + ('transactions', fmt)
+            export_data = get_figure_cache().get(export_key)
+            if export_data is None and st.button("📦 Prepare Transactions Export"):
+                try:
+                    with st.spinner("Preparing export..."), stage("export"):
+                        export_data = memoized(export_key, lambda: export_transactions(df_filtered, fmt))
+                except ImportError as e:
+                    st.error(f"Error preparing export: {str(e)}")
             
-            st.download_button(
-                label="📊 Download Transactions CSV",
-                data=csv_buffer.getvalue(),
-                file_name=f"transactions_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv"
-            )
+            if export_data is not None:
+                extension, mime = EXPORT_FORMATS[fmt]
+                st.download_button(
+                    label=f"📊 Download Transactions {export_format}",
+                    data=export_data,
+                    file_name=f"transactions_{datetime.now().strftime('%Y%m%d')}.{extension}",
+                    mime=mime
+                )
     
     else:
         # Welcome screen
@@ -538,6 +911,13 @@ Savings Rate: {savings_rate:.1f}%
         4. Track your net worth over time
         5. Export reports for record keeping
         """)
+    
+    # Stage timings of this rerun, tagged with the dataset size
+    dataset = st.session_state.dataset
+    render_debug_panel(finish_profile(
+        rows=0 if dataset is None else dataset['rows'],
+        dataset=None if st.session_state.dataset_key is None else st.session_state.dataset_key[0]
+    ))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
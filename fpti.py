@@ -1,6 +1,43 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+# Plotly and finance_core (and with it pandas) are imported when a portfolio
+# is first analyzed or a sweep is run, so the page renders without loading them
+
+# Scenario sweep choices: keys of finance_core.interest.COMPOUNDING_FREQUENCIES
+# and the grid metric shown for each label
+COMPOUNDING_OPTIONS = ["Annually", "Semi-annually", "Quarterly", "Monthly", "Daily"]
+SWEEP_METRICS = {
+    "Compound Interest (₹)": 'compound_interest',
+    "Simple Interest (₹)": 'simple_interest',
+    "Loan Payment per Period (₹)": 'payment',
+    "Total Loan Interest (₹)": 'total_interest'
+}
+# Path counts offered for Monte Carlo projections
+PROJECTION_PATHS = [10_000, 100_000, 1_000_000]
+# Slices drawn in the allocation pie; smaller positions are merged into one
+PIE_MAX_SLICES = 20
+# Largest heatmap sent to the browser per axis, and the summary table size
+HEATMAP_MAX_CELLS = 200
+SWEEP_TABLE_CELLS = 12
+
+def grid_positions(axis, limit):
+    """Positions of at most limit evenly spaced, distinct values of a sorted sweep axis"""
+    positions = sorted(set(round(k * (len(axis) - 1) / max(limit - 1, 1)) for k in range(min(len(axis), limit))))
+    return [p for i, p in enumerate(positions) if i == 0 or axis[p] != axis[positions[i - 1]]]
+
+def load_holdings(input_mode, asset_data, holdings_file, holdings_text):
+    """Holdings entered in the analyzer tab, or None (with a warning) when nothing was given"""
+    from finance_core import read_holdings
+
+    if input_mode == "Enter Assets":
+        return asset_data
+    if holdings_file is not None:
+        holdings_file.seek(0)
+        return read_holdings(holdings_file)
+    if (holdings_text or "").strip():
+        return read_holdings(holdings_text)
+    st.warning("Upload a holdings CSV or paste a table to analyze")
+    return None
 
 # Page config
 st.set_page_config(
@@ -23,7 +60,12 @@ st.markdown("""
 st.markdown('<h1 class="main-header">💰 Finance Tools Dashboard</h1>', unsafe_allow_html=True)
 
 # Tabs
-tab1, tab2 = st.tabs(["💵 Simple Interest Calculator", "📊 Investment Diversification Analyzer"])
+tab1, tab2, tab3, tab4 = st.tabs([
+    "💵 Simple Interest Calculator",
+    "📊 Investment Diversification Analyzer",
+    "🧮 Scenario Sweep",
+    "🔮 Projection"
+])
 
 # ---------------------- Simple Interest ----------------------
 with tab1:
@@ -47,44 +89,239 @@ with tab1:
 with tab2:
     st.subheader("Advanced Investment Diversification Analyzer")
 
-    num_assets = st.number_input("Number of Assets", min_value=1, step=1, value=3)
-    
+    input_mode = st.radio("Holdings Input", ["Enter Assets", "Bulk Import"], horizontal=True)
+
     asset_data = []
-    for i in range(int(num_assets)):
-        st.markdown(f"### Asset {i+1}")
-        col1, col2 = st.columns(2)
-        with col1:
-            name = st.text_input(f"Asset Name {i+1}", key=f"name_{i}")
-        with col2:
-            value = st.number_input(f"Asset Value (₹) {i+1}", min_value=0.0, step=100.0, key=f"value_{i}")
-        asset_data.append({"Name": name, "Value": value})
+    holdings_file = holdings_text = None
+    if input_mode == "Enter Assets":
+        num_assets = st.number_input("Number of Assets", min_value=1, step=1, value=3)
+        
+        for i in range(int(num_assets)):
+            st.markdown(f"### Asset {i+1}")
+            col1, col2 = st.columns(2)
+            with col1:
+                name = st.text_input(f"Asset Name {i+1}", key=f"name_{i}")
+            with col2:
+                value = st.number_input(f"Asset Value (₹) {i+1}", min_value=0.0, step=100.0, key=f"value_{i}")
+            asset_data.append({"Name": name, "Value": value})
+    else:
+        holdings_file = st.file_uploader(
+            "Holdings CSV",
+            type=['csv', 'tsv', 'txt'],
+            help="One row per position with Name and Value columns, and optionally Sector and Asset Class"
+        )
+        holdings_text = st.text_area(
+            "Or paste a holdings table",
+            height=150,
+            placeholder="Name,Value,Sector,Asset Class\nAcme Corp,25000,Technology,Equity"
+        )
     
     threshold = st.slider("Alert if any asset exceeds (%) of portfolio", min_value=1, max_value=100, value=20)
 
     if st.button("Analyze Portfolio"):
-        df = pd.DataFrame(asset_data)
-        df['Percentage'] = (df['Value'] / df['Value'].sum()) * 100
+        import pandas as pd
+        import plotly.express as px
+        from finance_core import analyze_holdings
+
+        analysis = None
+        try:
+            holdings = load_holdings(input_mode, asset_data, holdings_file, holdings_text)
+            if holdings is not None:
+                analysis = analyze_holdings(holdings, threshold)
+        except Exception as e:
+            st.error(f"Error reading holdings: {str(e)}")
+
+        if analysis is not None:
+            df = analysis['allocation']
+            concentration = analysis['concentration']
+
+            # Alert if exceeds threshold
+            over_threshold = analysis['over_threshold']
+
+            # Display summary
+            st.subheader("Portfolio Summary")
+            st.dataframe(df.sort_values('Percentage', ascending=False).reset_index(drop=True))
+
+            # Concentration
+            st.subheader("Concentration")
+            metric_cols = st.columns(3 + len(concentration['top_share']))
+            metric_cols[0].metric("Holdings", f"{len(df):,}")
+            metric_cols[1].metric("HHI", f"{concentration['hhi']:,.0f}", help="Sum of squared percentage shares, 0-10,000")
+            metric_cols[2].metric("Effective Holdings", f"{concentration['effective_holdings']:,.1f}")
+            for col, (n, share) in zip(metric_cols[3:], concentration['top_share'].items()):
+                col.metric(f"Top {n} Share", f"{share:.1f}%")
+
+            # Pie chart (smallest positions merged so large portfolios stay readable)
+            ranked = df.sort_values('Value', ascending=False)
+            if len(ranked) > PIE_MAX_SLICES:
+                rest = ranked.iloc[PIE_MAX_SLICES - 1:]
+                ranked = pd.concat([
+                    ranked.iloc[:PIE_MAX_SLICES - 1],
+                    pd.DataFrame({'Name': [f"Other ({len(rest):,} assets)"], 'Value': [rest['Value'].sum()]})
+                ], ignore_index=True)
+            fig = px.pie(ranked, names='Name', values='Value', title="Portfolio Allocation", color_discrete_sequence=px.colors.qualitative.Set3)
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Sector and asset class rollups
+            for column, rollup in analysis['rollups'].items():
+                label = column.replace('_', ' ')
+                st.subheader(f"Allocation by {label}")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.dataframe(rollup, hide_index=True, use_container_width=True)
+                with col2:
+                    fig = px.bar(rollup, x=column, y='Percentage', title=f"Share by {label} (%)", labels={column: label})
+                    st.plotly_chart(fig, use_container_width=True)
+
+            # Alerts
+            alerts = [
+                f'<div class="alert-card">Asset **{name}** is **{share:.2f}%** of portfolio (> {threshold}%)</div>'
+                for name, share in zip(over_threshold['Name'], over_threshold['Percentage'])
+            ]
+            for column, groups in analysis['groups_over_threshold'].items():
+                alerts += [
+                    f'<div class="alert-card">{column.replace("_", " ")} **{name}** is **{share:.2f}%** of portfolio (> {threshold}%)</div>'
+                    for name, share in zip(groups[column], groups['Percentage'])
+                ]
+            if alerts:
+                st.subheader("⚠️ Assets Exceeding Threshold")
+                st.markdown("\n".join(alerts), unsafe_allow_html=True)
+            else:
+                st.markdown(f'<div class="success-card">All assets are within the defined threshold ✅</div>', unsafe_allow_html=True)
 
-        # Alert if exceeds threshold
-        over_threshold = df[df['Percentage'] > threshold]
+            # Diversification score
+            st.subheader("Diversification Score")
+            diversification_score = analysis['diversification_score']
+            st.metric("Diversification Score", f"{diversification_score:.1f}%")
 
-        # Display summary
-        st.subheader("Portfolio Summary")
-        st.dataframe(df.sort_values('Percentage', ascending=False).reset_index(drop=True))
+# ---------------------- Scenario Sweep ----------------------
+with tab3:
+    st.subheader("Interest Scenario Sweep")
 
-        # Pie chart
-        fig = px.pie(df, names='Name', values='Value', title="Portfolio Allocation", color_discrete_sequence=px.colors.qualitative.Set3)
+    col1, col2 = st.columns(2)
+    with col1:
+        sweep_principal = st.number_input("Principal Amount (₹)", min_value=1.0, step=1000.0, value=100000.0, key="sweep_principal")
+        rate_range = st.slider("Annual Interest Rate Range (%)", min_value=0.0, max_value=30.0, value=(1.0, 15.0), step=0.1)
+        term_range = st.slider("Term Range (Years)", min_value=1, max_value=40, value=(1, 30))
+    with col2:
+        compounding = st.selectbox("Compounding / Payments", COMPOUNDING_OPTIONS, index=3)
+        grid_points = st.number_input("Scenarios per Axis", min_value=2, max_value=1000, step=10, value=200)
+        metric_label = st.selectbox("Heatmap Metric", list(SWEEP_METRICS))
+
+    st.markdown("#### Amortization Schedule")
+    col1, col2 = st.columns(2)
+    with col1:
+        schedule_rate = st.number_input("Loan Rate (%)", min_value=0.0, max_value=100.0, step=0.1, value=8.0)
+    with col2:
+        schedule_years = st.number_input("Loan Term (Years)", min_value=1, max_value=40, step=1, value=20)
+
+    if st.button("Run Scenario Sweep"):
+        import numpy as np
+        import pandas as pd
+        import plotly.express as px
+        from finance_core import COMPOUNDING_FREQUENCIES, amortization_table, scenario_grid
+
+        periods_per_year = COMPOUNDING_FREQUENCIES[compounding]
+        rates = np.linspace(rate_range[0], rate_range[1], int(grid_points))
+        years = np.linspace(term_range[0], term_range[1], int(grid_points))
+        grid = scenario_grid(sweep_principal, rates, years, periods_per_year)
+        values = grid[SWEEP_METRICS[metric_label]][0, :, :, 0]
+
+        # Heatmap (every scenario is computed; only a strided subset is drawn)
+        rows, cols = grid_positions(rates, HEATMAP_MAX_CELLS), grid_positions(years, HEATMAP_MAX_CELLS)
+        fig = px.imshow(
+            values[np.ix_(rows, cols)],
+            x=years[cols],
+            y=rates[rows],
+            origin='lower',
+            aspect='auto',
+            color_continuous_scale='Viridis',
+            labels={'x': 'Term (Years)', 'y': 'Rate (%)', 'color': metric_label},
+            title=f"{metric_label} across {values.size:,} scenarios"
+        )
         st.plotly_chart(fig, use_container_width=True)
 
-        # Alerts
-        if not over_threshold.empty:
-            st.subheader("⚠️ Assets Exceeding Threshold")
-            for idx, row in over_threshold.iterrows():
-                st.markdown(f'<div class="alert-card">Asset **{row["Name"]}** is **{row["Percentage"]:.2f}%** of portfolio (> {threshold}%)</div>', unsafe_allow_html=True)
-        else:
-            st.markdown(f'<div class="success-card">All assets are within the defined threshold ✅</div>', unsafe_allow_html=True)
-
-        # Diversification score
-        st.subheader("Diversification Score")
-        diversification_score = 100 - df['Percentage'].max()
-        st.metric("Diversification Score", f"{diversification_score:.1f}%")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Scenarios", f"{values.size:,}")
+        with col2:
+            st.metric("Lowest", f"{np.nanmin(values):,.2f}")
+        with col3:
+            st.metric("Highest", f"{np.nanmax(values):,.2f}")
+
+        # Summary table on a coarse subset of the grid
+        rows, cols = grid_positions(rates, SWEEP_TABLE_CELLS), grid_positions(years, SWEEP_TABLE_CELLS)
+        table = pd.DataFrame(
+            values[np.ix_(rows, cols)],
+            index=pd.Index(rates[rows].round(2), name="Rate (%)"),
+            columns=[f"{year:.1f} yrs" for year in years[cols]]
+        )
+        st.dataframe(table.round(2), use_container_width=True)
+
+        schedule = amortization_table(sweep_principal, schedule_rate, schedule_years, periods_per_year)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Payment per Period (₹)", f"{schedule['Payment'].iloc[0]:,.2f}")
+        with col2:
+            st.metric("Total Interest (₹)", f"{schedule['Interest'].sum():,.2f}")
+        st.dataframe(schedule.round(2), hide_index=True, use_container_width=True)
+
+# ---------------------- Projection ----------------------
+with tab4:
+    st.subheader("Monte Carlo Portfolio Projection")
+    st.caption("Projects the holdings from the Diversification Analyzer tab. Expected Return and Volatility "
+               "columns (in %) of a bulk import are used per asset; the values below fill in the rest.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        projection_years = st.slider("Projection Horizon (Years)", min_value=1, max_value=50, value=30)
+        projection_paths = st.selectbox("Simulated Paths", PROJECTION_PATHS, index=1, format_func=lambda n: f"{n:,}")
+        monthly_contribution = st.number_input("Monthly Contribution (₹)", value=0.0, step=1000.0)
+        contribution_std = st.number_input("Contribution Variability (₹, std. dev.)", min_value=0.0, value=0.0, step=500.0)
+    with col2:
+        default_return = st.number_input("Expected Annual Return (%)", value=7.0, step=0.5)
+        default_volatility = st.number_input("Annual Volatility (%)", min_value=0.0, value=15.0, step=0.5)
+        correlation = st.slider("Correlation Between Assets", min_value=0.0, max_value=1.0, value=0.3, step=0.05)
+        goal_value = st.number_input("Goal Value (₹, 0 for none)", min_value=0.0, value=0.0, step=100000.0)
+
+    if st.button("Run Projection"):
+        from charts import projection_figure
+        from finance_core import monte_carlo_projection, portfolio_moments
+
+        try:
+            holdings = load_holdings(input_mode, asset_data, holdings_file, holdings_text)
+            if holdings is not None:
+                moments = portfolio_moments(holdings, correlation, default_return, default_volatility)
+                if not moments['value'] > 0:
+                    raise ValueError("holdings need a positive total value")
+                cash_flow = None
+                if monthly_contribution or contribution_std:
+                    cash_flow = {'income_mean': monthly_contribution, 'income_std': contribution_std, 'expense_mean': 0.0, 'expense_std': 0.0}
+                with st.spinner(f"Simulating {projection_paths:,} paths..."):
+                    projection = monte_carlo_projection(
+                        moments['value'], moments['expected_return'], moments['volatility'],
+                        years=projection_years, paths=projection_paths, cash_flow=cash_flow,
+                        goal=goal_value or None
+                    )
+                bands = projection['bands']
+
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Starting Value (₹)", f"{moments['value']:,.0f}")
+                with col2:
+                    st.metric("Expected Return", f"{moments['expected_return']:.2f}%")
+                with col3:
+                    st.metric("Volatility", f"{moments['volatility']:.2f}%")
+                with col4:
+                    st.metric("Median Final Value (₹)", f"{projection['final']['P50']:,.0f}")
+
+                fig = projection_figure(bands, f"Projected Portfolio Value ({projection['paths']:,} paths)", currency="₹")
+                st.plotly_chart(fig, use_container_width=True)
+
+                if projection['goal_probability'] is not None:
+                    st.metric("Chance of Reaching Goal", f"{projection['goal_probability'][-1]:.1%}")
+                yearly = bands[bands.index % 12 == 0].rename(index=lambda month: month // 12).rename_axis("Year")
+                st.dataframe(yearly.round(0), use_container_width=True)
+                st.caption(f"Simulated in {projection['seconds']:.2f}s")
+        except Exception as e:
+            st.error(f"Error running projection: {str(e)}")
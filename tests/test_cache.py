@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from finance_core import FrameCache, SharedFrameCache, build_dataset, dataset_nbytes, generate_transactions, hash_index, process_transactions
+from finance_core import table
+from finance_core.table import table_index
+
+def _dataset():
+    return build_dataset(process_transactions(generate_transactions(years=1, seed=7)))
+
+def test_indexes_built_after_caching_are_counted():
+    cache = SharedFrameCache()
+    dataset = cache.get_or_build('sample', _dataset)
+    assert dataset.get('table_index') is None
+    stored = cache.total_bytes
+    assert stored == dataset_nbytes(dataset)
+    
+    table_index(dataset)
+    hash_index(dataset)
+    assert cache.total_bytes == dataset_nbytes(dataset) > stored
+
+def test_shared_indexes_are_built_once_and_read_only(monkeypatch):
+    dataset = SharedFrameCache().get_or_build('sample', _dataset)
+    calls = []
+    build = table._build_table_index
+    
+    def slow_build(dataset):
+        calls.append(1)
+        time.sleep(0.05)
+        return build(dataset)
+    
+    monkeypatch.setattr(table, '_build_table_index', slow_build)
+    indexes = []
+    threads = [threading.Thread(target=lambda: indexes.append(table_index(dataset))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(index is indexes[0] for index in indexes)
+    
+    with pytest.raises(ValueError):
+        indexes[0]['type_codes'][0] = 0
+    with pytest.raises(ValueError):
+        hash_index(dataset)[0] = 0
+    with pytest.raises(ValueError):
+        dataset['rollup']['amount'][0] = 0
+
+def test_cache_evicts_least_recently_used_over_budget():
+    first, second = _dataset(), _dataset()
+    cache = FrameCache(max_bytes=dataset_nbytes(first) + dataset_nbytes(second) // 2)
+    cache.put('first', first)
+    cache.put('second', second)
+    assert 'first' not in cache and 'second' in cache
+    assert cache.total_bytes == dataset_nbytes(second)
+
+def test_cache_evicts_once_indexes_push_it_over_budget():
+    first, second = _dataset(), _dataset()
+    cache = FrameCache(max_bytes=dataset_nbytes(first) + dataset_nbytes(second) + 1024)
+    cache.put('first', first)
+    cache.put('second', second)
+    table_index(first)
+    cache.put('second', second)
+    assert 'first' not in cache and 'second' in cache
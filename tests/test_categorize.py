@@ -0,0 +1,30 @@
+import numpy as np
+
+from finance_core import EXPENSE_RULES, INCOME_RULES, categorize_transaction, categorize_transactions
+
+def _descriptions():
+    keywords = [word for words, _ in INCOME_RULES + EXPENSE_RULES for word in words]
+    rng = np.random.default_rng(5)
+    mixed = [f"{a.upper()} then {b}" for a, b in zip(rng.choice(keywords, 50), rng.choice(keywords, 50))]
+    return keywords + [word.title() + ' #123' for word in keywords] + mixed + ['', 'Transfer to savings', 'ATM']
+
+def test_vectorized_matches_row_by_row():
+    descriptions = _descriptions() * 2
+    amounts = np.where(np.arange(len(descriptions)) % 3 == 0, 250.0, -42.5)
+    amounts[::7] = 0.0
+    categories, types = categorize_transactions(descriptions, amounts)
+    expected = [categorize_transaction(d, a) for d, a in zip(descriptions, amounts)]
+    assert list(zip(categories, types)) == expected
+
+def test_repeated_calls_match():
+    # The second call answers from the description memo
+    descriptions = _descriptions()
+    amounts = np.full(len(descriptions), -10.0)
+    first = categorize_transactions(descriptions, amounts)
+    second = categorize_transactions(descriptions, amounts)
+    assert [list(values) for values in first] == [list(values) for values in second]
+
+def test_missing_descriptions_are_uncategorized():
+    categories, types = categorize_transactions([None, np.nan], [-5.0, 5.0])
+    assert list(categories) == ['Other', 'Other Income']
+    assert list(types) == ['Expense', 'Income']
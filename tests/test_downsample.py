@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_core import downsample, lttb_indices, minmax_indices
+
+def _series(n=10_000, seed=3):
+    rng = np.random.default_rng(seed)
+    x = pd.date_range('2020-01-01', periods=n, freq='h').to_numpy()
+    y = np.cumsum(rng.standard_normal(n))
+    # A single-point spike and dip that a chart must still show
+    y[n * 2 // 9] += 500
+    y[n * 7 // 9] -= 500
+    return x, y
+
+@pytest.mark.parametrize('n_out', [10, 101, 1_000])
+def test_lttb_keeps_endpoints_and_spikes_within_budget(n_out):
+    x, y = _series()
+    kept = lttb_indices(x, y, n_out)
+    assert len(kept) == n_out
+    assert kept[0] == 0 and kept[-1] == len(y) - 1
+    assert np.all(np.diff(kept) > 0)
+    assert {len(y) * 2 // 9, len(y) * 7 // 9} <= set(kept.tolist())
+
+@pytest.mark.parametrize('n_out', [10, 101, 1_000])
+def test_minmax_keeps_endpoints_and_every_buckets_extremes(n_out):
+    x, y = _series()
+    kept = minmax_indices(y, n_out)
+    assert len(kept) <= n_out
+    assert kept[0] == 0 and kept[-1] == len(y) - 1
+    assert np.all(np.diff(kept) > 0)
+    assert {int(np.argmax(y)), int(np.argmin(y))} <= set(kept.tolist())
+    # Every kept point lies in the range of the original series, and the range is preserved
+    assert y[kept].max() == y.max() and y[kept].min() == y.min()
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_downsample_leaves_short_series_alone(method):
+    x, y = _series(90)
+    dx, dy = downsample(x, y, 100, method)
+    assert dx is x and dy is y
+    dx, dy = downsample(x, y, 20, method)
+    assert len(dy) <= 20 and dx[0] == x[0] and dx[-1] == x[-1]
@@ -0,0 +1,56 @@
+import gzip
+import io
+import json
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from finance_core import (build_dataset, calculate_metrics, expand_transactions, export_transactions,
+                          generate_transactions, process_transactions, rollup_metrics, summary_json)
+
+@pytest.fixture(scope='module')
+def dataset():
+    return build_dataset(process_transactions(generate_transactions(years=1, seed=9)))
+
+def _baseline_csv(df):
+    """The readable CSV the dashboard exported before exports were chunked"""
+    return expand_transactions(df).to_csv(index=False).encode('utf-8')
+
+@pytest.mark.parametrize('chunk_rows', [1, 37, 100_000])
+def test_chunked_csv_matches_one_shot_export(dataset, chunk_rows):
+    df = dataset['df'].iloc[:500]
+    assert export_transactions(df, 'csv', chunk_rows) == _baseline_csv(df)
+    assert gzip.decompress(export_transactions(df, 'csv.gz', chunk_rows)) == _baseline_csv(df)
+
+def test_parquet_export_has_the_csv_columns_and_rows(dataset):
+    pytest.importorskip('pyarrow')
+    df = dataset['df']
+    exported = pd.read_parquet(io.BytesIO(export_transactions(df, 'parquet', chunk_rows=1000)))
+    expected = pd.read_csv(io.BytesIO(_baseline_csv(df)))
+    assert list(exported.columns) == list(expected.columns)
+    assert len(exported) == len(expected)
+    assert exported['Amount'].sum() == pytest.approx(expected['Amount'].sum())
+    assert exported['Month_Year'].astype(str).tolist() == expected['Month_Year'].astype(str).tolist()
+
+def test_empty_export_keeps_the_header(dataset):
+    df = dataset['df'].iloc[:0]
+    assert export_transactions(df, 'csv') == _baseline_csv(df)
+    with pytest.raises(ValueError):
+        export_transactions(df, 'xlsx')
+
+def test_json_report_matches_the_rows(dataset):
+    df = dataset['df']
+    start, end = date(2024, 3, 1), date(2024, 5, 31)
+    metrics = rollup_metrics(dataset['rollup'], start, end)
+    report = json.loads(summary_json(metrics, dataset['rollup'], start, end, generated_at=datetime(2024, 6, 1, 9, 30)))
+    
+    rows = df[(df['Date'] >= pd.Timestamp(start)) & (df['Date'] < pd.Timestamp(end) + pd.Timedelta(days=1))]
+    expected = calculate_metrics(rows)
+    assert report['generated_at'] == '2024-06-01T09:30:00'
+    assert report['start_date'] == '2024-03-01' and report['end_date'] == '2024-05-31'
+    assert report['metrics'] == {name: round(float(value), 2) for name, value in expected.items()}
+    
+    expenses = rows[rows['Amount_Cents'] < 0].groupby('Category', observed=True)['Amount_Cents'].sum().abs() / 100
+    assert report['expenses_by_category'] == pytest.approx({str(name): round(value, 2) for name, value in expenses.items()})
+    assert [month['month'] for month in report['monthly']] == ['2024-03', '2024-04', '2024-05']
@@ -0,0 +1,112 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_core import append_transactions, build_dataset, hash_index, ingest_csv, process_transactions
+from finance_core.bench import synthetic_upload
+
+def _raw(rows):
+    return pd.DataFrame(rows, columns=['Date', 'Description', 'Amount'])
+
+BASE = [
+    ('2024-01-02', 'Grocery store', -40.0),
+    ('2024-01-05', 'Salary', 3000.0),
+    ('2024-02-01', 'Electric bill', -80.0),
+    ('2024-02-03', 'Grocery store', -35.5)
+]
+
+def test_append_skips_rows_already_in_the_dataset():
+    dataset = build_dataset(process_transactions(_raw(BASE)))
+    upload = _raw(BASE[2:] + [('2024-02-10', 'Netflix', -15.99), ('2024-03-01', 'Salary', 3000.0)])
+    appended, added, months = append_transactions(dataset, upload)
+    assert added == 2
+    assert months == {2024 * 12 + 1, 2024 * 12 + 2}
+    assert appended['rows'] == len(appended['df']) == 6
+    assert dataset['rows'] == 4 and len(dataset['df']) == 4
+
+def test_repeats_within_one_upload_are_kept():
+    dataset = build_dataset(process_transactions(_raw(BASE)))
+    coffee = ('2024-02-05', 'Cafe', -4.5)
+    appended, added, _ = append_transactions(dataset, _raw([coffee, coffee]))
+    assert added == 2
+    # Appending the same upload again adds nothing
+    again, added, months = append_transactions(appended, _raw([coffee, coffee]))
+    assert again is appended and added == 0 and months == set()
+
+def test_append_matches_building_from_all_rows():
+    dataset = build_dataset(process_transactions(_raw(BASE)))
+    # Rows older than the dataset's newest one are merged back into date order
+    late = [('2024-01-20', 'Pharmacy', -12.0), ('2024-02-03', 'Grocery store', -35.5), ('2024-04-01', 'Dividend', 25.0)]
+    appended, added, _ = append_transactions(dataset, _raw(late))
+    fresh = build_dataset(process_transactions(_raw(BASE + late[:1] + late[2:])))
+    assert added == 2
+    assert appended['df']['Date'].is_monotonic_increasing
+    pd.testing.assert_frame_equal(appended['daily'], fresh['daily'], check_dtype=False, check_categorical=False)
+    np.testing.assert_array_equal(appended['hash_index'], np.sort(fresh['df']['Txn_Hash'].to_numpy()))
+    np.testing.assert_array_equal(hash_index(appended), hash_index(fresh))
+    assert appended['df']['Amount_Cents'].sum() == fresh['df']['Amount_Cents'].sum()
+
+@pytest.fixture(scope='module')
+def statement(tmp_path_factory):
+    path = tmp_path_factory.mktemp('ingest') / 'statement.csv'
+    synthetic_upload(150_000).to_csv(path, index=False)
+    return path
+
+def _ingest(source, budget_mb, engine):
+    return ingest_csv(source, memory_budget_mb=budget_mb, engine=engine)
+
+@pytest.mark.parametrize('engine', ['pyarrow', 'pandas'])
+def test_retained_rows_fit_the_memory_budget(statement, engine):
+    dataset = _ingest(statement, 4, engine)
+    assert dataset['truncated']
+    assert dataset['rows'] == 150_000 and 0 < len(dataset['df']) < 150_000
+    assert dataset['df'].memory_usage(deep=True).sum() <= 4 * 1024 * 1024
+
+@pytest.mark.parametrize('engine', ['pyarrow', 'pandas'])
+def test_aggregates_are_the_same_for_every_budget(statement, engine):
+    full = _ingest(statement, 1024, engine)
+    assert not full['truncated'] and len(full['df']) == full['rows'] == 150_000
+    for budget_mb in (1, 4):
+        dataset = _ingest(statement, budget_mb, engine)
+        assert dataset['rows'] == full['rows']
+        pd.testing.assert_frame_equal(dataset['daily'], full['daily'])
+        np.testing.assert_array_equal(dataset['hash_index'], full['hash_index'])
+        # The retained rows are the start of the file
+        pd.testing.assert_frame_equal(dataset['df'], full['df'].iloc[:len(dataset['df'])], check_dtype=False, check_categorical=False)
+
+def test_engines_agree(statement):
+    arrow, pandas = _ingest(statement, 1024, 'pyarrow'), _ingest(statement, 1024, 'pandas')
+    pd.testing.assert_frame_equal(arrow['daily'], pandas['daily'], check_dtype=False, check_categorical=False)
+    np.testing.assert_array_equal(arrow['hash_index'], pandas['hash_index'])
+
+BLANK_CATEGORIES = b"""Date,Description,Amount,Category,Type
+2024-01-02,Walmart grocery,-50,,
+2024-01-03,Salary,2500,,
+2024-01-04,Gift for Sam,-20,Mine,Expense
+2024-01-05,Coffee,-4.5,Mine,
+"""
+
+@pytest.mark.parametrize('engine', ['pyarrow', 'pandas'])
+def test_blank_categories_are_filled(engine):
+    df = ingest_csv(io.BytesIO(BLANK_CATEGORIES), engine=engine)['df']
+    assert df['Category'].astype(str).tolist() == ['Groceries', 'Income', 'Mine', 'Mine']
+    assert df['Type'].astype(str).tolist() == ['Expense', 'Income', 'Expense', 'Expense']
+
+def test_given_categories_survive_chunking(tmp_path):
+    # One blank Category among many given ones only categorizes that row
+    rows = 200_000
+    frame = pd.DataFrame({
+        'Date': pd.date_range('2020-01-01', periods=rows, freq='10min').strftime('%Y-%m-%d'),
+        'Description': 'Walmart grocery',
+        'Amount': -10.0,
+        'Category': 'Mine'
+    })
+    frame.loc[rows - 1, 'Category'] = None
+    path = tmp_path / 'mine.csv'
+    frame.to_csv(path, index=False)
+    for budget_mb in (1, 1024):
+        daily = ingest_csv(path, memory_budget_mb=budget_mb)['daily']
+        totals = daily.groupby('Category', observed=True)['Count'].sum()
+        assert totals.to_dict() == {'Groceries': 1, 'Mine': rows - 1}
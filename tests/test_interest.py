@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from finance_core import amortization_table, scenario_grid, scenario_table
+
+PRINCIPALS = [10_000.0, 250_000.0]
+RATES = [0.0, 3.5, 7.0]
+YEARS = [1, 15, 30]
+FREQUENCIES = [1, 4, 12]
+
+def _payment(principal, rate, years, n):
+    """Textbook level payment P * i / (1 - (1 + i)^-N)"""
+    i, periods = rate / 100 / n, round(years * n)
+    return principal / periods if i == 0 else principal * i / (1 - (1 + i) ** -periods)
+
+def test_scenario_grid_matches_closed_forms():
+    grid = scenario_grid(PRINCIPALS, RATES, YEARS, FREQUENCIES)
+    assert grid['payment'].shape == (2, 3, 3, 3)
+    for a, principal in enumerate(PRINCIPALS):
+        for b, rate in enumerate(RATES):
+            for c, years in enumerate(YEARS):
+                for d, n in enumerate(FREQUENCIES):
+                    payment = _payment(principal, rate, years, n)
+                    assert grid['simple_interest'][a, b, c, d] == pytest.approx(principal * rate / 100 * years)
+                    assert grid['compound_interest'][a, b, c, d] == pytest.approx(principal * ((1 + rate / 100 / n) ** (n * years) - 1))
+                    assert grid['payment'][a, b, c, d] == pytest.approx(payment)
+                    assert grid['total_interest'][a, b, c, d] == pytest.approx(payment * years * n - principal, abs=1e-6)
+
+def test_scenario_table_has_one_row_per_scenario():
+    table = scenario_table(scenario_grid(PRINCIPALS, RATES, YEARS, FREQUENCIES))
+    assert len(table) == 2 * 3 * 3 * 3
+    row = table[(table['Principal'] == 250_000) & (table['Rate'] == 7.0) & (table['Years'] == 30) & (table['Periods_Per_Year'] == 12)]
+    assert row['Payment'].item() == pytest.approx(_payment(250_000, 7.0, 30, 12))
+
+@pytest.mark.parametrize('principal, rate, years, n', [(200_000, 6.0, 30, 12), (5_000, 0.0, 2, 12), (10_000, 8.0, 5, 4)])
+def test_amortization_table_repays_the_loan(principal, rate, years, n):
+    table = amortization_table(principal, rate, years, n)
+    payment = _payment(principal, rate, years, n)
+    i = rate / 100 / n
+    assert len(table) == years * n
+    np.testing.assert_allclose(table['Payment'], payment)
+    assert table['Interest'].iloc[0] == pytest.approx(principal * i)
+    assert table['Principal'].sum() == pytest.approx(principal)
+    assert table['Interest'].sum() == pytest.approx(payment * years * n - principal, abs=1e-6)
+    # Balance after k payments: P(1+i)^k - A((1+i)^k - 1)/i
+    k = 12
+    growth = (1 + i) ** k
+    balance = principal * growth - payment * ((growth - 1) / i if i else k)
+    assert table['Balance'].iloc[k - 1] == pytest.approx(balance)
+    assert table['Balance'].iloc[-1] == 0.0
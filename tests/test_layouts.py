@@ -0,0 +1,65 @@
+import io
+
+import pandas as pd
+import pytest
+
+from finance_core.ingest import ingest_csv, iter_csv_chunks, resolve_layout
+from finance_core.layouts import BANK_LAYOUTS, detect_layout, normalize_transactions
+
+@pytest.mark.parametrize('columns, expected', [
+    (['Date', 'Description', 'Amount'], 'Standard'),
+    (['Date', 'Description', 'Amount', 'Category', 'Type'], 'Standard'),
+    (['Date', 'Description', 'Card Member', 'Account #', 'Amount'], 'American Express'),
+    (['Details', 'Posting Date', 'Description', 'Amount', 'Type', 'Balance'], 'Chase checking'),
+    (['Transaction Date', 'Post Date', 'Description', 'Category', 'Type', 'Amount', 'Memo'], 'Chase card'),
+    (['Transaction Date', 'Posted Date', 'Card No.', 'Description', 'Category', 'Debit', 'Credit'], 'Capital One'),
+    (['Date', 'Description', 'Debit', 'Credit'], 'Generic debit/credit'),
+    (['Date', 'Narration', 'Chq./Ref.No.', 'Value Dt', 'Withdrawal Amt.', 'Deposit Amt.', 'Closing Balance'], 'HDFC Bank'),
+    (['When', 'What', 'How much'], None)
+])
+def test_detect_layout(columns, expected):
+    assert detect_layout(columns) == expected
+
+def test_detect_layout_rejects_equally_specific_matches():
+    # Both Capital One and the generic debit/credit layout need four columns
+    assert detect_layout(['Date', 'Transaction Date', 'Description', 'Debit', 'Credit']) is None
+    with pytest.raises(ValueError, match='ambiguous'):
+        resolve_layout(io.BytesIO(b'Date,Transaction Date,Description,Debit,Credit\n'), 'auto')
+
+def test_parenthesized_amounts_are_negative():
+    frame = pd.DataFrame({
+        'Date': ['01/05/2024', '01/06/2024', '01/07/2024'],
+        'Description': ['Refund', 'Dinner', 'Flight'],
+        'Card Member': ['A B'] * 3,
+        'Amount': ['(100.00)', '$1,234.50', '($2,000.00)']
+    })
+    normalized = normalize_transactions(frame, 'American Express')
+    # American Express shows charges as positive amounts
+    assert normalized['Amount'].tolist() == [100.0, -1234.5, 2000.0]
+
+@pytest.mark.parametrize('engine', ['pandas', 'pyarrow'])
+def test_csv_engines_parse_amounts_alike(engine):
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+    text = b'Transaction Date,Description,Debit,Credit\n2024-01-05,Coffee,"(4.50)",\n2024-01-06,Salary,,"$3,000.00"\n'
+    chunks = list(iter_csv_chunks(io.BytesIO(text), 1 << 20, engine=engine, layout=BANK_LAYOUTS['Capital One']))
+    assert pd.concat(chunks)['Amount'].tolist() == [4.5, 3000.0]
+
+MALFORMED = b'Date,Description,Amount,Card Member\n01/05/2024,Dinner,42.00,A B\n01/06/2024,Refund,100.00-,A B\n01/07/2024,Taxi,-,A B\n'
+
+@pytest.mark.parametrize('engine', ['pandas', 'pyarrow'])
+def test_csv_engines_reject_malformed_amounts_alike(engine, tmp_path):
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+    path = tmp_path / 'amex.csv'
+    path.write_bytes(MALFORMED)
+    with pytest.raises(ValueError, match=r"amex.csv: Unreadable amount '100.00-' in row 2$"):
+        ingest_csv(path, engine=engine, layout='auto')
+
+@pytest.mark.parametrize('engine', ['pandas', 'pyarrow'])
+def test_amounts_without_digits_are_missing(engine):
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+    text = b'Date,Description,Debit,Credit\n2024-01-05,Coffee,4.50,-\n2024-01-06,Salary,$,"3,000"\n'
+    chunks = list(iter_csv_chunks(io.BytesIO(text), 1 << 20, engine=engine, layout=BANK_LAYOUTS['Generic debit/credit']))
+    assert pd.concat(chunks)['Amount'].tolist() == [-4.5, 3000.0]
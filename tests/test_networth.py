@@ -0,0 +1,70 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_core import (NetWorthSeries, build_dataset, generate_transactions, load_net_worth, process_transactions,
+                          read_net_worth, save_dataset, save_net_worth)
+
+def _snapshots():
+    return [
+        ('2024-01-31', 1000.0, 200.0),
+        ('2024-03-31', 1500.0, 100.0),
+        ('2024-02-29', 1200.0, 150.0),
+        ('2024-03-31', 1600.0, 100.0)
+    ]
+
+def test_appends_stay_sorted_past_the_initial_capacity():
+    series = NetWorthSeries(capacity=2)
+    versions = {series.version}
+    for day, assets, liabilities in _snapshots():
+        series.append(day, assets, liabilities)
+        versions.add(series.version)
+    assert len(series) == 4 and len(versions) == 5
+    assert series.dates.astype(str).tolist() == ['2024-01-31', '2024-02-29', '2024-03-31', '2024-03-31']
+    # Snapshots sharing a date keep the order they were added in
+    np.testing.assert_array_equal(series.net_worth, [800.0, 1050.0, 1400.0, 1500.0])
+    assert series.latest() == {'Date': date(2024, 3, 31), 'Assets': 1600.0, 'Liabilities': 100.0, 'Net_Worth': 1500.0}
+
+def test_extend_matches_appending_one_at_a_time():
+    days, assets, liabilities = zip(*_snapshots())
+    one_by_one = NetWorthSeries()
+    for snapshot in _snapshots():
+        one_by_one.append(*snapshot)
+    pd.testing.assert_frame_equal(NetWorthSeries().extend(days, assets, liabilities).to_frame(), one_by_one.to_frame())
+
+def test_frame_and_records_round_trip():
+    series = NetWorthSeries()
+    for snapshot in _snapshots():
+        series.append(*snapshot)
+    pd.testing.assert_frame_equal(NetWorthSeries.from_frame(series.to_frame()).to_frame(), series.to_frame())
+    pd.testing.assert_frame_equal(NetWorthSeries.from_frame(series.records()).to_frame(), series.to_frame())
+    assert NetWorthSeries().latest() is None
+
+def test_saved_history_reloads(tmp_path):
+    pytest.importorskip('pyarrow')
+    root = str(tmp_path)
+    series = NetWorthSeries()
+    for snapshot in _snapshots()[:2]:
+        series.append(*snapshot)
+    save_dataset(build_dataset(process_transactions(generate_transactions(years=1, seed=1))), 'history', net_worth=series, root=root)
+    pd.testing.assert_frame_equal(load_net_worth('history', root=root).to_frame(), series.to_frame())
+    
+    # Snapshots appended after reloading are saved and reloaded too
+    reloaded = load_net_worth('history', root=root)
+    for snapshot in _snapshots()[2:]:
+        reloaded.append(*snapshot)
+    save_net_worth(reloaded, 'history', root=root)
+    assert load_net_worth('history', root=root).net_worth.tolist() == [800.0, 1050.0, 1400.0, 1500.0]
+
+def test_resample_interpolates_between_snapshots():
+    series = NetWorthSeries().extend(['2024-01-31', '2024-03-31'], [1000.0, 3000.0], [0.0, 0.0])
+    monthly = series.resample('M')
+    assert monthly.index.strftime('%Y-%m-%d').tolist() == ['2024-01-31', '2024-02-29', '2024-03-31']
+    assert monthly['Net_Worth'].iloc[1] == pytest.approx(1000.0 + 2000.0 * 29 / 60)
+    assert series.resample('M', 'ffill')['Net_Worth'].tolist() == [1000.0, 1000.0, 3000.0]
+
+def test_read_net_worth_splits_a_lone_balance_by_sign():
+    series = read_net_worth("Date,Balance\n2024-01-31,500\n2024-02-29,-250\n")
+    assert series.assets.tolist() == [500.0, 0.0] and series.liabilities.tolist() == [0.0, 250.0]
@@ -0,0 +1,30 @@
+import pytest
+
+from finance_core import read_holdings
+from finance_core.bench import synthetic_holdings
+
+def test_values_with_comma_decimals():
+    holdings = read_holdings("Name;Value\nFund A;€1.000,50\nFund B;€2.500.000,00\nCash;12,5\n")
+    assert holdings['Value'].tolist() == [1000.5, 2_500_000.0, 12.5]
+
+def test_values_with_point_decimals():
+    holdings = read_holdings('Symbol,Market Value\nAAA,"$1,000.50"\nBBB,"2,500"\nCCC,300\n')
+    assert holdings['Value'].tolist() == [1000.5, 2500.0, 300.0]
+
+def test_explicit_decimal_separator():
+    holdings = read_holdings("Name\tValue\nA\t1.000\nB\t2.000\n", decimal=',')
+    assert holdings['Value'].tolist() == [1000.0, 2000.0]
+
+def test_rows_without_value_are_dropped():
+    holdings = read_holdings("Name,Value\nA,100\nB,\n")
+    assert holdings['Name'].tolist() == ['A']
+
+@pytest.mark.parametrize('value', ['unknown', '12abc34', '"1,00.0"'])
+def test_unreadable_values_are_rejected(value):
+    with pytest.raises(ValueError, match='Unreadable'):
+        read_holdings(f"Name,Value\nA,100\nB,{value}\n")
+
+def test_generated_holdings_round_trip():
+    generated = synthetic_holdings(50, seed=1)
+    holdings = read_holdings(generated.to_csv(index=False))
+    assert holdings['Value'].round(2).tolist() == generated['Value'].round(2).tolist()
@@ -0,0 +1,58 @@
+import json
+import logging
+import threading
+
+import numpy as np
+import pytest
+
+from finance_core import finish_profile, size_bucket, stage, start_profile
+
+def test_stages_are_a_no_op_without_a_profile():
+    with stage('load'):
+        pass
+    assert finish_profile() is None
+
+def test_stages_are_recorded_in_order_with_tags(caplog):
+    caplog.set_level(logging.INFO, logger='finance_core.profile')
+    start_profile(session='abc')
+    with stage('load'):
+        pass
+    with pytest.raises(RuntimeError):
+        with stage('render'):
+            raise RuntimeError("chart failed")
+    record = finish_profile(rows=25_000, view='Trends')
+    
+    assert [s['stage'] for s in record['stages']] == ['load', 'render']
+    assert all(s['seconds'] >= 0 for s in record['stages'])
+    assert record['session'] == 'abc' and record['view'] == 'Trends'
+    assert record['size_bucket'] == '10k-100k'
+    assert record['total_seconds'] >= sum(s['seconds'] for s in record['stages'])
+    # One JSON line per rerun
+    assert json.loads(caplog.records[-1].getMessage())['stages'] == record['stages']
+    assert finish_profile() is None
+
+def test_traced_stages_report_peak_allocations():
+    start_profile(session='tracing', trace_memory=True)
+    with stage('allocate'):
+        block = np.ones(4 * 1024 * 1024)
+        del block
+    record = finish_profile()
+    assert record['stages'][0]['peak_mb'] >= 30
+    # Untraced runs of the same session turn tracing back off
+    start_profile(session='tracing')
+    with stage('idle'):
+        pass
+    assert 'peak_mb' not in finish_profile()['stages'][0]
+
+def test_profiles_are_per_thread():
+    start_profile(session='main')
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(finish_profile()))
+    thread.start()
+    thread.join()
+    assert seen == [None]
+    assert finish_profile()['session'] == 'main'
+
+@pytest.mark.parametrize('rows, label', [(0, '<10k'), (10_000, '10k-100k'), (999_999, '100k-1M'), (50_000_000, '10M+')])
+def test_size_bucket(rows, label):
+    assert size_bucket(rows) == label
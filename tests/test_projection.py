@@ -0,0 +1,29 @@
+import sys
+
+import numpy as np
+import pytest
+
+from finance_core import monte_carlo_projection
+from finance_core import projection
+
+def test_results_do_not_depend_on_workers():
+    serial = monte_carlo_projection(100_000, 7, 15, years=5, paths=30_000, chunk_paths=10_000, workers=1)
+    parallel = monte_carlo_projection(100_000, 7, 15, years=5, paths=30_000, chunk_paths=10_000, workers=2)
+    np.testing.assert_allclose(parallel['bands'].to_numpy(), serial['bands'].to_numpy(), rtol=1e-6)
+
+def test_process_pool_is_reused_across_projections():
+    monte_carlo_projection(100_000, 7, 15, years=1, paths=20_000, chunk_paths=10_000, workers=2)
+    pool = projection._pool
+    monte_carlo_projection(100_000, 7, 15, years=1, paths=20_000, chunk_paths=10_000, workers=2)
+    assert projection._pool is pool
+    assert pool._mp_context.get_start_method() in ('forkserver', 'spawn')
+
+def test_main_module_is_restored_after_starting_workers():
+    main = sys.modules['__main__']
+    monte_carlo_projection(100_000, 7, 15, years=1, paths=20_000, chunk_paths=10_000, workers=2)
+    assert sys.modules['__main__'] is main
+
+@pytest.mark.parametrize('paths', [0, -5])
+def test_paths_must_be_positive(paths):
+    with pytest.raises(ValueError):
+        monte_carlo_projection(100_000, 7, 15, years=1, paths=paths)
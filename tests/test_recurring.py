@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from finance_core import (RECURRING_COLUMNS, append_transactions, build_dataset, build_recurring_index,
+                          normalize_descriptions, process_transactions, recurring_transactions, update_recurring_index)
+
+def _raw():
+    rng = np.random.default_rng(3)
+    rows = []
+    for month in range(1, 13):
+        rows.append((f'2024-{month:02d}-05', f'NETFLIX.COM 866-579 #{1000 + month}', -15.99))
+    for day in pd.date_range('2024-01-01', periods=10, freq='7D'):
+        rows.append((day, 'City Gym', -10.0))
+    for day in pd.date_range('2024-01-12', '2024-12-31', freq='14D'):
+        rows.append((day, 'ACME Payroll', 2000.0))
+    for day in rng.choice(pd.date_range('2024-01-01', '2024-12-31'), size=40, replace=False):
+        rows.append((day, 'Corner Market', -round(float(rng.uniform(5, 120)), 2)))
+    raw = pd.DataFrame(rows, columns=['Date', 'Description', 'Amount'])
+    raw['Date'] = pd.to_datetime(raw['Date'])
+    return raw.sort_values('Date', kind='stable').reset_index(drop=True)
+
+def _found(raw):
+    table = recurring_transactions(build_dataset(process_transactions(raw.copy())))
+    return table.set_index(normalize_descriptions(table['Description']).to_numpy()).sort_index()
+
+def test_reference_numbers_are_ignored():
+    texts = normalize_descriptions(['NETFLIX.COM 866-579 #1234', 'Netflix.com 866-579 #9876', None])
+    assert texts.tolist() == ['netflix com', 'netflix com', '']
+
+def test_regular_charges_and_income_are_detected():
+    found = _found(_raw())
+    assert found.index.tolist() == ['acme payroll', 'city gym', 'netflix com']
+    assert found['Frequency'].to_dict() == {'acme payroll': 'Biweekly', 'city gym': 'Weekly', 'netflix com': 'Monthly'}
+    assert found['Type'].to_dict() == {'acme payroll': 'Income', 'city gym': 'Expense', 'netflix com': 'Expense'}
+    # The gym stopped in March, months before the newest transaction
+    assert found['Active'].to_dict() == {'acme payroll': True, 'city gym': False, 'netflix com': True}
+    assert found.loc['netflix com', 'Subscription'] and not found.loc['acme payroll', 'Subscription']
+    assert found.loc['netflix com', 'Occurrences'] == 12
+    assert np.isclose(found.loc['netflix com', 'Amount'], -15.99)
+    assert found.loc['netflix com', 'Next_Date'] == pd.Timestamp('2025-01-05')
+
+def test_stricter_regularity_filters_groups():
+    dataset = build_dataset(process_transactions(_raw()))
+    assert len(recurring_transactions(dataset, min_regularity=1.01)) == 0
+    noise = _raw()
+    noise = noise[noise['Description'] == 'Corner Market'].reset_index(drop=True)
+    assert recurring_transactions(build_dataset(process_transactions(noise))).columns.tolist() == RECURRING_COLUMNS
+
+def test_update_matches_a_full_rebuild():
+    processed = process_transactions(_raw())
+    split = len(processed) * 2 // 3
+    updated = update_recurring_index(build_recurring_index(processed.iloc[:split]), processed.iloc[split:])
+    rebuilt = build_recurring_index(processed)
+    # Group ids follow the order descriptions were first seen, which both paths share here
+    for name in ('group', 'day', 'cents'):
+        np.testing.assert_array_equal(updated[name], rebuilt[name])
+    assert updated['last_day'] == rebuilt['last_day']
+    pd.testing.assert_frame_equal(updated['stats'], rebuilt['stats'])
+
+def test_appended_dataset_matches_one_built_from_all_rows():
+    raw = _raw()
+    split = len(raw) // 2
+    dataset = build_dataset(process_transactions(raw.iloc[:split].copy()))
+    recurring_transactions(dataset)
+    appended, added, _ = append_transactions(dataset, raw.iloc[split:])
+    assert added == len(raw) - split and 'recurring_index' in appended
+    pd.testing.assert_frame_equal(recurring_transactions(appended), recurring_transactions(build_dataset(process_transactions(raw.copy()))))
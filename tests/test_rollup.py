@@ -0,0 +1,93 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_core import (DAYS_ORDER, build_dataset, build_rollup, daily_aggregates, expand_transactions,
+                          generate_transactions, merge_daily_aggregates, process_transactions, rollup_category_totals,
+                          rollup_day_of_week_mean, rollup_metrics, rollup_monthly, rollup_weekly, update_rollup)
+
+# (start, end) date filters; None is the whole history
+RANGES = [(None, None), (date(2024, 2, 10), date(2024, 5, 20)), (date(2024, 3, 1), date(2024, 3, 1))]
+
+@pytest.fixture(scope='module')
+def dataset():
+    return build_dataset(process_transactions(generate_transactions(years=1, accounts=2, seed=11)))
+
+def _filtered(dataset, start, end):
+    """Readable rows in the range, filtered the way the dashboard originally did"""
+    df = expand_transactions(dataset['df'])
+    if start is None:
+        return df
+    return df[(df['Date'].dt.date >= start) & (df['Date'].dt.date <= end)]
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_metrics_match_row_sums(dataset, start, end):
+    df = _filtered(dataset, start, end)
+    metrics = rollup_metrics(dataset['rollup'], start, end)
+    income = df.loc[df['Amount'] > 0, 'Amount'].sum()
+    expenses = abs(df.loc[df['Amount'] < 0, 'Amount'].sum())
+    months = df['Month_Year'].nunique() or 1
+    assert metrics['total_income'] == pytest.approx(income)
+    assert metrics['total_expenses'] == pytest.approx(expenses)
+    assert metrics['net_income'] == pytest.approx(income - expenses)
+    assert metrics['monthly_avg_income'] == pytest.approx(income / months)
+    assert metrics['monthly_avg_expenses'] == pytest.approx(expenses / months)
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_monthly_matches_groupby(dataset, start, end):
+    df = _filtered(dataset, start, end)
+    expected = df.groupby(['Month_Year', 'Type'], observed=True)['Amount'].sum().unstack(fill_value=0)
+    expected.columns = expected.columns.astype(str)
+    actual = rollup_monthly(dataset['rollup'], start, end)
+    pd.testing.assert_frame_equal(actual, expected, check_names=False, check_column_type=False)
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_category_totals_match_groupby(dataset, start, end):
+    df = _filtered(dataset, start, end)
+    expenses = df[df['Type'] == 'Expense']
+    expected = expenses.groupby('Category', observed=True)['Amount'].sum()
+    expected.index = expected.index.astype(str)
+    actual = rollup_category_totals(dataset['rollup'], 'Expense', start, end)
+    pd.testing.assert_series_equal(actual.sort_index(), expected.sort_index(), check_names=False, check_index_type=False)
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_weekly_matches_groupby(dataset, start, end):
+    df = _filtered(dataset, start, end)
+    expected = df[df['Type'] == 'Expense'].groupby('Week')['Amount'].sum()
+    actual = rollup_weekly(dataset['rollup'], 'Expense', start, end)
+    pd.testing.assert_series_equal(actual, expected, check_names=False)
+
+@pytest.mark.parametrize('start, end', RANGES)
+def test_day_of_week_mean_matches_groupby(dataset, start, end):
+    df = _filtered(dataset, start, end)
+    expected = df[df['Type'] == 'Expense'].groupby('Day_of_Week')['Amount'].mean().reindex(DAYS_ORDER, fill_value=0.0)
+    actual = rollup_day_of_week_mean(dataset['rollup'], 'Expense', start, end)
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy())
+    assert list(actual.index) == DAYS_ORDER
+
+def _new_rows(rows):
+    return process_transactions(pd.DataFrame(rows, columns=['Date', 'Description', 'Amount', 'Category', 'Type']))
+
+# New rows inside the range, before and after it, and in a new category and type
+UPDATES = [
+    [('2024-03-01', 'Cafe', -4.5, 'Dining', 'Expense'), ('2024-06-15', 'Salary', 100.0, 'Salary', 'Income')],
+    [('2023-12-20', 'Cafe', -3.0, 'Dining', 'Expense')],
+    [('2025-02-01', 'Cafe', -3.0, 'Dining', 'Expense'), ('2025-03-01', 'Salary', 50.0, 'Salary', 'Income')],
+    [('2024-04-02', 'Lottery', 500.0, 'Windfall', 'Bonus')]
+]
+
+@pytest.mark.parametrize('rows', UPDATES)
+def test_update_matches_rebuild(dataset, rows):
+    new_daily = daily_aggregates(_new_rows(rows))
+    # The rollup being updated may be shared, so it must not be written to
+    frozen = {name: value.copy() if isinstance(value, np.ndarray) else value for name, value in dataset['rollup'].items()}
+    for value in frozen.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    updated = update_rollup(frozen, new_daily)
+    rebuilt = build_rollup(merge_daily_aggregates(dataset['daily'], new_daily))
+    assert updated.keys() == rebuilt.keys()
+    for name in rebuilt:
+        np.testing.assert_array_equal(np.asarray(updated[name]), np.asarray(rebuilt[name]), err_msg=name)
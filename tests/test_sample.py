@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from finance_core import generate_transactions
+
+def test_same_seed_gives_same_data():
+    pd.testing.assert_frame_equal(generate_transactions(years=1, accounts=2, seed=3),
+                                  generate_transactions(years=1, accounts=2, seed=3))
+
+def test_mix_without_income_categories_gives_only_expenses():
+    df = generate_transactions(years=1, category_mix={'Groceries': 1, 'Utilities': 1}, expense_share=1.0)
+    assert len(df) and (df['Type'] == 'Expense').all()
+    assert set(df['Category']) == {'Groceries', 'Utilities'}
+
+def test_mix_without_expense_categories_gives_only_income():
+    df = generate_transactions(years=1, category_mix={'Salary': 1}, expense_share=0.8)
+    assert len(df) and (df['Type'] == 'Income').all()
+
+@pytest.mark.parametrize('mix', [{'Lottery': 1}, {'Groceries': 0}, {'Groceries': -1, 'Salary': 2}])
+def test_invalid_mix_is_rejected(mix):
+    with pytest.raises(ValueError):
+        generate_transactions(years=1, category_mix=mix)
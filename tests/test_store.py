@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from finance_core import (append_transactions, build_dataset, load_saved_dataset, process_transactions,
+                          save_dataset, update_saved_dataset)
+
+def _statement(days=200):
+    dates = pd.date_range('2024-01-01', periods=days).strftime('%Y-%m-%d')
+    return pd.DataFrame({
+        'Date': dates,
+        'Description': ['Grocery store', 'Rent'] * (days // 2),
+        'Amount': [-50.0, -1000.0] * (days // 2)
+    })
+
+def test_save_and_reopen_round_trip(tmp_path):
+    dataset = build_dataset(process_transactions(_statement()))
+    save_dataset(dataset, 'history', root=str(tmp_path))
+    reopened = load_saved_dataset('history', root=str(tmp_path))
+    assert reopened['rows'] == dataset['rows']
+    pd.testing.assert_frame_equal(reopened['df'], dataset['df'], check_dtype=False, check_categorical=False)
+
+def test_reopen_after_append_with_new_descriptions_and_accounts(tmp_path):
+    root = str(tmp_path)
+    dataset = build_dataset(process_transactions(_statement()))
+    assert isinstance(dataset['df']['Description'].dtype, pd.CategoricalDtype)
+    save_dataset(dataset, 'history', root=root)
+    
+    # Unique descriptions stay plain strings when processed alone, and the rows carry an account
+    upload = pd.DataFrame({
+        'Date': ['2024-07-20', '2024-07-21'],
+        'Description': ['Coffee #A1', 'Bookshop #B2'],
+        'Amount': [-4.0, -20.0],
+        'Account': ['Visa', 'Visa']
+    })
+    appended, added, months = append_transactions(dataset, upload)
+    assert added == 2
+    update_saved_dataset(appended, 'history', months, root=root)
+    
+    reopened = load_saved_dataset('history', root=root)
+    df = reopened['df']
+    assert len(df) == appended['rows'] == 202
+    assert df['Description'].iloc[-2:].tolist() == ['Coffee #A1', 'Bookshop #B2']
+    assert df['Account'].iloc[-2:].tolist() == ['Visa', 'Visa']
+    assert df['Account'].iloc[:-2].isna().all()
+    assert isinstance(df['Description'].dtype, pd.CategoricalDtype)
+    assert df['Amount_Cents'].sum() == appended['df']['Amount_Cents'].sum()
+
+def test_reopen_date_range_reads_matching_rows(tmp_path):
+    dataset = build_dataset(process_transactions(_statement()))
+    save_dataset(dataset, 'history', root=str(tmp_path))
+    reopened = load_saved_dataset('history', root=str(tmp_path), start_date=pd.Timestamp('2024-03-10').date(),
+                                  end_date=pd.Timestamp('2024-04-05').date())
+    assert reopened['df']['Date'].min() == pd.Timestamp('2024-03-10')
+    assert reopened['df']['Date'].max() == pd.Timestamp('2024-04-05')
+    assert reopened['rows'] == 200
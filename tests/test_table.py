@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from finance_core import build_dataset, date_bounds, generate_transactions, process_transactions
+from finance_core.table import index_categories, page_positions, query_table, table_index, table_stats
+
+@pytest.fixture(scope='module')
+def dataset():
+    return build_dataset(process_transactions(generate_transactions(years=1, accounts=2, seed=5)))
+
+def _expected(df, start, stop, type_filter, category_filter, min_cents, search):
+    """Matching positions found with a plain mask over every row, newest first"""
+    mask = np.zeros(len(df), dtype=bool)
+    mask[start:stop] = True
+    if type_filter is not None:
+        mask &= (df['Type'].astype(str) == type_filter).to_numpy()
+    if category_filter is not None:
+        mask &= (df['Category'].astype(str) == category_filter).to_numpy()
+    mask &= np.abs(df['Amount_Cents'].to_numpy()) >= min_cents
+    if search:
+        mask &= df['Description'].astype(str).str.lower().str.contains(search.lower(), regex=False).to_numpy()
+    return np.flatnonzero(mask)[::-1]
+
+@pytest.mark.parametrize('type_filter, category_filter, min_cents, search', [
+    (None, None, 0, None),
+    ('Expense', None, 0, None),
+    (None, 'Groceries', 0, None),
+    ('Expense', 'Groceries', 2000, None),
+    ('Income', None, 0, 'SAL'),
+    (None, None, 10_000, 'TRANSACTION'),
+    ('Expense', 'No such category', 0, None)
+])
+def test_query_matches_mask(dataset, type_filter, category_filter, min_cents, search):
+    df = dataset['df']
+    start, stop = date_bounds(df, '2024-03-01', '2024-09-30')
+    positions = query_table(table_index(dataset), start, stop, type_filter, category_filter, min_cents, search)
+    np.testing.assert_array_equal(positions, _expected(df, start, stop, type_filter, category_filter, min_cents, search))
+
+def test_pages_cover_the_matches_in_order(dataset):
+    positions = query_table(table_index(dataset), type_filter='Expense')
+    pages = [page_positions(positions, page, 50) for page in range(1, len(positions) // 50 + 2)]
+    assert all(len(page) == 50 for page in pages[:-1]) and 0 < len(pages[-1]) <= 50
+    np.testing.assert_array_equal(np.concatenate(pages), positions)
+    assert len(page_positions(positions, len(pages) + 1, 50)) == 0
+
+def test_categories_and_stats_follow_the_range(dataset):
+    df = dataset['df']
+    index = table_index(dataset)
+    start, stop = date_bounds(df, '2024-06-01', '2024-06-30')
+    assert index_categories(index, start, stop) == sorted(df['Category'].iloc[start:stop].astype(str).unique())
+    
+    positions = query_table(index, start, stop)
+    stats = table_stats(index, positions)
+    rows = df.iloc[start:stop]
+    assert stats['count'] == len(rows)
+    assert stats['first_date'] == rows['Date'].min() and stats['last_date'] == rows['Date'].max()
+    assert stats['average'] == pytest.approx(rows['Amount_Cents'].mean() / 100)
+    assert stats['largest_expense'] == rows['Amount_Cents'].min() / 100
+    assert table_stats(index, positions[:0])['count'] == 0